@@ -3,17 +3,32 @@
 Flask API for Swiss Ephemeris Calculations
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
 from datetime import datetime
+import json
 import logging
 import os
 import sys
 import swisseph as swe
 
-from ephemeris import calculate_chart
+from ephemeris import calculate_chart, CHART_FIELDS
 from chart_renderer import generate_chart_svg
-from astrocartography import calculate_astrocartography_lines_geojson
+from astrocartography import calculate_astrocartography_lines_geojson, generate_all_astrocartography_features
+from astro_timeseries import calculate_astrocartography_timeseries
+from composite import calculate_composite_layers
+from feature_cache import FEATURE_CACHE, chart_cache_key
+from singleflight import CHART_FLIGHTS, FEATURE_FLIGHTS, request_key
+from stage_graph import STAGE_TIMINGS
+from chart_store import CHART_STORE
+from chart_context import ChartContext
+from city_ranking import get_city_table, rank_cities
+from relocation_heatmap import (
+    HEATMAP_CACHE, compute_relocation_heatmap, heatmap_key, raw_grid, render_png, render_tile, top_locations
+)
+from vector_tiles import CATEGORIES as TILE_LAYERS, TILE_CACHE
+from viewport import clip_features, parse_bbox, zoom_tolerance
+from utils import filter_lines_near_location
 from location_utils import get_location_suggestions, detect_timezone_from_coordinates
 from gpt_formatter import format_for_gpt, format_natal_only, format_with_transits
 from house_systems import (
@@ -67,6 +82,66 @@ def api_index():
 def health():
     return {"ok": True}, 200
 
+@app.route("/api/cache/stats")
+def cache_stats():
+    stats = FEATURE_CACHE.stats()
+    stats["singleflight"] = {"calculate": CHART_FLIGHTS.stats(), "features": FEATURE_FLIGHTS.stats()}
+    stats["stages"] = STAGE_TIMINGS.stats()
+    stats["chart_store"] = CHART_STORE.stats()
+    stats["heatmaps"] = HEATMAP_CACHE.stats()
+    stats["vector_tiles"] = TILE_CACHE.stats()
+    return jsonify(stats)
+
+CALCULATE_FIELDS = CHART_FIELDS + ("astrocartography",)
+DEFAULT_ASTRO_FILTERS = {
+    'include_aspects': True,
+    'include_fixed_stars': True,
+    'include_hermetic_lots': True,
+    'include_parans': True,
+    'include_ac_dc': True,
+    'include_ic_mc': True
+}
+
+def stored_chart(chart_id, required=()):
+    """CHART_STORE entry for a client's chart_id if it holds every `required` section, else None."""
+    stored = CHART_STORE.get(chart_id)
+    if stored is None or any(key not in stored.chart_data for key in required):
+        return None
+    return stored
+
+def viewport_options(values):
+    """(bbox, tolerance in degrees) from bbox/tolerance/zoom, validated; tolerance wins over zoom."""
+    bbox = values.get("bbox")
+    if bbox is not None:
+        parse_bbox(bbox)
+    if values.get("tolerance") is not None:
+        tolerance = float(values["tolerance"])
+    elif values.get("zoom") is not None:
+        tolerance = zoom_tolerance(float(values["zoom"]))
+    else:
+        tolerance = None
+    return bbox, tolerance
+
+def clip_to_viewport(results, bbox, tolerance):
+    """GeoJSON results with the features clipped to bbox and simplified; other results as they are."""
+    if (bbox is None and tolerance is None) or not isinstance(results.get("features"), list):
+        return results
+    features = clip_features(results["features"], bbox, tolerance)
+    return {**results, "features": features,
+            "viewport": {"bbox": parse_bbox(bbox) if bbox is not None else None, "tolerance": tolerance}}
+
+def parse_fields(value):
+    """`fields`/`include` as a list or comma-separated string -> set of CALCULATE_FIELDS, or None for all."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.split(",")
+    fields = {str(f).strip() for f in value if str(f).strip()}
+    unknown = fields - set(CALCULATE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields {sorted(unknown)}; choose from {list(CALCULATE_FIELDS)}")
+    return fields
+
 @app.route('/api/calculate', methods=['POST'])
 def api_calculate_chart():
     app.logger.info("▶️  /api/calculate")
@@ -87,6 +162,18 @@ def api_calculate_chart():
         progressed_for = data.get('progressed_for')
         progression_method = data.get('progression_method', 'secondary')
         progressed_date = data.get('progressed_date')
+        try:
+            fields = parse_fields(data.get('fields', data.get('include')))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        astro_filters = {**DEFAULT_ASTRO_FILTERS, **(data.get('filter_options') or {})}
+        want_astro = fields is None or "astrocartography" in fields
+        # Sections the chart has to compute: the requested ones plus what the features read
+        chart_fields = set(CHART_FIELDS) if fields is None else fields & set(CHART_FIELDS)
+        if want_astro:
+            chart_fields |= {"input", "utc_time", "houses", "planets", "lots"}
+            if astro_filters.get('include_fixed_stars') and astro_filters.get('fixed_star_max_magnitude') is None:
+                chart_fields.add("fixed_stars")
 
         # Validate required fields
         if not birth_date:
@@ -106,43 +193,53 @@ def api_calculate_chart():
         else:
             app.logger.info(f"Location info: city='{birth_city}', state='{birth_state}', country='{birth_country}'")
 
-        chart_data = calculate_chart(
-            birth_date=birth_date,
-            birth_time=birth_time,
-            birth_city=birth_city,
-            birth_state=birth_state,
-            birth_country=birth_country,
-            timezone=timezone,
-            house_system=house_system,
-            use_extended_planets=use_extended_planets,
-            progressed_for=progressed_for,
-            progression_method=progression_method,
-            progressed_date=progressed_date,
-            coordinates=coordinates  # Pass coordinates if available
-        )
+        def compute_chart():
+            chart_data, chart_context = calculate_chart(
+                birth_date=birth_date,
+                birth_time=birth_time,
+                birth_city=birth_city,
+                birth_state=birth_state,
+                birth_country=birth_country,
+                timezone=timezone,
+                house_system=house_system,
+                use_extended_planets=use_extended_planets,
+                progressed_for=progressed_for,
+                progression_method=progression_method,
+                progressed_date=progressed_date,
+                coordinates=coordinates,  # Pass coordinates if available
+                return_context=True,
+                fields=chart_fields
+            )
+
+            if "error" in chart_data:
+                app.logger.error(f"Chart calculation error: {chart_data['error']}")
+                return chart_data
+            if not want_astro:
+                chart_data['chart_id'] = CHART_STORE.put(chart_data, chart_context)
+                return chart_data
 
+            # Add all astrocartography features with logging
+            try:
+                app.logger.info("Calling calculate_astrocartography_lines_geojson...")
+                astro_features = calculate_astrocartography_lines_geojson(chart_data, astro_filters,
+                                                                          context=chart_context)
+                feature_types = [f['properties'].get('category') for f in astro_features.get('features', [])]
+                app.logger.info(f"Astrocartography feature types: {set(feature_types)}")
+                app.logger.info(f"Astrocartography features generated: {len(astro_features.get('features', []))}")
+                chart_data['astrocartography'] = astro_features
+            except Exception as e:
+                app.logger.exception("Astrocartography calculation failed")
+                chart_data['astrocartography'] = {"error": str(e), "features": []}
+            chart_data['chart_id'] = CHART_STORE.put(chart_data, chart_context)
+            return chart_data
+
+        # Identical requests already in flight (e.g. a shared link) wait for that result
+        chart_data = CHART_FLIGHTS.do(request_key("calculate", data), compute_chart)
         if "error" in chart_data:
-            app.logger.error(f"Chart calculation error: {chart_data['error']}")
             return jsonify(chart_data), 400
-
-        # Add all astrocartography features with logging
-        try:
-            app.logger.info("Calling calculate_astrocartography_lines_geojson...")
-            astro_features = calculate_astrocartography_lines_geojson(chart_data, {
-                'include_aspects': True,
-                'include_fixed_stars': True,
-                'include_hermetic_lots': True,
-                'include_parans': True,
-                'include_ac_dc': True,
-                'include_ic_mc': True
-            })
-            feature_types = [f['properties'].get('category') for f in astro_features.get('features', [])]
-            app.logger.info(f"Astrocartography feature types: {set(feature_types)}")
-            app.logger.info(f"Astrocartography features generated: {len(astro_features.get('features', []))}")
-            chart_data['astrocartography'] = astro_features
-        except Exception as e:
-            app.logger.exception("Astrocartography calculation failed")
-            chart_data['astrocartography'] = {"error": str(e), "features": []}
+        if fields is not None:
+            # Drop sections computed only as inputs to the ones requested
+            chart_data = {key: value for key, value in chart_data.items() if key in fields or key == "chart_id"}
 
         return jsonify(chart_data)
     except Exception as e:
@@ -171,15 +268,13 @@ def api_interpret():
         astro_lines_result = calculate_astrocartography_lines_geojson(chart_data)
         all_lines = astro_lines_result.get("features", [])
 
-        # Filter for lines near the birth location
-        # filtered_lines = filter_lines_near_location(all_lines, lat, lon, radius_miles=600)
-
-        # Add filtered lines to chart_data for interpretation
-        # chart_data["filtered_lines"] = filtered_lines
+        # Lines passing near the birth location, nearest first
+        radius_miles = float(chart_data.get("radius_miles", 600))
+        filtered_lines = filter_lines_near_location(all_lines, lat, lon, max_distance_miles=radius_miles)
 
         # Generate interpretation with GPT
         # interpretation = generate_interpretation(chart_data)  # REMOVED: No longer exists
-        return jsonify({"filtered_lines": all_lines[:10]})  # Return first 10 lines as demo
+        return jsonify({"filtered_lines": filtered_lines})
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -192,6 +287,28 @@ def api_astrocartography():
         data = request.get_json()
         print(f"[DEBUG] Astrocartography API received data keys: {list(data.keys()) if data else 'None'}")
         print(f"[DEBUG] Full request data: {data}")
+
+        # A chart_id from /api/calculate stands in for the re-posted chart
+        stored = None
+        if data and data.get("chart_id"):
+            required = ("input", "coordinates", "utc_time", "planets", "houses")
+            stored = stored_chart(data["chart_id"], required=required)
+            if stored is None:
+                if CHART_STORE.get(data["chart_id"]) is None:
+                    return jsonify({"error": "Unknown or expired chart_id"}), 404
+                # Stored from a /api/calculate request whose `fields` left these out
+                return jsonify({"error": f"Chart {data['chart_id']} was stored without the "
+                                         f"{', '.join(required)} sections; call /api/calculate "
+                                         "with them in `fields`, or without `fields`."}), 400
+            chart_input = stored.chart_data.get("input", {})
+            data = {
+                "birth_date": chart_input.get("date"),
+                "birth_time": chart_input.get("time"),
+                "timezone": chart_input.get("timezone"),
+                "house_system": chart_input.get("house_system"),
+                "coordinates": stored.chart_data.get("coordinates"),
+                **data,
+            }
         
         # Validate essential inputs (optional but safe)
         if not data.get("birth_date") or not data.get("birth_time") or not data.get("coordinates"):
@@ -206,8 +323,16 @@ def api_astrocartography():
             'include_parans': nested_filter_options.get('include_parans', data.get('include_parans', True)),
             'include_ac_dc': nested_filter_options.get('include_ac_dc', data.get('include_ac_dc', True)),
             'include_ic_mc': nested_filter_options.get('include_ic_mc', data.get('include_ic_mc', True)),
-            'layer_type': nested_filter_options.get('layer_type', data.get('layer_type'))  # Check both nested and top-level
+            'layer_type': nested_filter_options.get('layer_type', data.get('layer_type')),  # Check both nested and top-level
+            'output_mode': nested_filter_options.get('output_mode', data.get('output_mode', 'geojson'))
         }
+        # Parametric output window (see parametric_lines)
+        for key in ('window_start_jd', 'window_days', 'degree', 'fixed_star_max_magnitude'):
+            if key in nested_filter_options or key in data:
+                filter_options[key] = nested_filter_options.get(key, data.get(key))
+        # Viewport clipping and simplification of the output; not part of the feature cache key
+        bbox, tolerance = viewport_options({key: nested_filter_options.get(key, data.get(key))
+                                            for key in ('bbox', 'tolerance', 'zoom')})
         
         print(f"[DEBUG] Filter options: {filter_options}")
         
@@ -287,21 +412,302 @@ def api_astrocartography():
                 # results = {"error": "Human Design layer not implemented", "features": []}
                 
                 print(f"[HD] Generated {len(results.get('features', []))} Human Design features")
-                return jsonify(results)
+                return jsonify(clip_to_viewport(results, bbox, tolerance))
                 
             except Exception as e:
                 print(f"[ERROR] Human Design calculation error: {e}")
                 return jsonify({"error": f"Human Design calculation failed: {str(e)}"}), 500
         else:
             # Standard astrocartography calculation
-            results = calculate_astrocartography_lines_geojson(chart_data=data, filter_options=filter_options)
+            if stored is not None:
+                results = calculate_astrocartography_lines_geojson(chart_data=stored.chart_data, filter_options=filter_options,
+                                                                   context=stored.context)
+            else:
+                results = calculate_astrocartography_lines_geojson(chart_data=data, filter_options=filter_options)
         
         print(f"Generated {len(results.get('features', []))} astrocartography features")
+        results = clip_to_viewport(results, bbox, tolerance)
         
+        return jsonify(results)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/astrocartography/timeseries', methods=['POST'])
+def api_astrocartography_timeseries():
+    """
+    Lines for a run of evenly spaced moments (animation frames) in one response.
+    Body: start_date, start_time, timezone, coordinates, step_minutes (default 30),
+    frame_count (default 48), optional house_system, use_extended_planets, filter_options.
+    """
+    try:
+        data = request.get_json() or {}
+        start_date = data.get("start_date") or data.get("birth_date")
+        start_time = data.get("start_time") or data.get("birth_time")
+        timezone = data.get("timezone")
+        coordinates = data.get("coordinates")
+        if not start_date or not start_time or not timezone or not coordinates:
+            return jsonify({"error": "Missing start_date, start_time, timezone, or coordinates."}), 400
+
+        filter_options = dict(data.get("filter_options") or {})
+        for key in ('include_aspects', 'include_fixed_stars', 'include_hermetic_lots',
+                    'include_parans', 'include_ac_dc', 'include_ic_mc'):
+            filter_options.setdefault(key, data.get(key, True))
+        filter_options.setdefault('layer_type', data.get('layer_type', 'transit'))
+
+        try:
+            results = calculate_astrocartography_timeseries(
+                start_date=start_date,
+                start_time=start_time,
+                timezone=timezone,
+                coordinates=coordinates,
+                step_minutes=data.get("step_minutes", 30),
+                frame_count=data.get("frame_count", 48),
+                house_system=data.get("house_system", "whole_sign"),
+                use_extended_planets=data.get("use_extended_planets", True),
+                filter_options=filter_options,
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        app.logger.info(f"Time series generated: {results['frame_count']} frames every {results['step_minutes']} min")
+        return jsonify(results)
+    except Exception as e:
+        app.logger.exception("Time series calculation failed")
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/astrocartography/layers', methods=['POST'])
+def api_astrocartography_layers():
+    """
+    Natal, transit, CCG and Human Design layers for one birth in a single response.
+    Body: birth_date, birth_time, timezone, coordinates, layers (e.g. ["natal", {"type": "ccg",
+    "date": "2025-01-01"}]), optional house_system, use_extended_planets, filter_options.
+    """
+    try:
+        data = request.get_json() or {}
+        birth_date = data.get("birth_date")
+        birth_time = data.get("birth_time")
+        timezone = data.get("timezone")
+        coordinates = data.get("coordinates")
+        if not birth_date or not birth_time or not timezone or not coordinates:
+            return jsonify({"error": "Missing birth_date, birth_time, timezone, or coordinates."}), 400
+
+        try:
+            results = calculate_composite_layers(
+                birth_date=birth_date,
+                birth_time=birth_time,
+                timezone=timezone,
+                coordinates=coordinates,
+                layers=data.get("layers") or ["natal"],
+                house_system=data.get("house_system", "whole_sign"),
+                use_extended_planets=data.get("use_extended_planets", True),
+                filter_options={**DEFAULT_ASTRO_FILTERS, **(data.get("filter_options") or {})},
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        app.logger.info(f"Composite layers generated: {[(l['name'], l['feature_count']) for l in results['layers']]}")
         return jsonify(results)
     except Exception as e:
+        app.logger.exception("Composite layer calculation failed")
         return jsonify({"error": str(e)}), 500
 
+def heatmap_options(values):
+    """compute_relocation_heatmap keyword arguments from a JSON body or query args (weights as JSON strings there)."""
+    options = {}
+    for key in ('resolution', 'orb_degrees', 'max_latitude'):
+        if values.get(key) is not None:
+            options[key] = float(values[key])
+    for key in ('body_weights', 'line_weights'):
+        weights = values.get(key)
+        if isinstance(weights, str):
+            weights = json.loads(weights)
+        if weights:
+            options[key] = {str(k): float(v) for k, v in dict(weights).items()}
+    normalize = values.get('normalize')
+    if normalize is not None:
+        options['normalize'] = normalize if isinstance(normalize, bool) else str(normalize).lower() in ("1", "true", "yes")
+    return options
+
+def request_chart(data):
+    """
+    (chart_data, context, chart_id, error) for a body holding a chart_id or birth data.
+
+    New charts are stored so follow-up requests (e.g. heat map tiles) can use the returned
+    chart_id; `error` is a (response, status) pair to return as is.
+    """
+    if data.get("chart_id"):
+        stored = CHART_STORE.get(data["chart_id"])
+        if stored is None:
+            return None, None, None, (jsonify({"error": "Unknown or expired chart_id"}), 404)
+        chart_data, context, chart_id = stored.chart_data, stored.context, stored.chart_id
+    else:
+        if not data.get("birth_date") or not data.get("birth_time") or not data.get("coordinates"):
+            return None, None, None, (jsonify({"error": "Missing chart_id, or birth_date, birth_time, and coordinates."}), 400)
+        chart_data, context = calculate_chart(
+            birth_date=data["birth_date"],
+            birth_time=data["birth_time"],
+            timezone=data.get("timezone", ""),
+            house_system=data.get("house_system", "whole_sign"),
+            use_extended_planets=data.get("use_extended_planets", True),
+            coordinates=data["coordinates"],
+            return_context=True,
+        )
+        if "error" in chart_data:
+            return None, None, None, (jsonify(chart_data), 400)
+        chart_id = CHART_STORE.put(chart_data, context)
+    context = context or ChartContext.from_chart_data(chart_data)
+    if context is None:
+        return None, None, None, (jsonify({"error": "Chart has no Julian day"}), 400)
+    return chart_data, context, chart_id, None
+
+def cached_heatmap(context, options):
+    """(grid, cached) for a chart context and heat map options."""
+    key = heatmap_key(context, **options)
+    grid = HEATMAP_CACHE.get(key)
+    if grid is not None:
+        return grid, True
+    grid = compute_relocation_heatmap(context, **options)
+    HEATMAP_CACHE.put(key, grid)
+    return grid, False
+
+@app.route('/api/astrocartography/heatmap', methods=['POST'])
+def api_astrocartography_heatmap():
+    """
+    Relocation heat map: weighted closeness to every MC/IC/AC/DC/aspect line on a world grid.
+    Body: chart_id, or birth_date, birth_time, timezone, coordinates; optional resolution,
+    orb_degrees, max_latitude, normalize, body_weights, line_weights, top (peaks to list), include_grid,
+    format ("json", "png" or "raw").
+    """
+    try:
+        data = request.get_json() or {}
+        output = data.get("format", "json")
+        if output not in ("json", "png", "raw"):
+            return jsonify({"error": "format must be json, png or raw"}), 400
+        start = datetime.now()
+        _, context, chart_id, error = request_chart(data)
+        if error:
+            return error
+
+        try:
+            grid, cached = cached_heatmap(context, heatmap_options(data))
+            peaks = top_locations(grid, count=int(data.get("top", 10)))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        elapsed_ms = (datetime.now() - start).total_seconds() * 1000.0
+        app.logger.info(f"Heat map {grid.scores.shape} for {chart_id} in {elapsed_ms:.1f} ms (cached: {cached})")
+
+        if output == "png":
+            return Response(render_png(grid), mimetype="image/png", headers={"X-Chart-Id": chart_id})
+        if output == "raw":
+            payload, header = raw_grid(grid)
+            return Response(payload, mimetype="application/octet-stream",
+                            headers={"X-Chart-Id": chart_id, "X-Heatmap-Grid": json.dumps(header)})
+        result = {
+            "chart_id": chart_id,
+            "resolution": grid.resolution,
+            "shape": list(grid.scores.shape),
+            "bounds": [-180.0, -90.0, 180.0, 90.0],
+            "max_score": float(grid.scores.max()),
+            "top_locations": peaks,
+            "cached": cached,
+            "timing_ms": round(elapsed_ms, 2),
+        }
+        if data.get("include_grid"):
+            result["scores"] = grid.scores.round(4).tolist()
+        return jsonify(result)
+    except Exception as e:
+        app.logger.exception("Heat map calculation failed")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/astrocartography/heatmap/<chart_id>/<int:z>/<int:x>/<int:y>.png', methods=['GET'])
+def api_astrocartography_heatmap_tile(chart_id, z, x, y):
+    """One 256 px Web Mercator tile of a stored chart's heat map; options as query args."""
+    stored = CHART_STORE.get(chart_id)
+    if stored is None:
+        return jsonify({"error": "Unknown or expired chart_id"}), 404
+    context = stored.context or ChartContext.from_chart_data(stored.chart_data)
+    if context is None:
+        return jsonify({"error": "Chart has no Julian day"}), 400
+    try:
+        grid, _ = cached_heatmap(context, heatmap_options(request.args))
+        tile = render_tile(grid, z, x, y)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return Response(tile, mimetype="image/png", headers={"Cache-Control": "public, max-age=3600"})
+
+@app.route('/api/astrocartography/cities', methods=['POST'])
+def api_astrocartography_cities():
+    """
+    Top cities near a chart's MC/IC/AC/DC lines, ranked over the whole gazetteer at once.
+    Body: chart_id, or birth_date, birth_time, timezone, coordinates; criteria (e.g.
+    [{"planet": "Venus", "angles": ["MC"], "max_distance_km": 300}]), optional limit,
+    require_all, min_population.
+    """
+    try:
+        data = request.get_json() or {}
+        cities = get_city_table()
+        if cities is None:
+            return jsonify({"error": "No city list installed; run `make gazetteer`"}), 503
+        start = datetime.now()
+        chart_data, context, chart_id, error = request_chart(data)
+        if error:
+            return error
+        # Angular lines only; the feature cache serves repeat charts
+        filters = {**DEFAULT_ASTRO_FILTERS, 'include_aspects': False, 'include_fixed_stars': False,
+                   'include_parans': False, 'layer_type': 'natal'}
+        features = calculate_astrocartography_lines_geojson(chart_data, filters, context=context)["features"]
+        try:
+            ranked = rank_cities(
+                features,
+                cities,
+                data.get("criteria") or [{}],
+                limit=int(data.get("limit", 20)),
+                require_all=bool(data.get("require_all", False)),
+                min_population=int(data.get("min_population", 0)),
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        elapsed_ms = (datetime.now() - start).total_seconds() * 1000.0
+        app.logger.info(f"Ranked {len(cities)} cities for {chart_id} in {elapsed_ms:.1f} ms")
+        return jsonify({"chart_id": chart_id, "cities": ranked, "city_count": len(cities),
+                        "timing_ms": round(elapsed_ms, 2)})
+    except Exception as e:
+        app.logger.exception("City ranking failed")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/tiles/<layer>/<int:z>/<int:x>/<int:y>.mvt', methods=['GET'])
+def api_vector_tile(layer, z, x, y):
+    """
+    One Mapbox Vector Tile of a stored chart's astrocartography features.
+    `layer` is a feature category (planet, aspect, parans, fixed_star, hermetic_lot) or "all";
+    query args: chart_id, optional layer_type and include_* filters ("true"/"false").
+    """
+    if layer != "all" and layer not in TILE_LAYERS:
+        return jsonify({"error": f"Unknown layer {layer!r}; choose from {['all', *TILE_LAYERS]}"}), 400
+    stored = CHART_STORE.get(request.args.get("chart_id", ""))
+    if stored is None:
+        return jsonify({"error": "Unknown or expired chart_id"}), 404
+    filters = {**DEFAULT_ASTRO_FILTERS, "layer_type": request.args.get("layer_type", "natal")}
+    for key in DEFAULT_ASTRO_FILTERS:
+        if key in request.args:
+            filters[key] = request.args[key].lower() in ("1", "true", "yes")
+    key = chart_cache_key(stored.chart_data, filters) or stored.chart_id
+    tile_key = (key, layer, z, x, y)
+    tile = TILE_CACHE.get(tile_key)
+    if tile is None:
+        tileset = TILE_CACHE.tileset(key, lambda: generate_all_astrocartography_features(
+            stored.chart_data, filters, context=stored.context))
+        try:
+            tile = tileset.tile(z, x, y, categories=None if layer == "all" else [layer])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        TILE_CACHE.put(tile_key, tile)
+    return Response(tile, mimetype="application/vnd.mapbox-vector-tile",
+                    headers={"Cache-Control": "public, max-age=3600"})
 
 @app.route('/api/house-systems', methods=['GET'])
 def api_get_house_systems():
@@ -402,6 +808,13 @@ def get_chart_svg(layer_type):
             
         chart_data = data.get('chart_data')
         chart_config = data.get('chart_config', {})
+        stored = stored_chart(data.get('chart_id'), required=("planets", "houses"))
+        if stored is not None:
+            # Same chart as /api/calculate returned; repeat renders come from its derived results
+            chart_data = stored.chart_data
+            svg_key = ("svg", layer_type, json.dumps(chart_config, sort_keys=True, default=str))
+            if svg_key in stored.derived:
+                return jsonify({"svg": stored.derived[svg_key]})
         
         if not chart_data:
             app.logger.error("Missing chart_data in request")
@@ -433,6 +846,8 @@ def get_chart_svg(layer_type):
         if not svg_content:
             app.logger.error("SVG generation returned empty content")
             return jsonify({"error": "SVG generation failed - empty content"}), 500
+        if stored is not None:
+            stored.derived[svg_key] = svg_content
             
         return jsonify({"svg": svg_content})
         
@@ -551,17 +966,21 @@ def api_gpt_comprehensive():
         data = request.get_json(force=True)
         app.logger.info("▶️  /api/gpt/comprehensive")
         
-        # Calculate natal chart
-        natal_data = calculate_chart(
-            birth_date=data.get('birth_date'),
-            birth_time=data.get('birth_time'),
-            birth_city=data.get('birth_city'),
-            birth_state=data.get('birth_state', ''),
-            birth_country=data.get('birth_country', ''),
-            timezone=data.get('timezone'),
-            house_system=data.get('house_system', 'whole_sign'),
-            coordinates=data.get('coordinates')
-        )
+        # Reuse the natal chart from /api/calculate when its chart_id is still stored
+        stored = stored_chart(data.get('chart_id'), required=("planets", "houses", "aspects"))
+        if stored is not None:
+            natal_data = stored.chart_data
+        else:
+            natal_data = calculate_chart(
+                birth_date=data.get('birth_date'),
+                birth_time=data.get('birth_time'),
+                birth_city=data.get('birth_city'),
+                birth_state=data.get('birth_state', ''),
+                birth_country=data.get('birth_country', ''),
+                timezone=data.get('timezone'),
+                house_system=data.get('house_system', 'whole_sign'),
+                coordinates=data.get('coordinates')
+            )
         
         if "error" in natal_data:
             return jsonify(natal_data), 400
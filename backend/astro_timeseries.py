@@ -0,0 +1,114 @@
+"""
+Time-series astrocartography for animation frames.
+
+API:
+- calculate_astrocartography_timeseries(start_date, start_time, timezone, coordinates, ...) -> Dict:
+    Lines for `frame_count` moments spaced `step_minutes` apart, in one call.
+
+Body positions for every frame come from a single ChartContext.sweep; each frame
+then reuses its slice of that sweep for chart assembly and line generation, so a
+day of transit animation costs one request instead of one per frame.
+"""
+import datetime
+from typing import Dict
+
+import pytz
+import swisseph as swe
+
+from ephemeris import CHART_FIELDS, calculate_chart, convert_to_utc
+from ephemeris_utils import CHART_PLANETS
+from chart_context import ChartContext
+from astrocartography import calculate_astrocartography_lines_geojson
+
+MAX_FRAMES = 240
+
+def frame_times(start_utc: datetime.datetime, step_minutes: int, frame_count: int):
+    """UTC datetimes and their Julian days (UT) for each frame."""
+    times = [start_utc + datetime.timedelta(minutes=step_minutes * k) for k in range(frame_count)]
+    # Same expression as ephemeris.convert_to_utc so frame JDs match the charts exactly
+    jds = [swe.julday(t.year, t.month, t.day, t.hour + t.minute/60.0 + t.second/3600.0) for t in times]
+    return times, jds
+
+def calculate_astrocartography_timeseries(
+    start_date: str,
+    start_time: str,
+    timezone: str,
+    coordinates: Dict,
+    step_minutes: int = 30,
+    frame_count: int = 48,
+    house_system: str = 'whole_sign',
+    use_extended_planets: bool = True,
+    filter_options: Dict = None,
+) -> Dict:
+    """
+    Calculate astrocartography lines for a run of evenly spaced moments.
+
+    Args:
+        start_date: First frame date ("YYYY-MM-DD" or "MM/DD/YYYY"), local to `timezone`
+        start_time: First frame time ("HH:MM" or "HH:MM:SS"), local to `timezone`
+        timezone: IANA timezone of the start time
+        coordinates: {"latitude": ..., "longitude": ...} used for houses and lots
+        step_minutes: Whole minutes between frames
+        frame_count: Number of frames (1..MAX_FRAMES)
+        house_system: House system for each frame's chart
+        use_extended_planets: Include asteroids and extra points
+        filter_options: Same options as calculate_astrocartography_lines_geojson
+
+    Returns:
+        dict: {"start", "step_minutes", "frame_count", "frames": [{"time", "julian_day",
+        "type": "FeatureCollection", "features"}]}
+
+    Raises:
+        ValueError: On an invalid step, frame count or start time
+    """
+    step_minutes = int(step_minutes)
+    frame_count = int(frame_count)
+    if step_minutes < 1:
+        raise ValueError("step_minutes must be a positive whole number of minutes")
+    if not 1 <= frame_count <= MAX_FRAMES:
+        raise ValueError(f"frame_count must be between 1 and {MAX_FRAMES}")
+    time_data = convert_to_utc(start_date, start_time, timezone)
+    if not time_data:
+        raise ValueError("Could not convert start time to UTC")
+    _, year, month, day, hour, minute, second = time_data
+    start_utc = datetime.datetime(year, month, day, hour, minute, second, tzinfo=pytz.UTC)
+
+    times, jds = frame_times(start_utc, step_minutes, frame_count)
+    contexts = ChartContext.sweep(jds, CHART_PLANETS.values())
+    print(f"[TIMESERIES] Swept {len(contexts[0])} bodies over {frame_count} frames")
+
+    # Only the sections the line pipeline reads; aspects are never drawn from the chart
+    options = filter_options or {}
+    chart_fields = {"input", "coordinates", "utc_time", "houses", "planets", "lots"}
+    if options.get("include_fixed_stars", True) and options.get("fixed_star_max_magnitude") is None:
+        chart_fields.add("fixed_stars")
+
+    frames = []
+    for frame_time, jd, context in zip(times, jds, contexts):
+        # Seconds included, so the chart's JD is the swept context's and its positions are reused
+        chart = calculate_chart(
+            birth_date=frame_time.strftime("%Y-%m-%d"),
+            birth_time=frame_time.strftime("%H:%M:%S"),
+            timezone="UTC",
+            house_system=house_system,
+            use_extended_planets=use_extended_planets,
+            coordinates=coordinates,
+            context=context,
+            fields=chart_fields & set(CHART_FIELDS),
+        )
+        if "error" in chart:
+            raise ValueError(chart["error"])
+        geojson = calculate_astrocartography_lines_geojson(chart, filter_options, context=context)
+        frames.append({
+            "time": frame_time.isoformat().replace("+00:00", "Z"),
+            "julian_day": jd,
+            "type": "FeatureCollection",
+            "features": geojson["features"],
+        })
+
+    return {
+        "start": times[0].isoformat().replace("+00:00", "Z"),
+        "step_minutes": step_minutes,
+        "frame_count": frame_count,
+        "frames": frames,
+    }
@@ -4,12 +4,17 @@ import traceback
 
 from hermetic_lots import calculate_hermetic_lots
 from fixed_star import get_fixed_star_positions, FIXED_STARS
-from line_parans import find_line_crossings_and_latitude_lines
-from line_ac_dc import generate_horizon_lines
+from line_parans import find_paran_crossings
+from line_ac_dc import generate_horizon_lines, resolve_horizon_coordinates
 from line_ic_mc import calculate_mc_line, calculate_ic_line
 from line_aspects import calculate_aspect_lines
 from point_influence import calculate_point_influences
-from ephemeris_utils import initialize_ephemeris, ensure_ephemeris_path
+from ephemeris_utils import initialize_ephemeris, ensure_ephemeris_path, ephemeris_context
+from chart_context import ChartContext
+from parametric_lines import fit_parametric_model, DEFAULT_DEGREE
+from feature_cache import FEATURE_CACHE, chart_cache_key, copy_features
+from singleflight import FEATURE_FLIGHTS
+from stage_graph import Stage, run_stages, get_stage_executor
 
 import numpy as np
 
@@ -49,14 +54,362 @@ def calculate_lot_lines(jd, lots):
     return features
 
 
-def generate_all_astrocartography_features(chart_data: Dict, filter_options: Dict = None) -> List[Dict]:
+def generate_all_astrocartography_features(chart_data: Dict, filter_options: Dict = None,
+                                           context: ChartContext = None,
+                                           use_cache: bool = True) -> List[Dict]:
     """
     Generate astrocartography features with optional filtering.
     
     Args:
         chart_data: Chart data containing planets, time, etc.
         filter_options: Dictionary with filtering options for transit mode
+        context: ChartContext from calculate_chart; built from chart_data when omitted
+        use_cache: Serve repeat charts from feature_cache.FEATURE_CACHE and coalesce
+            identical in-flight charts through singleflight.FEATURE_FLIGHTS
     """
+    key = chart_cache_key(chart_data, filter_options) if use_cache else None
+    if key is not None:
+        cached = FEATURE_CACHE.get(key)
+        if cached is not None:
+            print(f"[CACHE] Served {len(cached)} features for {key[:12]}")
+            return cached
+    if key is None:
+        with ephemeris_context():
+            return _generate_all_astrocartography_features(chart_data, filter_options, context)
+
+    def compute():
+        with ephemeris_context():
+            features = _generate_all_astrocartography_features(chart_data, filter_options, context)
+        # An empty list is also what a failed run returns, so only non-empty results are kept
+        if features:
+            FEATURE_CACHE.put(key, features)
+        return features
+
+    # Identical charts already being computed are waited on rather than recomputed;
+    # every caller gets its own copy because the shared list is relabelled in place
+    return copy_features(FEATURE_FLIGHTS.do(key, compute))
+
+def _overlay_display_name(name, layer_type):
+    if layer_type == "CCG":
+        return f"{name} CCG"
+    if layer_type == "transit":
+        return f"{name} Transit"
+    return name
+
+def _stage_meridian_lines(jd, planets, filter_options, context):
+    """MC and IC lines for every chart body."""
+    features = []
+    if not filter_options.get('include_ic_mc', True):
+        return features
+    layer_type = filter_options.get("layer_type")
+    for planet in planets:
+        pname = planet.get("name")
+        pid = planet.get("id")
+        body_type = planet.get("body_type", "planet")
+        # Skip nodes for CCG layers
+        if layer_type == "CCG" and pname in ["Lunar Node"]:
+            continue
+
+        # Check if this is a CCG, transit, or HD planet and append suffix to the name ONLY for overlay layers
+        display_name = _overlay_display_name(pname, layer_type)
+        # For CCG layers or planets/lots with pre-calculated RA, use those coordinates
+        if (layer_type == "CCG" and "ra" in planet) or (planet.get("data_type") in ["progressed", "transit", "hd_design"] and "ra" in planet):
+            ra_planet = planet.get("ra")
+            print(f"[DEBUG] Using pre-calculated RA for {pname} ({planet.get('data_type', 'unknown')}): {ra_planet}")
+        elif body_type == "lot":
+            # Hermetic Lots: use ecliptic longitude as RA for angular lines
+            ra_planet = planet.get("longitude")
+        elif pname == "Lunar Node":
+            # Lunar Node: use ecliptic longitude directly for RA (never call Swiss Ephemeris)
+            ra_planet = planet.get("longitude")
+            print(f"[DEBUG] Using ecliptic longitude as RA for Lunar Node: {ra_planet}")
+        elif context is not None and pname in context and context.body_jds[context.index(pname)] == jd:
+            ra_planet = float(context.ra[context.index(pname)])
+        else:
+            # Use Swiss Ephemeris for natal planets or fallback
+            try:
+                ensure_ephemeris_path()
+                ppos, _ = swe.calc_ut(jd, pid, swe.FLG_SWIEPH | swe.FLG_EQUATORIAL)
+                ra_planet = ppos[0]
+                print(f"[DEBUG] Calculated RA for {pname}: {ra_planet}")
+            except Exception as e:
+                print(f"Swiss Ephemeris error for planet {pname}: {e}")
+                continue
+        for line_type, calculate_line in (("MC", calculate_mc_line), ("IC", calculate_ic_line)):
+            feature = calculate_line(jd, ra_planet, display_name)
+            if feature:
+                feature["properties"]["category"] = body_type
+                feature["properties"]["line_type"] = line_type
+                feature["properties"]["body"] = pname
+                feature["properties"]["body_key"] = planet.get("id")
+                feature["properties"]["data_type"] = planet.get("data_type")
+                feature["properties"]["layer"] = layer_type or "natal"
+                # Add house and sign information
+                if planet.get("house"):
+                    feature["properties"]["house"] = planet.get("house")
+                if planet.get("sign"):
+                    feature["properties"]["sign"] = planet.get("sign")
+                features.append(feature)
+    return features
+
+def _stage_horizon_lines(chart_data, planets, lots, filter_options, context):
+    """AC/DC lines (exactly sampled, all planets, once per chart) plus the curve parameters parans need."""
+    features = []
+    horizon_lines_for_parans = {}
+    if not filter_options.get('include_ac_dc', True):
+        return features, horizon_lines_for_parans
+    layer_type = filter_options.get("layer_type")
+    # Use dense sampling for horizon lines
+    acdc_settings = {"lat_steps": np.arange(-85, 85.01, 0.5)}
+    try:
+        # Filter chart data for CCG to exclude nodes
+        filtered_chart_data = chart_data.copy() if chart_data else {}
+        if layer_type in ["CCG", "HD_DESIGN"] and "planets" in filtered_chart_data:
+            filtered_planets = [p for p in filtered_chart_data["planets"]
+                              if p.get("name") not in ["Lunar Node"]]
+            filtered_chart_data["planets"] = filtered_planets
+
+        horizon_coords = resolve_horizon_coordinates(filtered_chart_data, context=context)
+        horizon_by_display = {c["display_name"]: c for c in horizon_coords.values()}
+        acdc_features = generate_horizon_lines(filtered_chart_data, settings=acdc_settings,
+                                               coordinates=horizon_coords)
+        for f in acdc_features:
+            source_coords = horizon_by_display.get(f["properties"].get("planet"))
+            f["properties"]["category"] = "planet"
+            # Always propagate id from the source planet/lot
+            # Try to get id from 'planet_id', 'body_key', or fallback to name
+            feature_id = (
+                f["properties"].get("planet_id")
+                or f["properties"].get("body_key")
+                or f["properties"].get("body")
+                or f["properties"].get("planet")
+                or ""
+            )
+            # Attach id to feature if not present
+            if not f["properties"].get("planet_id") and not f["properties"].get("body_key"):
+                # Try to find the matching object by name
+                match_obj = next((p for p in planets + lots if p.get("name") == f["properties"].get("planet") or p.get("name") == f["properties"].get("body")), None)
+                if match_obj and match_obj.get("id"):
+                    f["properties"]["planet_id"] = match_obj["id"]
+                    feature_id = match_obj["id"]
+            # Now match by id first, fallback to name
+            matching_obj = next((p for p in planets + lots if str(p.get("id")) == str(feature_id)), None)
+            if not matching_obj:
+                # Fallback to name if id not found
+                planet_name = (
+                    f["properties"].get("planet")
+                    or f["properties"].get("body")
+                    or ""
+                ).replace(" CCG", "").replace(" Transit", "").replace(" HD", "")
+                matching_obj = next((p for p in planets + lots if p.get("name") == planet_name), None)
+            if matching_obj:
+                if matching_obj.get("house"):
+                    f["properties"]["house"] = matching_obj.get("house")
+                if matching_obj.get("sign"):
+                    f["properties"]["sign"] = matching_obj.get("sign")
+
+            # Apply overlay naming if this is an overlay layer
+            planet_name = f["properties"].get("planet")
+            if layer_type in ("CCG", "transit") and planet_name:
+                suffix = _overlay_display_name("", layer_type)
+                if not planet_name.endswith(suffix):
+                    f["properties"]["planet"] = f"{planet_name}{suffix}"
+            # Keep HORIZON features for display
+            features.append(f)
+            # Culmination longitude and declination drive the analytic paran solver
+            if source_coords is not None:
+                culmination_lon = (source_coords["ra"] - source_coords["gst"] + 180) % 360 - 180
+                horizon_lines_for_parans[f["properties"].get("planet")] = {
+                    "line": (culmination_lon, source_coords["dec"]),
+                    "house": f["properties"].get("house"),
+                    "sign": f["properties"].get("sign"),
+                }
+    except Exception as err:
+        print(f"[ERROR] Horizon line generation error: {err}")
+        traceback.print_exc()
+    return features, horizon_lines_for_parans
+
+def _stage_lot_lines(jd, lots):
+    """Hermetic Lot lines (MC/IC only)."""
+    features = calculate_lot_lines(jd, lots)
+    for lot_feature in features:
+        lot_feature["properties"]["category"] = "hermetic_lot"
+    return features
+
+def _get_sign_from_longitude(longitude):
+    signs = [
+        "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+        "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
+    ]
+    index = int(longitude // 30) % 12
+    return signs[index]
+
+def _get_house_from_longitude(longitude, house_cusps):
+    for i in range(12):
+        start = house_cusps[i]
+        end = house_cusps[(i + 1) % 12]
+        if start is None or end is None:
+            continue
+        if start < end:
+            if start <= longitude < end:
+                return i + 1
+        else:
+            if longitude >= start or longitude < end:
+                return i + 1
+    return None
+
+def _stage_fixed_stars(jd, chart_data, filter_options):
+    """Fixed star points, placed in the chart's signs and houses."""
+    max_magnitude = filter_options.get('fixed_star_max_magnitude')
+    if max_magnitude is not None:
+        # Full sefstars.txt catalogue down to the requested magnitude
+        fixed_stars_positions = get_fixed_star_positions(jd, "all", max_magnitude=float(max_magnitude))
+    else:
+        # calculate_chart already placed the curated stars at this epoch
+        fixed_stars_positions = chart_data.get("fixed_stars") or get_fixed_star_positions(jd)
+    chart_houses = chart_data.get("houses", {})
+    # Get house cusps as a list of 12 longitudes (1-based keys)
+    house_cusps = [chart_houses.get(f"house_{i+1}", {}).get("longitude") for i in range(12)]
+    features = []
+    for star_pos in fixed_stars_positions:
+        star_name = star_pos["name"]
+        longitude = star_pos["longitude"]
+        sign = _get_sign_from_longitude(longitude)
+        house = _get_house_from_longitude(longitude, house_cusps) if all(h is not None for h in house_cusps) else None
+
+        star_properties = {
+            "star": star_name,
+            "star_key": star_name,
+            "type": "fixed_star",
+            "category": "fixed_star",
+            "radius_miles": 50,
+            "magnitude": star_pos.get("magnitude"),
+            "sign": sign,
+        }
+        if house:
+            star_properties["house"] = house
+
+        features.append({
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [star_pos["longitude"], star_pos["latitude"]]
+            },
+            "properties": star_properties
+        })
+    return features
+
+def _stage_aspect_lines(chart_data, context):
+    try:
+        aspect_features = calculate_aspect_lines(chart_data, context=context)
+        for af in aspect_features:
+            af["properties"]["category"] = "aspect"
+        return aspect_features
+    except Exception as err:
+        print(f"[ERROR] Aspect line generation error: {err}")
+        traceback.print_exc()
+        return []
+
+def _stage_point_influences(chart_data):
+    point_influence_features = calculate_point_influences(chart_data)
+    for pf in point_influence_features:
+        pf["properties"]["category"] = "point_influence"
+    return point_influence_features
+
+def _stage_parans(meridian_features, horizon):
+    """Planetary line crossings from the MC lines and the horizon curve parameters."""
+    _, horizon_lines_for_parans = horizon
+    try:
+        # Only include major planets and Chiron for crossings
+        allowed_crossing_bodies = {"Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto", "Chiron"}
+        horizon_lines = {}
+        meridian_lines = {}
+        planet_info_dict = {}  # Store house/sign info for parans
+
+        def _remember_info(name, house, sign):
+            planet_base_name = name.replace(" CCG", "").replace(" Transit", "").replace(" HD", "")
+            if house or sign:
+                planet_info_dict[planet_base_name] = {"house": house, "sign": sign}
+
+        # MC longitudes from the meridian features, AC/DC from the horizon curve parameters
+        for f in meridian_features:
+            if (
+                f["properties"].get("category") == "planet"
+                and f["properties"].get("line_type") == "MC"
+            ):
+                name = f["properties"].get("planet")
+                if name and any(body in name for body in allowed_crossing_bodies):
+                    meridian_lines[name] = f["geometry"]["coordinates"][0][0]
+                    _remember_info(name, f["properties"].get("house"), f["properties"].get("sign"))
+        for name, info in horizon_lines_for_parans.items():
+            if name and any(body in name for body in allowed_crossing_bodies):
+                horizon_lines[name] = info["line"]
+                _remember_info(name, info.get("house"), info.get("sign"))
+        crossing_features = find_paran_crossings(horizon_lines, meridian_lines)
+
+        for cf in crossing_features:
+            cf["properties"]["category"] = "parans"
+
+            # Add house and sign info for the planets involved in the crossing
+            source_lines = cf["properties"].get("source_lines", [])
+            if len(source_lines) >= 2:
+                # Extract planet names from source lines (e.g., "Sun_AC" -> "Sun")
+                planet1 = source_lines[0].split("_")[0] if "_" in source_lines[0] else ""
+                planet2 = source_lines[1].split("_")[0] if "_" in source_lines[1] else ""
+
+                # Clean planet names (remove suffixes)
+                planet1 = planet1.replace(" CCG", "").replace(" Transit", "").replace(" HD", "")
+                planet2 = planet2.replace(" CCG", "").replace(" Transit", "").replace(" HD", "")
+                # Add house and sign info for both planets
+                for planet_name in (planet1, planet2):
+                    if planet_name in planet_info_dict:
+                        info = planet_info_dict[planet_name]
+                        if info.get("house"):
+                            cf["properties"][f"{planet_name}_house"] = info.get("house")
+                        if info.get("sign"):
+                            cf["properties"][f"{planet_name}_sign"] = info.get("sign")
+        return crossing_features
+    except Exception as err:
+        print(f"[ERROR] Parans generation error: {err}")
+        traceback.print_exc()
+        return []
+
+def astrocartography_stages(chart_data: Dict, filter_options: Dict, context: ChartContext = None) -> List[Stage]:
+    """
+    The feature pipeline as a stage graph, in output order.
+
+    Only parans depend on other stages (the MC lines and horizon curves); the rest
+    run independently of each other.
+    """
+    planets = chart_data.get("planets", [])
+    jd = chart_data.get("utc_time", {}).get("julian_day")
+    houses = chart_data.get("houses", {})
+    ascendant_long = houses.get("ascendant", {}).get("longitude")
+    # Calculate Hermetic Lots if possible
+    lots = []
+    if "lots" in chart_data and chart_data["lots"]:
+        lots = chart_data["lots"]  # Use lots with house/sign info from chart data
+    elif ascendant_long is not None:
+        # Fallback: calculate fresh lots (but won't have house/sign info)
+        lots = calculate_hermetic_lots(chart_data)
+
+    stages = [
+        Stage("meridian_lines", _stage_meridian_lines, (jd, planets, filter_options, context)),
+        Stage("horizon_lines", _stage_horizon_lines, (chart_data, planets, lots, filter_options, context)),
+    ]
+    if filter_options.get('include_hermetic_lots', True):
+        stages.append(Stage("lot_lines", _stage_lot_lines, (jd, lots)))
+    if filter_options.get('include_fixed_stars', True):
+        stages.append(Stage("fixed_stars", _stage_fixed_stars, (jd, chart_data, filter_options)))
+    if filter_options.get('include_aspects', True):
+        stages.append(Stage("aspect_lines", _stage_aspect_lines, (chart_data, context)))
+    stages.append(Stage("point_influences", _stage_point_influences, (chart_data,)))
+    if filter_options.get('include_parans', True):
+        stages.append(Stage("parans", _stage_parans, deps=("meridian_lines", "horizon_lines")))
+    return stages
+
+def _generate_all_astrocartography_features(chart_data: Dict, filter_options: Dict = None,
+                                            context: ChartContext = None) -> List[Dict]:
     if filter_options is None:
         filter_options = {
             'include_aspects': True,
@@ -68,309 +421,19 @@ def generate_all_astrocartography_features(chart_data: Dict, filter_options: Dic
         }
     
     try:
-        planets = chart_data.get("planets", [])
-        utc = chart_data.get("utc_time", {})
-        jd = utc.get("julian_day")
-        houses = chart_data.get("houses", {})
-        ascendant_long = houses.get("ascendant", {}).get("longitude")
-        features = []        # Calculate Hermetic Lots if possible
-        lots = []
-        if "lots" in chart_data and chart_data["lots"]:
-            lots = chart_data["lots"]  # Use lots with house/sign info from chart data
-        elif ascendant_long is not None:
-            # Fallback: calculate fresh lots (but won't have house/sign info)
-            lots = calculate_hermetic_lots(chart_data)# --- Planet/asteroid/lot lines (Swiss Ephemeris powered) ---
-        for planet in planets:
-            pname = planet.get("name")
-            pid = planet.get("id")
-            body_type = planet.get("body_type", "planet")            # Skip nodes for CCG layers
-            layer_type = filter_options.get("layer_type")
-            if layer_type == "CCG" and pname in ["Lunar Node"]:
-                continue
-                
-            # Check if this is a CCG, transit, or HD planet and append suffix to the name ONLY for overlay layers
-            display_name = pname
-            if layer_type == "CCG":
-                display_name = f"{pname} CCG"
-            elif layer_type == "transit":
-                display_name = f"{pname} Transit"
-                  # For CCG layers or planets/lots with pre-calculated RA, use those coordinates
-            if (layer_type == "CCG" and "ra" in planet) or (planet.get("data_type") in ["progressed", "transit", "hd_design"] and "ra" in planet):
-                ra_planet = planet.get("ra")
-                print(f"[DEBUG] Using pre-calculated RA for {pname} ({planet.get('data_type', 'unknown')}): {ra_planet}")
-            elif body_type == "lot":
-                # Hermetic Lots: use ecliptic longitude as RA for angular lines
-                ra_planet = planet.get("longitude")
-            elif pname == "Lunar Node":
-                # Lunar Node: use ecliptic longitude directly for RA (never call Swiss Ephemeris)
-                ra_planet = planet.get("longitude")
-                print(f"[DEBUG] Using ecliptic longitude as RA for Lunar Node: {ra_planet}")
-            else:
-                # Use Swiss Ephemeris for natal planets or fallback
-                try:
-                    ensure_ephemeris_path()
-                    ppos, _ = swe.calc_ut(jd, pid, swe.FLG_SWIEPH | swe.FLG_EQUATORIAL)
-                    ra_planet = ppos[0]
-                    print(f"[DEBUG] Calculated RA for {pname}: {ra_planet}")
-                except Exception as e:
-                    print(f"Swiss Ephemeris error for planet {pname}: {e}")
-                    continue            # MC line (only if IC/MC lines are enabled)
-            if filter_options.get('include_ic_mc', True):
-                mc_feature = calculate_mc_line(jd, ra_planet, display_name)
-                if mc_feature:
-                    mc_feature["properties"]["category"] = body_type
-                    mc_feature["properties"]["line_type"] = "MC"
-                    mc_feature["properties"]["body"] = pname
-                    mc_feature["properties"]["body_key"] = planet.get("id")
-                    mc_feature["properties"]["data_type"] = planet.get("data_type")
-                    mc_feature["properties"]["layer"] = layer_type or "natal"
-                    # Add house and sign information
-                    if planet.get("house"):
-                        mc_feature["properties"]["house"] = planet.get("house")
-                    if planet.get("sign"):
-                        mc_feature["properties"]["sign"] = planet.get("sign")
-                    features.append(mc_feature)            # IC line (only if IC/MC lines are enabled)
-            if filter_options.get('include_ic_mc', True):
-                ic_feature = calculate_ic_line(jd, ra_planet, display_name)
-                if ic_feature:
-                    ic_feature["properties"]["category"] = body_type
-                    ic_feature["properties"]["line_type"] = "IC"
-                    ic_feature["properties"]["body"] = pname
-                    ic_feature["properties"]["body_key"] = planet.get("id")
-                    ic_feature["properties"]["data_type"] = planet.get("data_type")
-                    ic_feature["properties"]["layer"] = layer_type or "natal"
-                    # Add house and sign information
-                    if planet.get("house"):
-                        ic_feature["properties"]["house"] = planet.get("house")
-                    if planet.get("sign"):
-                        ic_feature["properties"]["sign"] = planet.get("sign")
-                    features.append(ic_feature)
-
-        # --- AC/DC lines (spline-based, all planets, once per chart) ---
-        if filter_options.get('include_ac_dc', True):
-            # Use dense sampling for horizon lines
-            acdc_settings = {"density": 300, "lat_steps": np.arange(-85, 85.01, 0.5)}
-            acdc_segments_for_parans = []
-            try:                # Filter chart data for CCG to exclude nodes
-                filtered_chart_data = chart_data.copy() if chart_data else {}
-                if layer_type in ["CCG", "HD_DESIGN"] and "planets" in filtered_chart_data:
-                    filtered_planets = [p for p in filtered_chart_data["planets"] 
-                                      if p.get("name") not in ["Lunar Node"]]
-                    filtered_chart_data["planets"] = filtered_planets
-                
-                acdc_features = generate_horizon_lines(filtered_chart_data, settings=acdc_settings)
-                for f in acdc_features:
-                    f["properties"]["category"] = "planet"
-                    # Always propagate id from the source planet/lot
-                    # Try to get id from 'planet_id', 'body_key', or fallback to name
-                    feature_id = (
-                        f["properties"].get("planet_id")
-                        or f["properties"].get("body_key")
-                        or f["properties"].get("body")
-                        or f["properties"].get("planet")
-                        or ""
-                    )
-                    # Attach id to feature if not present
-                    if not f["properties"].get("planet_id") and not f["properties"].get("body_key"):
-                        # Try to find the matching object by name
-                        match_obj = next((p for p in planets + lots if p.get("name") == f["properties"].get("planet") or p.get("name") == f["properties"].get("body")), None)
-                        if match_obj and match_obj.get("id"):
-                            f["properties"]["planet_id"] = match_obj["id"]
-                            feature_id = match_obj["id"]
-                    # Now match by id first, fallback to name
-                    matching_obj = next((p for p in planets + lots if str(p.get("id")) == str(feature_id)), None)
-                    if not matching_obj:
-                        # Fallback to name if id not found
-                        planet_name = (
-                            f["properties"].get("planet")
-                            or f["properties"].get("body")
-                            or ""
-                        ).replace(" CCG", "").replace(" Transit", "").replace(" HD", "")
-                        matching_obj = next((p for p in planets + lots if p.get("name") == planet_name), None)
-                    if matching_obj:
-                        if matching_obj.get("house"):
-                            f["properties"]["house"] = matching_obj.get("house")
-                        if matching_obj.get("sign"):
-                            f["properties"]["sign"] = matching_obj.get("sign")
-                    
-                    # Apply overlay naming if this is an overlay layer
-                    if layer_type == "CCG":
-                        planet_name = f["properties"].get("planet")
-                        if planet_name and not planet_name.endswith(" CCG"):
-                            f["properties"]["planet"] = f"{planet_name} CCG"
-                    elif layer_type == "transit":
-                        planet_name = f["properties"].get("planet")
-                        if planet_name and not planet_name.endswith(" Transit"):
-                            f["properties"]["planet"] = f"{planet_name} Transit"
-                    # Keep HORIZON features for display
-                    features.append(f)
-                    # Split HORIZON feature into AC and DC features for parans only
-                    if f["properties"].get("line_type") == "HORIZON":
-                        coords = f["geometry"]["coordinates"]
-                        segs = f["properties"].get("segments", [])
-                        planet = f["properties"].get("planet")                        # Handle both LineString and MultiLineString
-                        if f["geometry"]["type"] == "LineString":
-                            segments = [coords]
-                        else:
-                            segments = coords
-                        for seg, seg_info in zip(segments, segs):
-                            label = seg_info["label"]
-                            start = seg_info["start"]
-                            end = seg_info["end"]
-                            seg_coords = seg[start:end+1]
-                            acdc_feat = {
-                                "type": "Feature",
-                                "geometry": {"type": "LineString", "coordinates": seg_coords},
-                                "properties": {
-                                    "planet": planet,
-                                    "category": "planet",
-                                    "line_type": label,
-                                    # Pass through house/sign info from parent feature
-                                    "house": f["properties"].get("house"),
-                                    "sign": f["properties"].get("sign"),
-                                }
-                            }
-                            acdc_segments_for_parans.append(acdc_feat)
-            except Exception as err:
-                print(f"[ERROR] Horizon line generation error: {err}")
-                import traceback
-                traceback.print_exc()
-        else:
-            acdc_segments_for_parans = []        # --- Hermetic Lot lines (MC/IC only) ---
-        if filter_options.get('include_hermetic_lots', True):
-            for lot_feature in calculate_lot_lines(jd, lots):
-                lot_feature["properties"]["category"] = "hermetic_lot"
-                features.append(lot_feature)
-
-        # --- Fixed Star points (Swiss Ephemeris powered) ---
-        if filter_options.get('include_fixed_stars', True):
-            fixed_stars_positions = get_fixed_star_positions(jd)
-            chart_houses = chart_data.get("houses", {})
-            # Get house cusps as a list of 12 longitudes (1-based keys)
-            house_cusps = [chart_houses.get(f"house_{i+1}", {}).get("longitude") for i in range(12)]
-            def get_sign_from_longitude(longitude):
-                signs = [
-                    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
-                    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-                ]
-                index = int(longitude // 30) % 12
-                return signs[index]
-            def get_house_from_longitude(longitude, house_cusps):
-                for i in range(12):
-                    start = house_cusps[i]
-                    end = house_cusps[(i + 1) % 12]
-                    if start is None or end is None:
-                        continue
-                    if start < end:
-                        if start <= longitude < end:
-                            return i + 1
-                    else:
-                        if longitude >= start or longitude < end:
-                            return i + 1
-                return None
-            
-            for star_pos in fixed_stars_positions:
-                star_name = star_pos["name"]
-                longitude = star_pos["longitude"]
-                sign = get_sign_from_longitude(longitude)
-                house = get_house_from_longitude(longitude, house_cusps) if all(h is not None for h in house_cusps) else None
-                
-                star_properties = {
-                    "star": star_name,
-                    "star_key": star_name,
-                    "type": "fixed_star",
-                    "category": "fixed_star",
-                    "radius_miles": 50,
-                    "magnitude": star_pos.get("magnitude"),
-                    "sign": sign,
-                }
-                if house:
-                    star_properties["house"] = house
-                
-                features.append({
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [star_pos["longitude"], star_pos["latitude"]]
-                    },
-                    "properties": star_properties
-                })
-
-        # --- Aspect lines ---
-        if filter_options.get('include_aspects', True):
-            try:
-                aspect_features = calculate_aspect_lines(chart_data)
-                for af in aspect_features:
-                    af["properties"]["category"] = "aspect"
-                features.extend(aspect_features)
-            except Exception as err:
-                print(f"[ERROR] Aspect line generation error: {err}")
-                import traceback
-                traceback.print_exc()
-        # --- Point influences (stub) ---
-        point_influence_features = calculate_point_influences(chart_data)
-        for pf in point_influence_features:
-            pf["properties"]["category"] = "point_influence"
-        features.extend(point_influence_features)        # --- Planetary line crossings (Parans) ---
-        if filter_options.get('include_parans', True):
-            try:
-                # Only include major planets and Chiron for crossings
-                allowed_crossing_bodies = {"Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto", "Chiron"}
-                aspect_lines_dict = {}
-                planet_info_dict = {}  # Store house/sign info for parans
-                
-                # Use MC/IC from features, AC/DC from acdc_segments_for_parans
-                for f in features + acdc_segments_for_parans:
-                    if (
-                        f["geometry"]["type"] == "LineString"
-                        and f["properties"].get("category") == "planet"
-                        and f["properties"].get("line_type") in ("AC", "DC", "MC", "IC")
-                    ):
-                        name = f["properties"].get("planet")
-                        if name and any(body in name for body in allowed_crossing_bodies):
-                            line_key = name + "_" + f["properties"].get("line_type", "")
-                            aspect_lines_dict.setdefault(line_key, []).append(f["geometry"]["coordinates"])                            # Store planet house/sign info for parans
-                            planet_base_name = name.replace(" CCG", "").replace(" Transit", "").replace(" HD", "")
-                            if f["properties"].get("house") or f["properties"].get("sign"):
-                                planet_info_dict[planet_base_name] = {
-                                    "house": f["properties"].get("house"),
-                                    "sign": f["properties"].get("sign"),
-                                }                # Flatten coordinate lists for each line
-                aspect_lines_dict = {k: [pt for seg in v for pt in seg] for k, v in aspect_lines_dict.items()}
-                crossing_features = find_line_crossings_and_latitude_lines(aspect_lines_dict)
-                
-                for cf in crossing_features:
-                    cf["properties"]["category"] = "parans"
-                    
-                    # Add house and sign info for the planets involved in the crossing
-                    source_lines = cf["properties"].get("source_lines", [])
-                    if len(source_lines) >= 2:
-                        # Extract planet names from source lines (e.g., "Sun_AC" -> "Sun")
-                        planet1 = source_lines[0].split("_")[0] if "_" in source_lines[0] else ""
-                        planet2 = source_lines[1].split("_")[0] if "_" in source_lines[1] else ""
-                        
-                        # Clean planet names (remove suffixes)
-                        planet1 = planet1.replace(" CCG", "").replace(" Transit", "").replace(" HD", "")
-                        planet2 = planet2.replace(" CCG", "").replace(" Transit", "").replace(" HD", "")                        # Add house and sign info for both planets
-                        if planet1 in planet_info_dict:
-                            info = planet_info_dict[planet1]
-                            if info.get("house"):
-                                cf["properties"][f"{planet1}_house"] = info.get("house")
-                            if info.get("sign"):
-                                cf["properties"][f"{planet1}_sign"] = info.get("sign")
-                        
-                        if planet2 in planet_info_dict:
-                            info = planet_info_dict[planet2]
-                            if info.get("house"):
-                                cf["properties"][f"{planet2}_house"] = info.get("house")
-                            if info.get("sign"):
-                                cf["properties"][f"{planet2}_sign"] = info.get("sign")
-                
-                features.extend(crossing_features)
-            except Exception as err:
-                print(f"[ERROR] Parans generation error: {err}")
-                import traceback
-                traceback.print_exc()          # --- Ensure all overlay features are labeled with their layer type ---
+        jd = chart_data.get("utc_time", {}).get("julian_day")
+        if context is None and jd is not None:
+            context = ChartContext.from_chart_data(chart_data)
+        stages = astrocartography_stages(chart_data, filter_options, context)
+        results, timings = run_stages(stages, get_stage_executor())
+        print("[STAGES] " + ", ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in timings.items()))
+
+        features = []
+        for stage in stages:
+            result = results[stage.name]
+            features.extend(result[0] if stage.name == "horizon_lines" else result)
+
+        # --- Ensure all overlay features are labeled with their layer type ---
         layer_type = filter_options.get('layer_type')
         if layer_type in ['CCG', 'transit']:
             for f in features:
@@ -385,13 +448,18 @@ def generate_all_astrocartography_features(chart_data: Dict, filter_options: Dic
         traceback.print_exc()
         return []
 
-def calculate_astrocartography_lines_geojson(chart_data: Dict, filter_options: Dict = None) -> Dict:
+def calculate_astrocartography_lines_geojson(chart_data: Dict, filter_options: Dict = None,
+                                             context: ChartContext = None) -> Dict:
     """
     Calculate astrocartography lines with optional filtering for transit mode.
     
     Args:
         chart_data: Chart data containing planets, time, etc.
-        filter_options: Optional filtering for transit calculations
+        filter_options: Optional filtering for transit calculations. With
+            output_mode="parametric" the result is a parametric_lines model instead of
+            GeoJSON (window_start_jd defaults to the chart time, window_days to 1,
+            degree to parametric_lines.DEFAULT_DEGREE)
+        context: Optional ChartContext shared with calculate_chart
     """
     if filter_options is None:
         filter_options = {
@@ -402,7 +470,10 @@ def calculate_astrocartography_lines_geojson(chart_data: Dict, filter_options: D
             'include_ic_mc': True
         }
         
-    features = generate_all_astrocartography_features(chart_data, filter_options)
+    if filter_options.get('output_mode') == 'parametric':
+        return calculate_parametric_lines(chart_data, filter_options)
+
+    features = generate_all_astrocartography_features(chart_data, filter_options, context=context)
     
     # Ensure all features have layer_type property set
     layer_type = filter_options.get('layer_type', 'natal')
@@ -415,6 +486,29 @@ def calculate_astrocartography_lines_geojson(chart_data: Dict, filter_options: D
         "features": features
     }
 
+def calculate_parametric_lines(chart_data: Dict, filter_options: Dict) -> Dict:
+    """
+    Time-continuous output: RA/Dec/longitude Chebyshev coefficients per chart body over a
+    window, plus a linear GST model (see parametric_lines). Clients evaluate it to draw
+    MC/IC and AC/DC lines for any moment in the window.
+    """
+    jd = chart_data.get("utc_time", {}).get("julian_day")
+    start = filter_options.get('window_start_jd', jd)
+    if start is None:
+        raise ValueError("Parametric output needs utc_time.julian_day or window_start_jd")
+    layer_type = filter_options.get('layer_type')
+    names = [(p.get("name") or "").strip() for p in chart_data.get("planets", [])]
+    if layer_type == "CCG":
+        names = [n for n in names if n != "Lunar Node"]
+    model = fit_parametric_model(
+        float(start),
+        float(start) + float(filter_options.get('window_days', 1.0)),
+        names,
+        degree=filter_options.get('degree', DEFAULT_DEGREE),
+    )
+    model["layer_type"] = layer_type or "natal"
+    return model
+
 # PATCH: Allow running as script by fixing imports if needed
 if __name__ == "__main__":
     import sys, os
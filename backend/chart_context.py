@@ -0,0 +1,290 @@
+"""
+Per-request chart context.
+
+A ChartContext holds every body's ecliptic and equatorial coordinates, their
+speeds, and the chart-wide GST, true obliquity and delta-T as read-only NumPy
+arrays. It is built once per chart (see ephemeris.calculate_chart) and passed to
+the line modules so none of them go back to Swiss Ephemeris for data that
+already exists. calc_batch is the array form for many JDs at once (animation
+frames, date sweeps), returning structured NumPy records.
+
+Equatorial coordinates are rotated from the ecliptic-of-date position with the
+true obliquity, which reproduces swe.FLG_EQUATORIAL output while costing a
+single swe.calc_ut call per body.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import swisseph as swe
+
+try:
+    from backend.ephemeris_utils import EXTENDED_PLANETS, ephemeris_context
+except ImportError:
+    from ephemeris_utils import EXTENDED_PLANETS, ephemeris_context
+
+# Canonical body name -> Swiss Ephemeris id
+BODY_IDS = {name: pid for pid, name in EXTENDED_PLANETS.items()}
+
+_ARRAY_FIELDS = (
+    "ids", "body_jds", "lon", "lat", "dist", "lon_speed", "lat_speed", "dist_speed",
+    "ra", "dec", "ra_speed", "dec_speed",
+)
+
+
+def ecliptic_to_equatorial(lon, lat, lon_speed, lat_speed, obliquity_deg):
+    """
+    Rotate ecliptic coordinates (and their daily speeds) to equatorial ones.
+
+    Args:
+        lon, lat: Ecliptic longitude/latitude in degrees
+        lon_speed, lat_speed: Daily motion in degrees/day
+        obliquity_deg: Obliquity of the ecliptic in degrees (scalar or per body)
+
+    Returns:
+        tuple: (ra, dec, ra_speed, dec_speed) in degrees and degrees/day, RA in [0, 360)
+    """
+    lam, beta = np.radians(lon), np.radians(lat)
+    dlam, dbeta = np.radians(lon_speed), np.radians(lat_speed)
+    eps = np.radians(obliquity_deg)
+    cos_eps, sin_eps = np.cos(eps), np.sin(eps)
+    # Unit vector on the ecliptic sphere and its time derivative
+    x = np.cos(beta) * np.cos(lam)
+    y = np.cos(beta) * np.sin(lam)
+    z = np.sin(beta)
+    dx = -np.sin(beta) * np.cos(lam) * dbeta - np.cos(beta) * np.sin(lam) * dlam
+    dy = -np.sin(beta) * np.sin(lam) * dbeta + np.cos(beta) * np.cos(lam) * dlam
+    dz = np.cos(beta) * dbeta
+    # Rotate about the x axis (vernal equinox) by the obliquity
+    eq_y = y * cos_eps - z * sin_eps
+    eq_z = y * sin_eps + z * cos_eps
+    deq_y = dy * cos_eps - dz * sin_eps
+    deq_z = dy * sin_eps + dz * cos_eps
+    rho2 = x * x + eq_y * eq_y
+    ra = np.degrees(np.arctan2(eq_y, x)) % 360.0
+    dec = np.degrees(np.arcsin(np.clip(eq_z, -1.0, 1.0)))
+    ra_speed = np.degrees((x * deq_y - eq_y * dx) / rho2)
+    dec_speed = np.degrees(deq_z / np.sqrt(rho2))
+    return ra, dec, ra_speed, dec_speed
+
+
+_ECLIPTIC_FIELDS = ("lon", "lat", "dist", "lon_speed", "lat_speed", "dist_speed")
+# Structured record returned by calc_batch for every (frame, body)
+EPHEMERIS_DTYPE = np.dtype([(key, "f8") for key in _ECLIPTIC_FIELDS + ("ra", "dec", "ra_speed", "dec_speed")])
+
+
+class EphemerisBatch(NamedTuple):
+    """calc_batch result; positions[f, i] is body names[i] at jd_ut[f]."""
+    names: Tuple[str, ...]
+    jd_ut: np.ndarray           # (F,)
+    positions: np.ndarray       # (F, N) of EPHEMERIS_DTYPE, NaN where a body failed
+    obliquity: np.ndarray       # (F,) true obliquity of date
+    gst_deg: np.ndarray         # (F,) apparent Greenwich sidereal time
+    errors: List[Dict[str, str]]  # per frame, body name -> Swiss Ephemeris error
+
+
+def calc_batch(jd_uts: Iterable[float], bodies: Iterable[str], table=None) -> EphemerisBatch:
+    """
+    Ecliptic and equatorial positions (with speeds) of many bodies over an array of JDs.
+
+    With `table` (an ephemeris_table.EphemerisTable covering the JDs), the bodies it
+    holds are evaluated from its Chebyshev segments instead of Swiss Ephemeris.
+
+    Swiss Ephemeris has no vector call, so each body is still one swe.calc_ut per JD.
+    JDs run in the outer loop: Swiss Ephemeris keeps the Earth and Sun of the last
+    JD, so every body after the first at a JD reuses them (about twice as fast as
+    looping over bodies first). The equatorial rotation for all F × N positions is
+    one NumPy pass.
+
+    Args:
+        jd_uts: Julian days (UT)
+        bodies: Body names (see BODY_IDS); unknown names are skipped
+    """
+    jds = np.atleast_1d(np.asarray(list(jd_uts), dtype=float))
+    names = tuple(dict.fromkeys(n for n in bodies if n in BODY_IDS))
+    tabulated = set()
+    if table is not None:
+        tabulated = {name for name in names if table.covers(name, jds)}
+    ecl = np.full((len(jds), len(names), 6), np.nan)
+    errors = [{} for _ in jds]
+    flags = swe.FLG_SWIEPH | swe.FLG_SPEED
+    jd_list = jds.tolist()
+    computed = [(i, name, BODY_IDS[name]) for i, name in enumerate(names) if name not in tabulated]
+    with ephemeris_context():
+        for f, jd in enumerate(jd_list):
+            for i, name, pid in computed:
+                try:
+                    ecl[f, i] = swe.calc_ut(jd, pid, flags)[0][:6]
+                except Exception as e:
+                    print(f"Error calculating {name}: {e}")
+                    errors[f][name] = str(e)
+        obliquity = np.array([swe.calc_ut(jd, swe.ECL_NUT)[0][0] for jd in jd_list])
+        gst = np.array([swe.sidtime(jd) * 15.0 for jd in jd_list])
+    positions = np.empty((len(jds), len(names)), dtype=EPHEMERIS_DTYPE)
+    for k, key in enumerate(_ECLIPTIC_FIELDS):
+        positions[key] = ecl[..., k]
+    positions["ra"], positions["dec"], positions["ra_speed"], positions["dec_speed"] = ecliptic_to_equatorial(
+        ecl[..., 0], ecl[..., 1], ecl[..., 3], ecl[..., 4], obliquity[:, None]
+    )
+    if tabulated:
+        columns = [i for i, name in enumerate(names) if name in tabulated]
+        positions[:, columns] = table.evaluate([names[i] for i in columns], jds)
+    return EphemerisBatch(names, jds, positions, obliquity, gst, errors)
+
+
+@dataclass(frozen=True)
+class ChartContext:
+    """
+    Immutable ephemeris snapshot for one chart.
+
+    Chart-wide values refer to jd_ut. Per-body arrays are aligned with `names`;
+    a body may carry its own JD (body_jds) for progressed/transit mixes, in
+    which case its coordinates are for that JD while GST stays the chart's.
+    Bodies that failed to compute hold NaN and are listed in `errors`.
+    """
+    jd_ut: float
+    jd_tt: float
+    delta_t: float          # days
+    gst_deg: float          # apparent Greenwich sidereal time
+    obliquity_deg: float    # true obliquity of date
+    names: Tuple[str, ...]
+    ids: np.ndarray
+    body_jds: np.ndarray
+    lon: np.ndarray
+    lat: np.ndarray
+    dist: np.ndarray
+    lon_speed: np.ndarray
+    lat_speed: np.ndarray
+    dist_speed: np.ndarray
+    ra: np.ndarray
+    dec: np.ndarray
+    ra_speed: np.ndarray
+    dec_speed: np.ndarray
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self):
+        for name in _ARRAY_FIELDS:
+            getattr(self, name).setflags(write=False)
+
+    def __contains__(self, name) -> bool:
+        return name in self.names and name not in self.errors
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def index(self, name: str) -> int:
+        return self.names.index(name)
+
+    def body(self, name: str) -> Dict:
+        """Return one body's coordinates as plain floats."""
+        i = self.index(name)
+        return {
+            "name": name,
+            "id": int(self.ids[i]),
+            "jd": float(self.body_jds[i]),
+            "longitude": float(self.lon[i]),
+            "latitude": float(self.lat[i]),
+            "distance": float(self.dist[i]),
+            "speed": float(self.lon_speed[i]),
+            "lat_speed": float(self.lat_speed[i]),
+            "dist_speed": float(self.dist_speed[i]),
+            "ra": float(self.ra[i]),
+            "dec": float(self.dec[i]),
+            "ra_speed": float(self.ra_speed[i]),
+            "dec_speed": float(self.dec_speed[i]),
+        }
+
+    @classmethod
+    def build(
+        cls,
+        jd_ut: float,
+        bodies: Iterable[str],
+        body_jds: Optional[Dict[str, float]] = None,
+    ) -> "ChartContext":
+        """
+        Compute every requested body once (one swe.calc_ut call each).
+
+        Args:
+            jd_ut: Julian day (UT) of the chart frame
+            bodies: Body names (see BODY_IDS); unknown names are skipped
+            body_jds: Optional per-body JD overrides, e.g. progressed planets
+        """
+        body_jds = body_jds or {}
+        names = tuple(dict.fromkeys(n for n in bodies if n in BODY_IDS))
+        n = len(names)
+        ids = np.array([BODY_IDS[name] for name in names], dtype=int)
+        jds = np.array([body_jds.get(name, jd_ut) for name in names], dtype=float)
+        ecl = np.full((n, 6), np.nan)
+        errors = {}
+        flags = swe.FLG_SWIEPH | swe.FLG_SPEED
+        with ephemeris_context():
+            for i, (name, pid) in enumerate(zip(names, ids)):
+                try:
+                    ecl[i] = swe.calc_ut(float(jds[i]), int(pid), flags)[0][:6]
+                except Exception as e:
+                    print(f"Error calculating {name}: {e}")
+                    errors[name] = str(e)
+            # True obliquity per distinct JD (progressed bodies may sit days away)
+            obliquities = {jd: swe.calc_ut(jd, swe.ECL_NUT)[0][0] for jd in set(jds.tolist()) | {jd_ut}}
+        body_obliquity = np.array([obliquities[jd] for jd in jds.tolist()], dtype=float)
+        return cls._assemble(jd_ut, obliquities[jd_ut], names, ids, jds, ecl, body_obliquity, errors)
+
+    @classmethod
+    def sweep(cls, jd_uts: Iterable[float], bodies: Iterable[str], table=None) -> List["ChartContext"]:
+        """
+        Contexts for a run of frames (e.g. animation steps) in one pass.
+
+        Positions for every frame × body come from one calc_batch call (optionally
+        served by an ephemeris table) and are rotated to equatorial coordinates in
+        a single vectorized step.
+        """
+        batch = calc_batch(jd_uts, bodies, table=table)
+        pos = batch.positions
+        ecl = np.stack([pos[key] for key in _ECLIPTIC_FIELDS], axis=-1)
+        ids = np.array([BODY_IDS[name] for name in batch.names], dtype=int)
+        return [
+            cls._assemble(jd, batch.obliquity[f], batch.names, ids, np.full(len(batch.names), jd), ecl[f],
+                          None, batch.errors[f],
+                          equatorial=(pos["ra"][f], pos["dec"][f], pos["ra_speed"][f], pos["dec_speed"][f]))
+            for f, jd in enumerate(batch.jd_ut.tolist())
+        ]
+
+    @classmethod
+    def _assemble(cls, jd_ut, obliquity_deg, names, ids, jds, ecl, body_obliquity, errors, equatorial=None):
+        if equatorial is None:
+            equatorial = ecliptic_to_equatorial(ecl[:, 0], ecl[:, 1], ecl[:, 3], ecl[:, 4], body_obliquity)
+        ra, dec, ra_speed, dec_speed = (np.array(a, dtype=float) for a in equatorial)
+        delta_t = swe.deltat(jd_ut)
+        return cls(
+            jd_ut=jd_ut,
+            jd_tt=jd_ut + delta_t,
+            delta_t=delta_t,
+            gst_deg=swe.sidtime(jd_ut) * 15.0,
+            obliquity_deg=float(obliquity_deg),
+            names=names,
+            ids=ids.copy(),
+            body_jds=jds,
+            lon=ecl[:, 0].copy(),
+            lat=ecl[:, 1].copy(),
+            dist=ecl[:, 2].copy(),
+            lon_speed=ecl[:, 3].copy(),
+            lat_speed=ecl[:, 4].copy(),
+            dist_speed=ecl[:, 5].copy(),
+            ra=ra,
+            dec=dec,
+            ra_speed=ra_speed,
+            dec_speed=dec_speed,
+            errors=errors,
+        )
+
+    @classmethod
+    def from_chart_data(cls, chart_data: Dict) -> Optional["ChartContext"]:
+        """
+        Build a context for a chart dict that arrived without one (e.g. re-posted by a client).
+        Returns None when the chart has no Julian day.
+        """
+        jd = (chart_data or {}).get("utc_time", {}).get("julian_day")
+        if jd is None:
+            return None
+        names = [(p.get("name") or "").strip() for p in chart_data.get("planets", [])]
+        return cls.build(jd, names)
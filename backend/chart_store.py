@@ -0,0 +1,150 @@
+"""
+Server-side chart sessions.
+
+API:
+- ChartStore(max_entries, backend):
+    Bounded in-memory LRU of computed charts, handed out by opaque chart ids.
+    put(chart_data, context) -> chart_id; get(chart_id) -> Optional[StoredChart].
+- StoredChart:
+    chart_data, its ChartContext, and a `derived` dict for per-chart results
+    (rendered SVGs, GPT summaries) keyed by the caller.
+- SQLiteBackend(path, max_entries):
+    Local key-value tier; charts evicted from memory, or written by another
+    worker process, are reloaded from it.
+- CHART_STORE:
+    Process-wide store used by api.py. Set MERIDIAN_CHART_STORE_DB to a file
+    path to back it with SQLite; MERIDIAN_CHART_STORE_SIZE sizes the memory tier.
+
+/api/calculate stores its chart and returns the id as `chart_id`; follow-up
+endpoints accept it in place of a re-posted chart. Astrocartography features are
+not kept here: the feature cache already serves them by chart content. Backends
+store chart_data only (zlib-compressed JSON) and the ChartContext is rebuilt on
+load, so any object with get(key) -> Optional[bytes] and put(key, bytes) works.
+"""
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+
+try:
+    from backend.chart_context import ChartContext
+except ImportError:
+    from chart_context import ChartContext
+
+DEFAULT_MAX_ENTRIES = 512
+
+class StoredChart(NamedTuple):
+    chart_id: str
+    chart_data: Dict
+    context: Optional[ChartContext]
+    derived: Dict
+
+class SQLiteBackend:
+    """Charts as compressed JSON rows; the oldest are pruned beyond max_entries."""
+
+    def __init__(self, path: str, max_entries: int = 100000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS charts (key TEXT PRIMARY KEY, value BLOB, created REAL)")
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM charts WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO charts (key, value, created) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            self._db.execute(
+                "DELETE FROM charts WHERE key NOT IN (SELECT key FROM charts ORDER BY created DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+class ChartStore:
+    """
+    LRU of computed charts keyed by random chart ids.
+
+    Args:
+        max_entries: Charts kept in memory before the least recently used is evicted
+        backend: Optional key-value tier (see SQLiteBackend) consulted on memory misses
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, backend=None):
+        self.max_entries = max_entries
+        self.backend = backend
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+
+    def put(self, chart_data: Dict, context: Optional[ChartContext] = None) -> str:
+        """Store a chart (without its astrocartography features) and return its new chart_id."""
+        chart_id = secrets.token_urlsafe(16)
+        chart_data = {k: v for k, v in chart_data.items() if k not in ("astrocartography", "chart_id")}
+        with self._lock:
+            self._remember(StoredChart(chart_id, chart_data, context, {}))
+        if self.backend is not None:
+            payload = json.dumps(chart_data, separators=(",", ":"), default=str).encode("utf-8")
+            self.backend.put(chart_id, zlib.compress(payload))
+        return chart_id
+
+    def get(self, chart_id: str) -> Optional[StoredChart]:
+        """The stored chart for `chart_id`, or None if it is unknown or expired."""
+        if not chart_id or not isinstance(chart_id, str):
+            return None
+        with self._lock:
+            entry = self._entries.get(chart_id)
+            if entry is not None:
+                self._entries.move_to_end(chart_id)
+                self.hits += 1
+                return entry
+        value = self.backend.get(chart_id) if self.backend is not None else None
+        if value is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        chart_data = json.loads(zlib.decompress(value))
+        entry = StoredChart(chart_id, chart_data, ChartContext.from_chart_data(chart_data), {})
+        with self._lock:
+            self._remember(entry)
+            self.backend_hits += 1
+        return entry
+
+    def _remember(self, entry: StoredChart):
+        self._entries[entry.chart_id] = entry
+        self._entries.move_to_end(entry.chart_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "backend_hits": self.backend_hits,
+                "misses": self.misses,
+                "backend": getattr(self.backend, "path", None),
+            }
+
+def _default_backend():
+    path = os.environ.get("MERIDIAN_CHART_STORE_DB")
+    return SQLiteBackend(path) if path else None
+
+CHART_STORE = ChartStore(
+    max_entries=int(os.environ.get("MERIDIAN_CHART_STORE_SIZE", DEFAULT_MAX_ENTRIES)),
+    backend=_default_backend(),
+)
@@ -0,0 +1,206 @@
+"""
+Rank cities by how closely a chart's angular lines pass them.
+
+API:
+- CityTable(places):
+    City coordinates and populations as NumPy arrays, built once per city list.
+- rank_cities(features, cities, criteria, limit, require_all, min_population) -> List[Dict]:
+    The best `limit` cities for the criteria, scored in one vectorized pass.
+- angle_lines(features) -> List[Dict]:
+    The MC/IC/AC/DC lines of calculate_astrocartography_lines_geojson output,
+    one feature per body and angle (HORIZON features split into AC and DC).
+- get_city_table() -> Optional[CityTable]:
+    Process-wide table over the gazetteer's places, or None without a dump.
+
+A criterion selects bodies and angles and a radius, e.g. Venus MC within 300 km:
+    {"planet": "Venus", "angles": ["MC"], "max_distance_km": 300}
+or Jupiter on any angle: {"planet": "Jupiter"}. "planet" may also be a list
+or omitted (any body), and "weight" scales the criterion (default 1). A city
+scores weight * (1 - d / max_distance_km) per criterion, where d is its distance
+to the nearest selected line, and the criteria scores add up.
+
+All cities go through one LineIndex.pairs call over the selected lines, so
+ranking the whole gazetteer costs one KD-tree query. There is no per-city loop.
+"""
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from backend.gazetteer import get_gazetteer
+    from backend.line_index import LineIndex
+except ImportError:
+    from gazetteer import get_gazetteer
+    from line_index import LineIndex
+
+ANGLES = ("MC", "IC", "AC", "DC")
+DEFAULT_RADIUS_KM = 500.0
+MAX_RADIUS_KM = 2000.0
+DEFAULT_LIMIT = 20
+
+class CityTable:
+    """Coordinates and populations of a city list, aligned with `places`."""
+
+    def __init__(self, places: Sequence[Dict]):
+        self.places = list(places)
+        self.lats = np.array([p["latitude"] for p in self.places], dtype=float)
+        self.lons = np.array([p["longitude"] for p in self.places], dtype=float)
+        self.population = np.array([p.get("population") or 0 for p in self.places], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+def _split_horizon(parts):
+    """(AC parts, DC parts) of a horizon geometry: AC runs south to north, DC north to south."""
+    halves = {"AC": [], "DC": []}
+    for part in parts:
+        if len(part) < 2:
+            continue
+        rising = np.diff([p[1] for p in part]) >= 0
+        # A new run starts wherever the latitude direction flips; the turning point belongs to both
+        breaks = np.nonzero(rising[1:] != rising[:-1])[0] + 1
+        for start, end in zip(np.r_[0, breaks], np.r_[breaks, len(rising)]):
+            halves["AC" if rising[start] else "DC"].append(part[start:end + 1])
+    return halves["AC"], halves["DC"]
+
+def angle_lines(features: Sequence[Dict]) -> List[Dict]:
+    """
+    One MultiLineString feature per (body, angle) among the MC/IC/HORIZON lines.
+
+    properties: {"planet", "angle", "category"}; aspect, paran and fixed-star features are left out.
+    """
+    parts = {}
+    for feature in features:
+        props = feature.get("properties") or {}
+        line_type, planet = props.get("line_type"), props.get("planet")
+        geometry = feature.get("geometry") or {}
+        if not planet or line_type not in ("MC", "IC", "HORIZON") or not geometry.get("coordinates"):
+            continue
+        coords = geometry["coordinates"] if geometry.get("type") == "MultiLineString" else [geometry["coordinates"]]
+        category = props.get("category")
+        if line_type == "HORIZON":
+            ac, dc = _split_horizon(coords)
+            parts.setdefault((planet, "AC", category), []).extend(ac)
+            parts.setdefault((planet, "DC", category), []).extend(dc)
+        else:
+            parts.setdefault((planet, line_type, category), []).extend(coords)
+    return [
+        {
+            "type": "Feature",
+            "geometry": {"type": "MultiLineString", "coordinates": coords},
+            "properties": {"planet": planet, "angle": angle, "category": category},
+        }
+        for (planet, angle, category), coords in parts.items() if coords
+    ]
+
+def _parse_criterion(criterion: Dict) -> Dict:
+    planets = criterion.get("planet", criterion.get("planets"))
+    if isinstance(planets, str):
+        planets = [planets]
+    angles = criterion.get("angles", criterion.get("angle")) or list(ANGLES)
+    if isinstance(angles, str):
+        angles = [angles]
+    angles = [{"ASC": "AC", "DSC": "DC"}.get(str(a).upper(), str(a).upper()) for a in angles]
+    unknown = set(angles) - set(ANGLES)
+    if unknown:
+        raise ValueError(f"Unknown angles {sorted(unknown)}; choose from {list(ANGLES)}")
+    radius = float(criterion.get("max_distance_km", DEFAULT_RADIUS_KM))
+    if not 0 < radius <= MAX_RADIUS_KM:
+        raise ValueError(f"max_distance_km must be between 0 and {MAX_RADIUS_KM}")
+    return {
+        "planets": set(planets) if planets else None,
+        "angles": set(angles),
+        "radius": radius,
+        "weight": float(criterion.get("weight", 1.0)),
+    }
+
+def rank_cities(
+    features: Sequence[Dict],
+    cities: CityTable,
+    criteria: Sequence[Dict],
+    limit: int = DEFAULT_LIMIT,
+    require_all: bool = False,
+    min_population: int = 0,
+) -> List[Dict]:
+    """
+    Top cities for a chart's lines under the given criteria.
+
+    Args:
+        features: calculate_astrocartography_lines_geojson features
+        cities: CityTable to rank
+        criteria: Criterion dicts (see module docstring)
+        limit: Number of cities to return
+        require_all: Only rank cities meeting every criterion (default: any)
+        min_population: Skip smaller cities
+
+    Returns:
+        list: City dicts (the place's fields minus its name index) with "score" and
+        "matches": [{"criterion", "planet", "angle", "distance_km"}], best first;
+        equal scores go to the more populous city
+
+    Raises:
+        ValueError: On an empty criteria list or a malformed criterion
+    """
+    if not criteria:
+        raise ValueError("criteria must list at least one criterion")
+    parsed = [_parse_criterion(c) for c in criteria]
+    lines = angle_lines(features)
+    selected = [
+        [i for i, line in enumerate(lines)
+         if line["properties"]["angle"] in c["angles"]
+         and (c["planets"] is None or line["properties"]["planet"] in c["planets"])]
+        for c in parsed
+    ]
+    used = sorted({i for ids in selected for i in ids})
+    if not used or not len(cities):
+        return []
+    index = LineIndex([lines[i] for i in used])
+    position = {line_id: k for k, line_id in enumerate(used)}
+    points, owners, dist = index.pairs(cities.lats, cities.lons, max(c["radius"] for c in parsed))
+
+    scores = np.zeros(len(cities))
+    met = np.zeros(len(cities), dtype=int)
+    nearest = []
+    for criterion, ids in zip(parsed, selected):
+        mask = np.isin(owners, [position[i] for i in ids]) & (dist <= criterion["radius"])
+        # Pairs are sorted by point, then distance: each point's first hit is its nearest line
+        hit_points, first = np.unique(points[mask], return_index=True)
+        hit_owner, hit_dist = owners[mask][first], dist[mask][first]
+        scores[hit_points] += criterion["weight"] * (1.0 - hit_dist / criterion["radius"])
+        met[hit_points] += 1
+        nearest.append((hit_points, hit_owner, hit_dist))
+
+    eligible = met == len(parsed) if require_all else met > 0
+    eligible &= cities.population >= min_population
+    candidates = np.nonzero(eligible)[0]
+    order = candidates[np.lexsort((-cities.population[candidates], -scores[candidates]))][:limit]
+
+    results = []
+    for city in order.tolist():
+        matches = []
+        for k, (hit_points, hit_owner, hit_dist) in enumerate(nearest):
+            j = np.searchsorted(hit_points, city)
+            if j < len(hit_points) and hit_points[j] == city:
+                props = index.features[hit_owner[j]]["properties"]
+                matches.append({"criterion": k, "planet": props["planet"], "angle": props["angle"],
+                                "distance_km": round(float(hit_dist[j]), 1)})
+        place = {key: value for key, value in cities.places[city].items() if key != "names"}
+        results.append({**place, "score": round(float(scores[city]), 4), "matches": matches})
+    return results
+
+_city_table = None
+_city_table_lock = threading.Lock()
+
+def get_city_table() -> Optional[CityTable]:
+    """CityTable over the shared gazetteer, built on first use; None if no dump is installed."""
+    global _city_table
+    if _city_table is None:
+        with _city_table_lock:
+            if _city_table is None:
+                gazetteer = get_gazetteer()
+                if gazetteer is None:
+                    return None
+                _city_table = CityTable(gazetteer.places)
+                print(f"[CITIES] Ranking table over {len(_city_table)} places")
+    return _city_table
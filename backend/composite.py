@@ -0,0 +1,212 @@
+"""
+Multi-layer astrocartography in one request.
+
+API:
+- calculate_composite_layers(birth_date, birth_time, timezone, coordinates, layers, ...) -> Dict:
+    Natal, transit, CCG and Human Design layers for one person as a single
+    FeatureCollection, with per-layer timings.
+- design_julian_day(jd_ut) -> float:
+    Human Design "Design" moment: when the Sun stood 88° before its birth longitude.
+
+Every layer's moment is resolved first, then body positions for all of them come
+from one ChartContext.sweep, so the layers share a single ephemeris pass instead
+of one per /api/calculate call. Each layer then builds its chart and features
+from its slice of that sweep, exactly as a separate request for that moment would.
+
+Layer specs are dicts with a "type" from LAYER_TYPES and optional keys:
+- "name": label written to every feature's `layer` property (default per type)
+- "date"/"time"/"timezone": the transit moment (default: now) or the CCG date
+  (CCG keeps the birth time, as the CCG overlay does)
+- "filter_options": overrides of the request-wide filter options
+"""
+import datetime
+import time
+from typing import Dict, List
+
+import pytz
+import swisseph as swe
+
+from ephemeris import CHART_FIELDS, calculate_chart, convert_to_utc
+from ephemeris_utils import CHART_PLANETS, ephemeris_context
+from chart_context import ChartContext
+from astrocartography import calculate_astrocartography_lines_geojson
+
+# Layer type -> the pipeline's layer_type and the default feature `layer` label
+LAYER_TYPES = {
+    "natal": "natal",
+    "transit": "transit",
+    "ccg": "CCG",
+    "hd_design": "HD_DESIGN",
+}
+MAX_LAYERS = 8
+DESIGN_ARC = 88.0
+MEAN_SOLAR_MOTION = 0.9856  # degrees/day
+
+def design_julian_day(jd_ut: float) -> float:
+    """Julian day (UT) when the Sun was DESIGN_ARC degrees before its longitude at jd_ut."""
+    with ephemeris_context():
+        target = (swe.calc_ut(jd_ut, swe.SUN, swe.FLG_SWIEPH)[0][0] - DESIGN_ARC) % 360.0
+        jd = jd_ut - DESIGN_ARC / MEAN_SOLAR_MOTION
+        for _ in range(15):
+            diff = (swe.calc_ut(jd, swe.SUN, swe.FLG_SWIEPH)[0][0] - target + 540.0) % 360.0 - 180.0
+            if abs(diff) < 1e-6:
+                break
+            jd -= diff / MEAN_SOLAR_MOTION
+    return jd
+
+def _utc_strings(jd_ut: float):
+    """("YYYY-MM-DD", "HH:MM:SS.ffffff") for a UT Julian day, to the microsecond."""
+    year, month, day, hours = swe.revjul(jd_ut)
+    moment = datetime.datetime(year, month, day) + datetime.timedelta(hours=hours)
+    return moment.strftime("%Y-%m-%d"), moment.strftime("%H:%M:%S.%f")
+
+def _resolve_moment(layer: Dict, birth_date: str, birth_time: str, timezone: str, natal_jd: float):
+    """(date, time, timezone) of a layer's chart."""
+    layer_type = layer["type"]
+    if layer_type == "natal":
+        return birth_date, birth_time, timezone
+    if layer_type == "hd_design":
+        return _utc_strings(design_julian_day(natal_jd)) + ("UTC",)
+    tz = layer.get("timezone") or timezone
+    if layer_type == "ccg":
+        if not layer.get("date"):
+            raise ValueError("A ccg layer needs a date")
+        return layer["date"], birth_time, tz
+    now = datetime.datetime.now(pytz.timezone(tz))
+    return layer.get("date") or now.strftime("%Y-%m-%d"), layer.get("time") or now.strftime("%H:%M"), tz
+
+def _tag_design_features(features: List[Dict]):
+    """Human Design labelling, as HumanDesignLayer applies to its planet lines."""
+    for feature in features:
+        props = feature.get("properties")
+        if props is None:
+            continue
+        props["hd_design"] = True
+        planet = props.get("planet")
+        if planet and not planet.endswith(" HD"):
+            props["planet"] = f"{planet} HD"
+        label = props.get("label")
+        if label and "HD" not in label:
+            parts = label.split(" ", 1)
+            props["label"] = f"{parts[0]} HD {parts[1]}" if len(parts) == 2 else f"{label} HD"
+
+def calculate_composite_layers(
+    birth_date: str,
+    birth_time: str,
+    timezone: str,
+    coordinates: Dict,
+    layers: List[Dict],
+    house_system: str = 'whole_sign',
+    use_extended_planets: bool = True,
+    filter_options: Dict = None,
+) -> Dict:
+    """
+    Calculate several astrocartography layers for one birth in a shared ephemeris pass.
+
+    Args:
+        birth_date: Birth date ("YYYY-MM-DD" or "MM/DD/YYYY"), local to `timezone`
+        birth_time: Birth time ("HH:MM"), local to `timezone`
+        timezone: IANA timezone of the birth
+        coordinates: {"latitude": ..., "longitude": ...} used for every layer's houses and lots
+        layers: Layer specs (see module docstring); names must be unique
+        house_system: House system for every layer's chart
+        use_extended_planets: Include asteroids and extra points
+        filter_options: Same options as calculate_astrocartography_lines_geojson
+
+    Returns:
+        dict: {"type": "FeatureCollection", "features", "layers": [{"name", "type",
+        "julian_day", "utc_time", "feature_count", "timing_ms"}], "timing_ms"}
+
+    Raises:
+        ValueError: On unknown layer types, duplicate names or unparseable times
+    """
+    start = time.perf_counter()
+    if not layers:
+        raise ValueError("layers must list at least one layer")
+    if len(layers) > MAX_LAYERS:
+        raise ValueError(f"At most {MAX_LAYERS} layers per request")
+    specs = []
+    for layer in layers:
+        layer = {"type": layer} if isinstance(layer, str) else dict(layer)
+        layer["type"] = str(layer.get("type", "")).lower()
+        if layer["type"] not in LAYER_TYPES:
+            raise ValueError(f"Unknown layer type {layer['type']!r}; choose from {list(LAYER_TYPES)}")
+        layer.setdefault("name", LAYER_TYPES[layer["type"]])
+        specs.append(layer)
+    names = [layer["name"] for layer in specs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Layer names must be unique: {names}")
+
+    natal_time = convert_to_utc(birth_date, birth_time, timezone)
+    if not natal_time:
+        raise ValueError("Could not convert birth time to UTC")
+    moments = []
+    for layer in specs:
+        moment = _resolve_moment(layer, birth_date, birth_time, timezone, natal_time[0])
+        time_data = convert_to_utc(*moment)
+        if not time_data:
+            raise ValueError(f"Could not convert the {layer['name']} layer's time to UTC")
+        moments.append((moment, time_data[0]))
+
+    # One ephemeris pass for every distinct moment; layers sharing a moment share its context
+    sweep_start = time.perf_counter()
+    jds = list(dict.fromkeys(jd for _, jd in moments))
+    contexts = dict(zip(jds, ChartContext.sweep(jds, CHART_PLANETS.values())))
+    ephemeris_ms = (time.perf_counter() - sweep_start) * 1000.0
+    print(f"[COMPOSITE] Swept {len(contexts[jds[0]])} bodies at {len(jds)} moments for {len(specs)} layers")
+
+    features, summaries = [], []
+    for layer, ((date_str, time_str, tz), jd) in zip(specs, moments):
+        layer_start = time.perf_counter()
+        layer_filters = {**(filter_options or {}), **(layer.get("filter_options") or {}),
+                         "layer_type": LAYER_TYPES[layer["type"]]}
+        if layer["type"] == "hd_design":
+            layer_filters["include_fixed_stars"] = False  # the Design layer never draws fixed stars
+        chart_fields = {"input", "coordinates", "utc_time", "houses", "planets", "lots"}
+        if layer_filters.get("include_fixed_stars", True) and layer_filters.get("fixed_star_max_magnitude") is None:
+            chart_fields.add("fixed_stars")
+        chart = calculate_chart(
+            birth_date=date_str,
+            birth_time=time_str,
+            timezone=tz,
+            house_system=house_system,
+            use_extended_planets=use_extended_planets,
+            coordinates=coordinates,
+            context=contexts[jd],
+            fields=chart_fields & set(CHART_FIELDS),
+        )
+        if "error" in chart:
+            raise ValueError(f"{layer['name']}: {chart['error']}")
+        if layer["type"] == "hd_design":
+            for body in chart.get("planets", []) + chart.get("lots", []):
+                body["data_type"] = "hd_design"
+                body["hd_design"] = True
+        chart_ms = (time.perf_counter() - layer_start) * 1000.0
+
+        layer_features = calculate_astrocartography_lines_geojson(chart, layer_filters, context=contexts[jd])["features"]
+        if layer["type"] == "hd_design":
+            _tag_design_features(layer_features)
+        for feature in layer_features:
+            feature["properties"]["layer"] = layer["name"]
+        features.extend(layer_features)
+        summaries.append({
+            "name": layer["name"],
+            "type": layer["type"],
+            "julian_day": jd,
+            "utc_time": chart["utc_time"],
+            "feature_count": len(layer_features),
+            "timing_ms": {
+                "chart": round(chart_ms, 2),
+                "features": round((time.perf_counter() - layer_start) * 1000.0 - chart_ms, 2),
+            },
+        })
+
+    return {
+        "type": "FeatureCollection",
+        "features": features,
+        "layers": summaries,
+        "timing_ms": {
+            "ephemeris": round(ephemeris_ms, 2),
+            "total": round((time.perf_counter() - start) * 1000.0, 2),
+        },
+    }
@@ -5,7 +5,8 @@ Coordinator module: delegates core logic to specialized modules and assembles ch
 """
 
 from location_utils import get_coordinates
-from ephemeris_utils import calculate_extended_planets, initialize_ephemeris, ensure_ephemeris_path
+from ephemeris_utils import calculate_extended_planets, initialize_ephemeris, ensure_ephemeris_path, ephemeris_context, CHART_PLANETS
+from chart_context import ChartContext
 from hermetic_lots import calculate_hermetic_lots
 from fixed_star import get_fixed_star_positions
 from aspects import calculate_aspects
@@ -19,15 +20,20 @@ import datetime
 # Only initialize ephemeris once globally
 initialize_ephemeris()
 
+# Top-level sections of a calculate_chart result; aspects, lots and fixed stars are
+# only computed when requested (see the `fields` argument)
+CHART_FIELDS = ("input", "coordinates", "utc_time", "houses", "planets", "aspects", "lots", "fixed_stars")
+
 def convert_to_utc(date_str, time_str, timezone_str):
     """
     Convert local time to UTC.
     Args:
         date_str (str): Date in format "YYYY-MM-DD" or "MM/DD/YYYY"
-        time_str (str): Time in format "HH:MM"
+        time_str (str): Time in format "HH:MM", or "HH:MM:SS[.ffffff]" for sub-minute moments
         timezone_str (str): Timezone string (e.g., "America/New_York")
     Returns:
-        tuple: (julian_day_ut, year, month, day, hour, minute, second) in UTC
+        tuple: (julian_day_ut, year, month, day, hour, minute, second) in UTC; the
+        Julian day keeps fractional seconds, `second` is whole
     """
     try:
         # Handle both date formats: "YYYY-MM-DD" and "MM/DD/YYYY"
@@ -40,12 +46,14 @@ def convert_to_utc(date_str, time_str, timezone_str):
         else:
             raise ValueError(f"Unsupported date format: {date_str}")
         
-        hour, minute = map(int, time_str.split(':'))
-        second = 0
+        hour, minute, *seconds = time_str.split(':')
+        second = float(seconds[0]) if seconds else 0.0
         local_tz = pytz.timezone(timezone_str)
-        local_dt = local_tz.localize(datetime.datetime(year, month, day, hour, minute, second))
+        local_dt = local_tz.localize(datetime.datetime(year, month, day, int(hour), int(minute))
+                                     + datetime.timedelta(seconds=second))
         utc_dt = local_dt.astimezone(pytz.UTC)
-        jd_ut = swe.julday(utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour + utc_dt.minute/60.0 + utc_dt.second/3600.0)
+        jd_ut = swe.julday(utc_dt.year, utc_dt.month, utc_dt.day,
+                           utc_dt.hour + utc_dt.minute/60.0 + (utc_dt.second + utc_dt.microsecond/1e6)/3600.0)
         return (jd_ut, utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour, utc_dt.minute, utc_dt.second)
     except Exception as e:
         print(f"Error converting time: {e}")
@@ -104,13 +112,14 @@ def calculate_houses(jd_ut, lat, lon, house_system='whole_sign'):
 
 def calculate_chart(
     birth_date, birth_time, birth_city=None, birth_state="", birth_country="", timezone="", house_system='whole_sign', use_extended_planets=False,
-    progressed_for=None, progression_method="secondary", progressed_date=None, coordinates=None
+    progressed_for=None, progression_method="secondary", progressed_date=None, coordinates=None,
+    return_context=False, context=None, fields=None
 ):
     """
     Calculate complete astrological chart by delegating to specialized modules.
     Args:
         birth_date (str): Birth date in format "YYYY-MM-DD" or "MM/DD/YYYY"
-        birth_time (str): Birth time in format "HH:MM"
+        birth_time (str): Birth time in format "HH:MM" (or "HH:MM:SS[.ffffff]", see convert_to_utc)
         birth_city (str, optional): City of birth
         birth_state (str, optional): State/province/region of birth
         birth_country (str, optional): Country of birth
@@ -121,31 +130,52 @@ def calculate_chart(
         progressed_for (list, optional): List of planet names to progress (e.g., ["Sun", "Moon"])
         progression_method (str): Progression method (default: "secondary")
         progressed_date (str, optional): Custom date for progression (YYYY-MM-DD)
+        return_context (bool): Also return the ChartContext built for this chart
+        context (ChartContext, optional): Precomputed context for this moment (e.g. from
+            ChartContext.sweep); used for natal/transit charts when its jd_ut matches
+        fields (iterable, optional): CHART_FIELDS to include; None means all. Aspects,
+            lots and fixed stars are skipped entirely when not listed
     Returns:
-        dict: Complete astrological chart data
+        dict: Complete astrological chart data, or (chart, ChartContext) when
+        return_context is set (the context is None if the chart has an error)
     """
+    with ephemeris_context():
+        chart, context = _calculate_chart(
+            birth_date, birth_time, birth_city, birth_state, birth_country, timezone, house_system,
+            use_extended_planets, progressed_for, progression_method, progressed_date, coordinates, context,
+            fields
+        )
+    return (chart, context) if return_context else chart
+
+def _calculate_chart(
+    birth_date, birth_time, birth_city, birth_state, birth_country, timezone, house_system,
+    use_extended_planets, progressed_for, progression_method, progressed_date, coordinates,
+    precomputed_context=None, fields=None
+):
+    context = None
+    fields = set(CHART_FIELDS if fields is None else fields)
     try:
         # Validate house system
         if not validate_house_system(house_system):
-            return {"error": f"Unsupported house system: {house_system}. Use one of: {list(HOUSE_SYSTEMS.keys())}"}
+            return {"error": f"Unsupported house system: {house_system}. Use one of: {list(HOUSE_SYSTEMS.keys())}"}, None
         
         # Get coordinates either from provided coordinates or by geocoding
         if coordinates:
             lat = coordinates.get('latitude')
             lon = coordinates.get('longitude')
             if lat is None or lon is None:
-                return {"error": "Invalid coordinates: latitude and longitude are required"}
+                return {"error": "Invalid coordinates: latitude and longitude are required"}, None
             print(f"Using provided coordinates: lat={lat}, lon={lon}")
         else:
             coord_result = get_coordinates(birth_city, birth_state, birth_country)
             if not coord_result:
                 error_msg = f"Could not geocode location. Please check city, state, and country information. Provided: city='{birth_city}', state='{birth_state}', country='{birth_country}'"
                 print(f"Geocoding failed: {error_msg}")
-                return {"error": error_msg}
+                return {"error": error_msg}, None
             lat, lon = coord_result
         time_data = convert_to_utc(birth_date, birth_time, timezone)
         if not time_data:
-            return {"error": "Could not convert time to UTC"}
+            return {"error": "Could not convert time to UTC"}, None
         jd_ut, year, month, day, hour, minute, second = time_data
         houses_data = calculate_houses(jd_ut, lat, lon, house_system)
         # --- Progression logic ---
@@ -175,20 +205,24 @@ def calculate_chart(
             jd_transit = swe.julday(prog_dt.year, prog_dt.month, prog_dt.day, 
                                    hour + minute/60.0 + second/3600.0)
             from ephemeris_utils import get_positions
+            # Add outer planets and asteroids as transits for the custom date
+            all_planets = ["Sun","Moon","Mercury","Venus","Mars","Jupiter","Saturn","Uranus","Neptune","Pluto","Lunar Node","Chiron","Ceres","Pallas Athena","Juno","Vesta","Black Moon Lilith","Pholus"]
+            transit_planets = [p for p in all_planets if p not in (progressed_for or [])]
+            # One context for the whole CCG chart: progressed bodies at jd_prog, the rest at jd_transit
+            body_jds = {name: jd_transit for name in transit_planets}
+            body_jds.update({name: jd_prog for name in progressed_for})
+            context = ChartContext.build(jd_ut, list(progressed_for) + transit_planets, body_jds=body_jds)
             # For CCG, calculate specified planets as progressions
             planets_data = []
             progressed_planets = []
             for name in progressed_for:
                 # Use standard secondary progression for inner planets (1 day = 1 year)
-                pos = get_positions(jd_prog, [name])
+                pos = get_positions(jd_prog, [name], context=context)
                 for p in pos:
                     p["data_type"] = "progressed"
                     progressed_planets.append(p)
                     planets_data.append(p)
-            # Add outer planets and asteroids as transits for the custom date
-            all_planets = ["Sun","Moon","Mercury","Venus","Mars","Jupiter","Saturn","Uranus","Neptune","Pluto","Lunar Node","Chiron","Ceres","Pallas Athena","Juno","Vesta","Black Moon Lilith","Pholus"]
-            transit_planets = [p for p in all_planets if p not in (progressed_for or [])]
-            for p in get_positions(jd_transit, transit_planets):
+            for p in get_positions(jd_transit, transit_planets, context=context):
                 p["data_type"] = "transit"
                 planets_data.append(p)
             # --- Hermetic Lots for CCG (progressed) ---
@@ -212,22 +246,28 @@ def calculate_chart(
                     planets_data.append(lot_obj)
         else:
             # Default: all planets as transits
-            planets_data = calculate_extended_planets(jd_ut, use_extended=use_extended_planets)
+            if precomputed_context is not None and precomputed_context.jd_ut == jd_ut:
+                context = precomputed_context
+            else:
+                context = ChartContext.build(jd_ut, CHART_PLANETS.values())
+            planets_data = calculate_extended_planets(jd_ut, use_extended=use_extended_planets, context=context)
             for p in planets_data:
                 p["data_type"] = "transit"
-        aspects_data = calculate_aspects(planets_data)
+        aspects_data = calculate_aspects(planets_data) if "aspects" in fields else None
         ascendant_long = houses_data["ascendant"]["longitude"] if "ascendant" in houses_data else None
         
         # Calculate lots - skip for progressed charts for now
         if progressed_for:
             lots_data = []  # Skip hermetic lots for CCG/progressed charts
+        elif "lots" not in fields:
+            lots_data = None
         else:
             lots_data = calculate_hermetic_lots(planets_data, ascendant_long) if ascendant_long is not None else []
             # Tag lots with data_type for transit charts
             for lot in lots_data:
                 lot["data_type"] = "transit"
         
-        fixed_stars_data = get_fixed_star_positions(jd_ut)
+        fixed_stars_data = get_fixed_star_positions(jd_ut) if "fixed_stars" in fields else None
         
         # For progressed charts, use birth JD for coordinate system to prevent daily shifts
         # The planets are already calculated with progressed positions, but the coordinate
@@ -263,13 +303,14 @@ def calculate_chart(
             "lots": lots_data,
             "fixed_stars": fixed_stars_data
         }
+        result = {key: value for key, value in result.items() if value is not None}
         
         # Add house placements to all bodies
         result = add_house_placements_to_chart_data(result)
         
-        return result
+        return {key: value for key, value in result.items() if key in fields}, context
     except Exception as e:
-        return {"error": str(e)}
+        return {"error": str(e)}, None
 
 if __name__ == "__main__":
     chart = calculate_chart(
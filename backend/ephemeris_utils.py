@@ -3,19 +3,41 @@ import requests
 import zipfile
 import io
 import swisseph as swe
+import threading
 import time
+from contextlib import contextmanager
 from functools import lru_cache
 
 # Always use the same ephemeris path as api.py
 EPHE_PATH = os.path.join(os.path.dirname(__file__), "ephe")
-swe.set_ephe_path(EPHE_PATH)
+
+# Swiss Ephemeris keeps its path, sidereal mode and open files in thread-local C
+# globals: a thread that never set the path silently falls back to the Moshier
+# theory and cannot find asteroid files. ensure_ephemeris_path() and
+# ephemeris_context() therefore track that state per thread.
+_thread_state = threading.local()
 
 def ensure_ephemeris_path():
-    """Ensure Swiss Ephemeris always uses the correct path."""
-    swe.set_ephe_path(EPHE_PATH)
+    """Ensure Swiss Ephemeris uses backend/ephe in this thread (resetting it would close open files)."""
+    if not getattr(_thread_state, "path_set", False):
+        swe.set_ephe_path(EPHE_PATH)
+        _thread_state.path_set = True
     # Uncomment for debugging:
     # print("[DEBUG] Swiss Ephemeris path now:", swe.get_ephe_path())
 
+ensure_ephemeris_path()
+
+@contextmanager
+def ephemeris_context():
+    """
+    Set up this thread's Swiss Ephemeris state for a calculation.
+
+    Safe to call from any worker thread and to nest. Charts are tropical: no
+    caller sets a sidereal mode or passes swe.FLG_SIDEREAL.
+    """
+    ensure_ephemeris_path()
+    yield
+
 # Define ephemeris file paths
 EPHEMERIS_DIR = EPHE_PATH  # Always use backend/ephe
 EPHEMERIS_URL = "https://www.astro.com/ftp/swisseph/ephe/"
@@ -102,79 +124,69 @@ ZODIAC_SIGNS = [
     "Sagittarius", "Capricorn", "Aquarius", "Pisces"
 ]
 
-def calculate_extended_planets(jd_ut, use_extended=False):
-    ensure_ephemeris_path()
+# Main planets, asteroids, nodes, and Lilith for astrocartography (using correct Swiss Ephemeris IDs, no collisions)
+CHART_PLANETS = {
+    swe.SUN: "Sun",
+    swe.MOON: "Moon",
+    swe.MERCURY: "Mercury",
+    swe.VENUS: "Venus",
+    swe.MARS: "Mars",
+    swe.JUPITER: "Jupiter",
+    swe.SATURN: "Saturn",
+    swe.URANUS: "Uranus",
+    swe.NEPTUNE: "Neptune",
+    swe.PLUTO: "Pluto",
+    swe.AST_OFFSET + 1: "Ceres",
+    swe.AST_OFFSET + 2: "Pallas Athena",
+    swe.AST_OFFSET + 3: "Juno",
+    swe.AST_OFFSET + 4: "Vesta",
+    swe.CHIRON: "Chiron",
+    swe.PHOLUS: "Pholus",
+    swe.MEAN_NODE: "Lunar Node",
+    swe.MEAN_APOG: "Black Moon Lilith"
+}
+
+def calculate_extended_planets(jd_ut, use_extended=False, context=None):
     """
     Calculate planetary positions with option for extended set
     
     Args:
         jd_ut (float): Julian day in UT
         use_extended (bool): Whether to use extended planet set
+        context (ChartContext, optional): Already computed positions for jd_ut
         
     Returns:
         list: Planetary positions and data
     """
+    if context is None:
+        try:
+            from backend.chart_context import ChartContext
+        except ImportError:
+            from chart_context import ChartContext
+        context = ChartContext.build(jd_ut, CHART_PLANETS.values())
     planets = []
     
-    # Set ephemeris flags to use built-in data if files are missing
-    flags = swe.FLG_SWIEPH | swe.FLG_SPEED
-    
-    # Main planets, asteroids, nodes, and Lilith for astrocartography (using correct Swiss Ephemeris IDs, no collisions)
-    planet_set = {
-        swe.SUN: "Sun",
-        swe.MOON: "Moon",
-        swe.MERCURY: "Mercury",
-        swe.VENUS: "Venus",
-        swe.MARS: "Mars",
-        swe.JUPITER: "Jupiter",
-        swe.SATURN: "Saturn",
-        swe.URANUS: "Uranus",
-        swe.NEPTUNE: "Neptune",
-        swe.PLUTO: "Pluto",
-        swe.AST_OFFSET + 1: "Ceres",
-        swe.AST_OFFSET + 2: "Pallas Athena",
-        swe.AST_OFFSET + 3: "Juno",
-        swe.AST_OFFSET + 4: "Vesta",
-        swe.CHIRON: "Chiron",
-        swe.PHOLUS: "Pholus",
-        swe.MEAN_NODE: "Lunar Node",
-        swe.MEAN_APOG: "Black Moon Lilith"
-    }
-    
     # Calculate positions for planets
-    for planet_id, planet_name in planet_set.items():
-        try:
-            # Use cached calculation for better performance
-            result, flag = cached_calc_ut(jd_ut, planet_id, flags)
-            
-            # Extract data
-            longitude = result[0]
-            latitude = result[1]
-            distance = result[2]
-            speed = result[3]  # Daily motion in longitude
-            
-            # Determine zodiac sign and position within sign
-            sign_num = int(longitude / 30)
-            sign_name = ZODIAC_SIGNS[int(longitude / 30) % 12]  # Ensure we don't go out of bounds
-            position_in_sign = longitude % 30
-            
-            # Determine if retrograde
-            is_retrograde = speed < 0
+    for planet_id, planet_name in CHART_PLANETS.items():
+        if planet_name in context:
+            body = context.body(planet_name)
+            longitude = body["longitude"]
+            speed = body["speed"]  # Daily motion in longitude
             
             # Add to results
             planets.append({
                 'id': planet_id,
                 'name': planet_name,
                 'longitude': longitude,
-                'latitude': latitude,
-                'distance': distance,
+                'latitude': body["latitude"],
+                'distance': body["distance"],
                 'speed': speed,
-                'sign': sign_name,
-                'position': position_in_sign,
-                'retrograde': is_retrograde
+                'sign': ZODIAC_SIGNS[int(longitude / 30) % 12],  # Ensure we don't go out of bounds
+                'position': longitude % 30,
+                'retrograde': speed < 0
             })
-        except Exception as e:
-            print(f"Error calculating {planet_name}: {e}")
+        else:
+            error = context.errors.get(planet_name, "not computed")
             # Add placeholder data for failed calculations to avoid breaking the UI
             planets.append({
                 'id': planet_id,
@@ -186,47 +198,47 @@ def calculate_extended_planets(jd_ut, use_extended=False):
                 'sign': 'Unknown',
                 'position': 0.0,
                 'retrograde': False,
-                'error': str(e)
+                'error': error
             })
             
             # If this is an asteroid and the error is about missing files, try to download
             if planet_id in [swe.CHIRON, swe.PHOLUS, swe.CERES, swe.PALLAS, swe.JUNO, swe.VESTA]:
-                if "SwissEph file" in str(e) and "not found" in str(e):
+                if "SwissEph file" in error and "not found" in error:
                     print(f"Missing asteroid file for {planet_name}. Please add the required .se1 file to the backend/ephe/ folder.")
     
     return planets
 
-def get_positions(jd_ut, ids):
-    ensure_ephemeris_path()
+def get_positions(jd_ut, ids, context=None):
     """
     Get planetary positions for the given Julian date and planet IDs.
     
     Args:
         jd_ut (float): Julian day in UT
         ids (list): List of planet names (e.g., ["Sun", "Moon"])
+        context (ChartContext, optional): Context already holding these bodies
         
     Returns:
         list: List of dicts with planetary positions including both ecliptic and equatorial coordinates
     """
-    name_to_id = {v: k for k, v in EXTENDED_PLANETS.items()}
+    if context is None:
+        try:
+            from backend.chart_context import ChartContext
+        except ImportError:
+            from chart_context import ChartContext
+        context = ChartContext.build(jd_ut, ids)
     positions = []
     for name in ids:
-        planet_id = name_to_id.get(name)
-        if planet_id is not None:
-            # Get ecliptic coordinates
-            pos, _ = swe.calc_ut(jd_ut, planet_id)
-            # Get equatorial coordinates  
-            pos_eq, _ = swe.calc_ut(jd_ut, planet_id, swe.FLG_SWIEPH | swe.FLG_EQUATORIAL)
+        if name in context:
+            body = context.body(name)
             positions.append({
                 "name": name,
-                "id": planet_id,
-                "longitude": pos[0],
-                "latitude": pos[1],
-                "distance": pos[2],
-                "ra": pos_eq[0],  # Right Ascension for astrocartography
-                "dec": pos_eq[1], # Declination for astrocartography
-                "sign": ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", 
-                        "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"][int(pos[0] / 30)],
-                "position": pos[0] % 30
+                "id": body["id"],
+                "longitude": body["longitude"],
+                "latitude": body["latitude"],
+                "distance": body["distance"],
+                "ra": body["ra"],  # Right Ascension for astrocartography
+                "dec": body["dec"], # Declination for astrocartography
+                "sign": ZODIAC_SIGNS[int(body["longitude"] / 30)],
+                "position": body["longitude"] % 30
             })
     return positions
@@ -0,0 +1,157 @@
+"""
+Content-addressed cache of astrocartography features.
+
+API:
+- chart_cache_key(chart_data, filter_options) -> str:
+    SHA-256 of the canonical chart inputs the feature pipeline reads.
+- FeatureCache(max_entries, db_path):
+    Bounded in-memory LRU with an optional SQLite tier and hit/miss counters.
+- copy_features(features) -> List[Dict]:
+    Fresh feature and properties dicts around shared geometry.
+- FEATURE_CACHE:
+    Process-wide instance used by generate_all_astrocartography_features. Set
+    MERIDIAN_FEATURE_CACHE_DB to a file path to enable its on-disk tier.
+
+Features are pure functions of the chart time, the chart's bodies, lots, fixed stars and houses,
+and the filter options, so reloading or sharing a chart maps to the same key.
+Entries hand out fresh feature and properties dicts on every hit, because callers
+relabel properties in place; geometry is shared and must be treated as read-only.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+DEFAULT_MAX_ENTRIES = 256
+CACHE_VERSION = 2  # Bump when the feature pipeline's output changes
+
+def chart_cache_key(chart_data: Dict, filter_options: Optional[Dict]) -> Optional[str]:
+    """
+    Canonical hash of (julian_day, bodies, lots, fixed stars, houses, house system, filter options).
+
+    Bodies, lots and fixed stars are hashed whole: their RA, house and sign all end up in the
+    features. Houses stand in for the location, which only reaches the output
+    through house placements. Returns None for charts without a Julian day.
+    """
+    jd = (chart_data.get("utc_time") or {}).get("julian_day")
+    if jd is None:
+        return None
+    houses = chart_data.get("houses") or {}
+    canonical = {
+        "version": CACHE_VERSION,
+        "julian_day": jd,
+        "bodies": chart_data.get("planets") or [],
+        "lots": chart_data.get("lots") or [],
+        "houses": houses,
+        "fixed_stars": chart_data.get("fixed_stars") or [],
+        "house_system": (chart_data.get("input") or {}).get("house_system") or houses.get("house_system"),
+        # Unset options and the output format don't change the features
+        "filter_options": {
+            k: v for k, v in (filter_options or {}).items() if v is not None and k != "output_mode"
+        },
+    }
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def copy_features(features: List[Dict]) -> List[Dict]:
+    """New feature and properties dicts around the shared geometry."""
+    return [{**f, "properties": dict(f.get("properties", {}))} for f in features]
+
+class FeatureCache:
+    """
+    LRU cache of feature lists keyed by chart_cache_key.
+
+    Args:
+        max_entries: In-memory entries kept before the least recently used is evicted
+        db_path: Optional SQLite file for a second, persistent tier. Memory misses
+            fall through to it and its hits are promoted back into memory.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS features (key TEXT PRIMARY KEY, value BLOB, created REAL)"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Cached features for `key`, or None on a miss."""
+        with self._lock:
+            features = self._entries.get(key)
+            if features is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy_features(features)
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM features WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    features = json.loads(zlib.decompress(row[0]))
+                    self._remember(key, features)
+                    self.disk_hits += 1
+                    return copy_features(features)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, features: List[Dict]) -> None:
+        """Store a copy of `features` in memory and, when enabled, on disk."""
+        stored = copy_features(features)
+        with self._lock:
+            self._remember(key, stored)
+            if self._db is not None:
+                value = zlib.compress(json.dumps(stored, separators=(",", ":")).encode("utf-8"))
+                self._db.execute(
+                    "INSERT OR REPLACE INTO features (key, value, created) VALUES (?, ?, ?)",
+                    (key, value, time.time()),
+                )
+                self._db.commit()
+
+    def _remember(self, key, features):
+        self._entries[key] = features
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM features")
+                self._db.commit()
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "disk_tier": self.db_path,
+            }
+
+FEATURE_CACHE = FeatureCache(
+    max_entries=int(os.environ.get("MERIDIAN_FEATURE_CACHE_SIZE", DEFAULT_MAX_ENTRIES)),
+    db_path=os.environ.get("MERIDIAN_FEATURE_CACHE_DB"),
+)
@@ -1,6 +1,10 @@
-# Fixed star calculation module using Swiss Ephemeris
+# Fixed star calculation module: sefstars.txt catalogue, propagated with NumPy
+import os
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
 import swisseph as swe
-from ephemeris_utils import ensure_ephemeris_path
+from ephemeris_utils import ephemeris_context, EPHE_PATH
 
 # List of fixed stars and their Swiss Ephemeris names
 FIXED_STARS = [
@@ -55,24 +59,157 @@ FIXED_STARS = [
     {"name": "Galactic Center", "swe_name": "Gal. Center"}  # Not a star, but included for reference
 ]
 
-def get_fixed_star_positions(jd):
+CATALOGUE_PATH = os.path.join(EPHE_PATH, "sefstars.txt")
+ARCSEC = np.pi / (180.0 * 3600.0)
+AU_PER_DAY_C = 173.1446326846693  # speed of light in AU/day
+KM_S_PER_AU_YR = 4.740470446
+
+class StarCatalogue(NamedTuple):
+    """sefstars.txt as arrays; positions are ICRS at J2000, motions per Julian year."""
+    names: List[str]
+    nomenclature: List[str]
+    ra: np.ndarray          # radians
+    dec: np.ndarray         # radians
+    pm_ra: np.ndarray       # radians/year, already multiplied by cos(dec)
+    pm_dec: np.ndarray      # radians/year
+    radial_velocity: np.ndarray  # km/s
+    parallax: np.ndarray    # arcseconds
+    magnitude: np.ndarray
+    index: Dict[str, int]   # normalized traditional name -> first row
+
+def _key(name: str) -> str:
+    return "".join(name.split()).lower()
+
+def _sexagesimal(d, m, s):
+    sign = -1.0 if d.strip().startswith("-") else 1.0
+    return sign * (abs(float(d)) + float(m) / 60.0 + float(s) / 3600.0)
+
+_catalogue = None
+
+def load_catalogue(path: str = CATALOGUE_PATH) -> StarCatalogue:
+    """Parse the catalogue once per process; later calls return the same arrays."""
+    global _catalogue
+    if _catalogue is not None and path == CATALOGUE_PATH:
+        return _catalogue
+    rows = []
+    with open(path, encoding="latin-1") as f:
+        for line in f:
+            if line.startswith("#") or not line.strip():
+                continue
+            fields = [x.strip() for x in line.split(",")]
+            # Only J2000/ICRS records are used by the bundled file
+            if len(fields) < 14 or fields[2] not in ("ICRS", "2000"):
+                continue
+            rows.append(fields)
+    names = [r[0] for r in rows]
+    index = {}
+    for i, name in enumerate(names):
+        index.setdefault(_key(name), i)
+    col = lambda k: np.array([float(r[k]) for r in rows])
+    catalogue = StarCatalogue(
+        names=names,
+        nomenclature=[r[1] for r in rows],
+        ra=np.radians(15.0 * np.array([_sexagesimal(r[3], r[4], r[5]) for r in rows])),
+        dec=np.radians(np.array([_sexagesimal(r[6], r[7], r[8]) for r in rows])),
+        pm_ra=col(9) * 1e-3 * ARCSEC,
+        pm_dec=col(10) * 1e-3 * ARCSEC,
+        radial_velocity=col(11),
+        parallax=col(12) * 1e-3,
+        magnitude=col(13),
+        index=index,
+    )
+    if path == CATALOGUE_PATH:
+        _catalogue = catalogue
+    return catalogue
+
+def _rot_x(a):
+    c, s = np.cos(a), np.sin(a)
+    return np.array([[1, 0, 0], [0, c, s], [0, -s, c]])
+
+def _rot_y(a):
+    c, s = np.cos(a), np.sin(a)
+    return np.array([[c, 0, -s], [0, 1, 0], [s, 0, c]])
+
+def _rot_z(a):
+    c, s = np.cos(a), np.sin(a)
+    return np.array([[c, s, 0], [-s, c, 0], [0, 0, 1]])
+
+def _precession_matrix(jd):
+    """IAU 2006 (P03) precession, J2000 mean equator -> mean equator of date."""
+    t = (jd - 2451545.0) / 36525.0
+    zeta = (2.650545 + t * (2306.083227 + t * (0.2988499 + t * (0.01801828 + t * (-0.000005971 + t * -0.0000003173))))) * ARCSEC
+    z = (-2.650545 + t * (2306.077181 + t * (1.0927348 + t * (0.01826837 + t * (-0.000028596 + t * -0.0000002904))))) * ARCSEC
+    theta = (t * (2004.191903 + t * (-0.4294934 + t * (-0.04182264 + t * (-0.000007089 + t * -0.0000001274))))) * ARCSEC
+    return _rot_z(-z) @ _rot_y(theta) @ _rot_z(-zeta)
+
+def star_positions(jd: float, rows: Optional[np.ndarray] = None, catalogue: StarCatalogue = None):
     """
-    Returns a list of dicts with name, longitude, latitude for each fixed star at given Julian day.
+    Apparent geocentric ecliptic longitude/latitude (degrees, true equinox of date) of catalogue rows.
+
+    Proper motion, radial velocity, precession, nutation and annual aberration are
+    applied to every star at once. Annual parallax (< 0.8") and light deflection
+    by the Sun are left out, so results stay within about 1" of swe.fixstar.
+    """
+    cat = catalogue or load_catalogue()
+    idx = np.arange(len(cat.names)) if rows is None else np.asarray(rows, dtype=int)
+    years = (jd - 2451545.0) / 365.25
+    ra, dec = cat.ra[idx], cat.dec[idx]
+    cos_ra, sin_ra, cos_dec, sin_dec = np.cos(ra), np.sin(ra), np.cos(dec), np.sin(dec)
+    # Space motion in the J2000 frame: unit vector plus its yearly change
+    u = np.stack([cos_dec * cos_ra, cos_dec * sin_ra, sin_dec])
+    e_ra = np.stack([-sin_ra, cos_ra, np.zeros_like(ra)])
+    e_dec = np.stack([-sin_dec * cos_ra, -sin_dec * sin_ra, cos_dec])
+    radial = cat.radial_velocity[idx] * cat.parallax[idx] * ARCSEC / KM_S_PER_AU_YR
+    p = u + years * (cat.pm_ra[idx] * e_ra + cat.pm_dec[idx] * e_dec + radial * u)
+    p /= np.linalg.norm(p, axis=0)
+
+    # Annual aberration from the Earth's velocity (minus the geocentric Sun's) in J2000 coordinates
+    with ephemeris_context():
+        sun, _ = swe.calc(jd, swe.SUN, swe.FLG_SWIEPH | swe.FLG_XYZ | swe.FLG_SPEED | swe.FLG_EQUATORIAL | swe.FLG_J2000)
+        nut, _ = swe.calc(jd, swe.ECL_NUT)
+    earth_velocity = -np.array(sun[3:6]) / AU_PER_DAY_C
+    p = p + earth_velocity[:, None]
+    p /= np.linalg.norm(p, axis=0)
+
+    # Mean equator of date -> mean ecliptic of date, then nutation in longitude
+    mean_obliquity, dpsi = np.radians(nut[1]), nut[2]
+    x, y, z = _rot_x(mean_obliquity) @ _precession_matrix(jd) @ p
+    lon = (np.degrees(np.arctan2(y, x)) + dpsi) % 360.0
+    lat = np.degrees(np.arcsin(np.clip(z, -1.0, 1.0)))
+    return lon, lat
+
+def get_fixed_star_positions(jd, stars: Iterable[Dict] = None, max_magnitude: float = None):
+    """
+    Returns a list of dicts with name, longitude, latitude and magnitude for each fixed star at given Julian day.
+
+    Args:
+        jd: Julian day
+        stars: Entries like FIXED_STARS; None uses FIXED_STARS, "all" the whole catalogue
+        max_magnitude: Keep only stars at least this bright (lower magnitude)
     """
-    results = []
-    for star in FIXED_STARS:
-        try:
-            ensure_ephemeris_path()
-            # Use Swiss Ephemeris to get star position (longitude, latitude)
-            # swe.fixstar returns (pos, starname, starret)
-            ret = swe.fixstar(star["swe_name"], jd, flags=swe.FLG_SWIEPH)
-            pos = ret[0]
-            results.append({
-                "name": star["name"],
-                "longitude": pos[0],
-                "latitude": pos[1],
-                "magnitude": pos[3] if len(pos) > 3 else None
-            })
-        except Exception as e:
-            print(f"Error calculating {star['name']}: {e}")
-    return results
+    cat = load_catalogue()
+    if stars == "all":
+        selected = [(name, i) for i, name in enumerate(cat.names) if cat.index[_key(name)] == i]
+    else:
+        selected = []
+        for star in (FIXED_STARS if stars is None else stars):
+            row = cat.index.get(_key(star["swe_name"]))
+            if row is None:
+                print(f"Error calculating {star['name']}: not in {os.path.basename(CATALOGUE_PATH)}")
+                continue
+            selected.append((star["name"], row))
+    if max_magnitude is not None:
+        selected = [(name, i) for name, i in selected if cat.magnitude[i] <= max_magnitude]
+    if not selected:
+        return []
+    rows = np.array([i for _, i in selected])
+    lon, lat = star_positions(jd, rows, cat)
+    return [
+        {
+            "name": name,
+            "longitude": float(lon[k]),
+            "latitude": float(lat[k]),
+            "magnitude": float(cat.magnitude[i]),
+        }
+        for k, (name, i) in enumerate(selected)
+    ]
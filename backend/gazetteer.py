@@ -0,0 +1,189 @@
+"""
+Offline gazetteer for place lookups.
+
+API:
+- Gazetteer.load(cities_path, admin1_path=None, countries_path=None) -> Gazetteer:
+    Reads a GeoNames-style cities dump (e.g. cities15000.txt) and the optional
+    admin1/country name tables.
+- Gazetteer.suggest(query, limit) -> List[Dict]:
+    Population-ranked prefix matches in the location_utils suggestion shape.
+- Gazetteer.lookup(city, state, country) -> Optional[Dict]:
+    Best exact-name match, narrowed by state/country when given.
+- get_gazetteer() -> Optional[Gazetteer]:
+    Process-wide instance from MERIDIAN_GAZETTEER_DIR (default backend/data/geonames),
+    or None when no dump is installed. `make gazetteer` downloads one.
+
+The index is a sorted array of normalized name keys; a prefix query is one
+bisect to the first key and one to the end of the prefix range, so lookups
+never touch the network and stay in the microsecond range.
+"""
+import bisect
+import os
+import threading
+import unicodedata
+from typing import Dict, List, Optional
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "geonames")
+CITIES_FILE = "cities15000.txt"
+ADMIN1_FILE = "admin1CodesASCII.txt"
+COUNTRIES_FILE = "countryInfo.txt"
+
+# GeoNames "geoname" table columns
+COL_NAME, COL_ASCII, COL_ALT, COL_LAT, COL_LON = 1, 2, 3, 4, 5
+COL_COUNTRY, COL_ADMIN1, COL_POPULATION, COL_TIMEZONE = 8, 10, 14, 17
+
+def normalize(text: str) -> str:
+    """Case- and accent-insensitive key: "São Paulo" -> "sao paulo"."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().replace("-", " ").split())
+
+def _read_table(path: str) -> List[List[str]]:
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#") or not line.strip():
+                continue
+            rows.append(line.rstrip("\n").split("\t"))
+    return rows
+
+class Gazetteer:
+    """Population-ranked prefix index over a GeoNames cities dump."""
+
+    def __init__(self, places: List[Dict], admin1: Dict[str, str] = None, countries: Dict[str, str] = None):
+        self.places = places
+        self.admin1 = admin1 or {}
+        self.countries = countries or {}
+        entries = set()
+        for i, place in enumerate(places):
+            for name in place["names"]:
+                entries.add((normalize(name), i))
+        entries = sorted(entries)
+        self._keys = [k for k, _ in entries]
+        self._ids = [i for _, i in entries]
+
+    @classmethod
+    def load(cls, cities_path: str, admin1_path: str = None, countries_path: str = None) -> "Gazetteer":
+        """Build the index from GeoNames text files."""
+        countries, iso3 = {}, {}
+        if countries_path and os.path.exists(countries_path):
+            for row in _read_table(countries_path):
+                if len(row) > 4:
+                    countries[row[0]] = row[4]
+                    iso3[row[0]] = row[1]
+        admin1 = {}
+        if admin1_path and os.path.exists(admin1_path):
+            admin1 = {row[0]: row[1] for row in _read_table(admin1_path) if len(row) > 1}
+        places = []
+        for row in _read_table(cities_path):
+            if len(row) <= COL_TIMEZONE:
+                continue
+            country_code = row[COL_COUNTRY]
+            places.append({
+                "city": row[COL_NAME],
+                "state": admin1.get(f"{country_code}.{row[COL_ADMIN1]}", ""),
+                # GeoNames admin1 code: the postal abbreviation for US states ("TX"), numeric elsewhere
+                "state_code": row[COL_ADMIN1],
+                "country": countries.get(country_code, country_code),
+                "country_code": country_code,
+                "country_iso3": iso3.get(country_code, ""),
+                "latitude": float(row[COL_LAT]),
+                "longitude": float(row[COL_LON]),
+                "timezone": row[COL_TIMEZONE] or None,
+                "population": int(row[COL_POPULATION] or 0),
+                # Only the primary and ASCII names are indexed; alternate names bloat the index
+                "names": {row[COL_NAME], row[COL_ASCII]},
+            })
+        print(f"[GAZETTEER] Indexed {len(places)} places from {os.path.basename(cities_path)}")
+        return cls(places, admin1, countries)
+
+    def _prefix_ids(self, prefix: str) -> set:
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = bisect.bisect_left(self._keys, prefix + "\uffff", lo)
+        return set(self._ids[lo:hi])
+
+    def _matches_qualifier(self, place: Dict, qualifier: str) -> bool:
+        """
+        True if a "state" or "country" query part names this place's region.
+
+        State and country names match by prefix ("Tex", "United"); the state code and
+        the ISO2/ISO3 country codes ("TX", "US", "USA") only match exactly.
+        """
+        q = normalize(qualifier)
+        if not q:
+            return True
+        if any(normalize(value) == q for value in
+               (place.get("state_code"), place.get("country_code"), place.get("country_iso3")) if value):
+            return True
+        return any(normalize(value).startswith(q) for value in (place["state"], place["country"]) if value)
+
+    def _suggestion(self, place: Dict) -> Dict:
+        address = ", ".join(p for p in (place["city"], place["state"], place["country"]) if p)
+        return {
+            "address": address,
+            "city": place["city"],
+            "state": place["state"],
+            "country": place["country"],
+            "latitude": place["latitude"],
+            "longitude": place["longitude"],
+            "timezone": place["timezone"],
+        }
+
+    def suggest(self, query: str, limit: int = 5) -> List[Dict]:
+        """
+        Places whose name starts with the query's first comma-separated part, most populous first.
+
+        Later parts ("Paris, Texas", "Springfield, IL, US") must prefix-match the
+        place's state or country name, or equal its state code or ISO2/ISO3 country code.
+        """
+        parts = [p.strip() for p in (query or "").split(",") if p.strip()]
+        if not parts:
+            return []
+        ids = self._prefix_ids(normalize(parts[0]))
+        places = [self.places[i] for i in ids]
+        for qualifier in parts[1:]:
+            places = [p for p in places if self._matches_qualifier(p, qualifier)]
+        places.sort(key=lambda p: (-p["population"], p["city"]))
+        return [self._suggestion(p) for p in places[:limit]]
+
+    def lookup(self, city: str, state: str = "", country: str = "") -> Optional[Dict]:
+        """Most populous place named exactly `city`, within `state`/`country` when given."""
+        key = normalize(city)
+        if not key:
+            return None
+        lo = bisect.bisect_left(self._keys, key)
+        hi = bisect.bisect_right(self._keys, key, lo)
+        places = [self.places[i] for i in set(self._ids[lo:hi])]
+        for qualifier in (state, country):
+            if qualifier:
+                places = [p for p in places if self._matches_qualifier(p, qualifier)]
+        if not places:
+            return None
+        return self._suggestion(max(places, key=lambda p: p["population"]))
+
+_gazetteer = None
+_gazetteer_loaded = False
+_gazetteer_lock = threading.Lock()
+
+def get_gazetteer() -> Optional[Gazetteer]:
+    """Shared Gazetteer from MERIDIAN_GAZETTEER_DIR, loaded once; None if no dump is installed."""
+    global _gazetteer, _gazetteer_loaded
+    if _gazetteer_loaded:
+        return _gazetteer
+    with _gazetteer_lock:
+        if not _gazetteer_loaded:
+            data_dir = os.environ.get("MERIDIAN_GAZETTEER_DIR", DEFAULT_DIR)
+            cities_path = os.path.join(data_dir, CITIES_FILE)
+            if os.path.exists(cities_path):
+                try:
+                    _gazetteer = Gazetteer.load(
+                        cities_path,
+                        os.path.join(data_dir, ADMIN1_FILE),
+                        os.path.join(data_dir, COUNTRIES_FILE),
+                    )
+                except Exception as e:
+                    print(f"[GAZETTEER] Could not load {cities_path}: {e}")
+            else:
+                print(f"[GAZETTEER] No dump at {cities_path}; run `make gazetteer` for offline lookups")
+            _gazetteer_loaded = True
+    return _gazetteer
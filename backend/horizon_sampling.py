@@ -0,0 +1,146 @@
+"""
+Analytic sampling of horizon curves for astrocartography.
+
+Exports:
+- sample_horizon_curves: Exact points of many bodies' rise/set curves, adaptively refined to a target angular error.
+- sample_horizon_curve: Single-body convenience wrapper.
+
+A body's horizon curve is the great circle 90° from its sub-point (δ, α − GST), so
+every sample lies exactly on cos H₀ = −tan φ · tan δ. The circle is walked by its
+azimuth s around the sub-point, which keeps the parameter smooth through the
+turning latitude where dH₀/dφ is unbounded; points are then added wherever the
+plotted chord strays from the true curve, so they gather where the curve bends
+hardest on the map (towards the poles for bodies near the equator).
+"""
+from typing import List, Tuple
+import numpy as np
+
+DEFAULT_TOLERANCE = 0.01  # degrees, max chord-to-curve deviation on the lon/lat plane
+
+def _horizon_points(s, sub_lon, dec):
+    """Lon/lat (degrees, lon unwrapped) of the horizon point at azimuth s (radians) from the sub-point."""
+    sin_lat = np.cos(dec) * np.cos(s)
+    lat = np.arcsin(np.clip(sin_lat, -1.0, 1.0))
+    lon = sub_lon + np.degrees(np.arctan2(np.sin(s) * np.cos(dec), -np.sin(dec) * sin_lat))
+    return lon, np.degrees(lat)
+
+def _band_runs(dec, lat_min, lat_max, rising_only):
+    """
+    Parameter intervals (u = s − 2π, in path order) where the curve stays inside [lat_min, lat_max].
+    u ∈ [−π, 0] is the rising (AC) half, u ∈ [0, π] the setting (DC) half.
+    """
+    cos_dec = np.cos(dec)
+    if cos_dec <= 0:
+        return []
+    c_lo = np.sin(np.radians(lat_min)) / cos_dec
+    c_hi = np.sin(np.radians(lat_max)) / cos_dec
+    if c_lo > 1 or c_hi < -1 or c_lo > c_hi:
+        return []
+    outer = np.arccos(c_lo) if c_lo > -1 else np.pi  # |u| ≤ outer keeps φ ≥ lat_min
+    inner = np.arccos(c_hi) if c_hi < 1 else 0.0     # |u| ≥ inner keeps φ ≤ lat_max
+    if inner > outer:
+        return []
+    if inner > 0:
+        runs = [(-outer, -inner), (inner, outer)]
+    else:
+        runs = [(-outer, outer)]
+    if rising_only:
+        runs = [(a, min(b, 0.0)) for a, b in runs if a < 0 or b == a == 0]
+    return runs
+
+def _refine(run_u, run_sub_lon, run_dec, tolerance, initial, max_depth):
+    """
+    Adaptive bisection of many parameter intervals at once.
+
+    Every run is seeded uniformly, then each pass inserts the midpoint of every chord
+    whose midpoint strays more than `tolerance` from the curve. Returns one
+    (u, lon, lat) triple per run.
+    """
+    seeds = []
+    for k, (u0, u1) in enumerate(run_u):
+        # A degenerate band (lat_min == lat_max) yields single exact points
+        n = 1 if u1 == u0 else max(2, int(np.ceil(initial * (u1 - u0) / (2 * np.pi))) + 1)
+        seeds.append((np.linspace(u0, u1, n), np.full(n, k)))
+    if not seeds:
+        return []
+    u = np.concatenate([a for a, _ in seeds])
+    run = np.concatenate([b for _, b in seeds])
+    sub_lon = np.asarray(run_sub_lon, dtype=float)
+    dec = np.asarray(run_dec, dtype=float)
+    lon, lat = _horizon_points(u, sub_lon[run], dec[run])
+    for _ in range(max_depth):
+        same = run[:-1] == run[1:]
+        mid = 0.5 * (u[:-1] + u[1:])
+        lon_m, lat_m = _horizon_points(mid, sub_lon[run[:-1]], dec[run[:-1]])
+        dlon = (np.diff(lon) + 180) % 360 - 180
+        chord_lon = lon[:-1] + 0.5 * dlon
+        err = np.hypot((lon_m - chord_lon + 180) % 360 - 180, lat_m - 0.5 * (lat[:-1] + lat[1:]))
+        bad = same & (err > tolerance)
+        if not bad.any():
+            break
+        u = np.concatenate([u, mid[bad]])
+        run = np.concatenate([run, run[:-1][bad]])
+        lon = np.concatenate([lon, lon_m[bad]])
+        lat = np.concatenate([lat, lat_m[bad]])
+        order = np.lexsort((u, run))
+        u, run, lon, lat = u[order], run[order], lon[order], lat[order]
+    bounds = np.searchsorted(run, np.arange(len(run_u) + 1))
+    return [(u[a:b], lon[a:b], lat[a:b]) for a, b in zip(bounds[:-1], bounds[1:])]
+
+def sample_horizon_curves(
+    ras_deg,
+    decs_deg,
+    gsts_deg,
+    lat_min: float = -85.0,
+    lat_max: float = 85.0,
+    tolerance: float = DEFAULT_TOLERANCE,
+    rising_only: bool = False,
+    initial: int = 48,
+    max_depth: int = 14,
+) -> List[List[Tuple[np.ndarray, np.ndarray, np.ndarray]]]:
+    """
+    Sample many bodies' horizon curves exactly, clipped to a latitude band, in one refinement pass.
+
+    Parameters
+    ----------
+    ras_deg, decs_deg : array-like
+        Right ascension and declination of each body (degrees).
+    gsts_deg : array-like or float
+        Greenwich sidereal time per body (degrees).
+    lat_min, lat_max : float
+        Latitude band to keep (degrees).
+    tolerance : float
+        Maximum deviation (degrees on the lon/lat plane) between any chord and the true curve.
+    rising_only : bool
+        Keep only the rising (AC) half, as for Ascendant lines.
+    initial : int
+        Uniform samples per full circle before refinement.
+    max_depth : int
+        Maximum refinement passes.
+
+    Returns
+    -------
+    curves : list
+        Per body, a list of continuous runs (lons, lats, is_rising) in path order:
+        AC south→north, then DC north→south. A new run starts wherever the band
+        cuts the curve. Longitudes are wrapped to [–180°, 180°]; is_rising flags
+        the AC points.
+    """
+    decs = np.radians(np.atleast_1d(np.asarray(decs_deg, dtype=float)))
+    sub_lons = np.atleast_1d(np.asarray(ras_deg, dtype=float)) - np.asarray(gsts_deg, dtype=float)
+    sub_lons = np.broadcast_to(sub_lons, decs.shape)
+    run_u, run_body = [], []
+    for j, dec in enumerate(decs):
+        for u0, u1 in _band_runs(dec, lat_min, lat_max, rising_only):
+            if u1 >= u0:
+                run_u.append((u0, u1))
+                run_body.append(j)
+    refined = _refine(run_u, sub_lons[run_body], decs[run_body], tolerance, initial, max_depth)
+    curves = [[] for _ in decs]
+    for j, (u, lon, lat) in zip(run_body, refined):
+        curves[j].append((((lon + 180) % 360) - 180, lat, u <= 0))
+    return curves
+
+def sample_horizon_curve(ra_deg: float, dec_deg: float, gst_deg: float, **kwargs):
+    """Single-body form of sample_horizon_curves; returns that body's list of runs."""
+    return sample_horizon_curves([ra_deg], [dec_deg], [gst_deg], **kwargs)[0]
@@ -11,13 +11,15 @@ The layer has its own color palette and style tokens for easy UI toggling.
 """
 
 import datetime as _dt
+import json
 from typing import Dict, List, Optional
 import swisseph as swe
 
 try:
     from backend.astrocartography import generate_all_astrocartography_features
-    from backend.ephemeris_utils import get_positions, initialize_ephemeris
+    from backend.ephemeris_utils import get_positions, initialize_ephemeris, ephemeris_context
     from backend.hermetic_lots import calculate_hermetic_lots
+    from backend.chart_context import ChartContext
     from backend.constants import ZODIAC_SIGNS
 except ImportError:
     # Fallback for when running from backend directory or layers subdirectory
@@ -36,14 +38,16 @@ except ImportError:
     
     try:
         from backend.astrocartography import generate_all_astrocartography_features
-        from backend.ephemeris_utils import get_positions, initialize_ephemeris
+        from backend.ephemeris_utils import get_positions, initialize_ephemeris, ephemeris_context
         from backend.hermetic_lots import calculate_hermetic_lots
+        from backend.chart_context import ChartContext
         from backend.constants import ZODIAC_SIGNS
     except ImportError:
         # Final fallback - import directly
         from astrocartography import generate_all_astrocartography_features
-        from ephemeris_utils import get_positions, initialize_ephemeris
+        from ephemeris_utils import get_positions, initialize_ephemeris, ephemeris_context
         from hermetic_lots import calculate_hermetic_lots
+        from chart_context import ChartContext
         from constants import ZODIAC_SIGNS
 
 # Initialize Swiss Ephemeris
@@ -78,6 +82,12 @@ class HumanDesignLayer:
         
         # Calculate the design datetime using 88° solar-arc rule
         self.design_dt = self._calc_design_datetime(birth_dt)
+
+        # Design chart, its ChartContext and planet lines per filter set; built on
+        # first use and shared by every feature group
+        self._design_chart = None
+        self._design_context = None
+        self._planet_lines = {}
     
     def _calc_design_datetime(self, birth_dt: _dt.datetime) -> _dt.datetime:
         """
@@ -100,7 +110,8 @@ class HumanDesignLayer:
         
         # Get Sun's longitude at birth
         try:
-            sun_pos_birth, _ = swe.calc_ut(jd_birth, swe.SUN, swe.FLG_SWIEPH)
+            with ephemeris_context():
+                sun_pos_birth, _ = swe.calc_ut(jd_birth, swe.SUN, swe.FLG_SWIEPH)
             sun_lon_birth = sun_pos_birth[0] % 360
         except Exception as e:
             print(f"[HD] Error calculating Sun position at birth: {e}")
@@ -121,7 +132,8 @@ class HumanDesignLayer:
             )
             
             try:
-                sun_pos_guess, _ = swe.calc_ut(jd_guess, swe.SUN, swe.FLG_SWIEPH)
+                with ephemeris_context():
+                    sun_pos_guess, _ = swe.calc_ut(jd_guess, swe.SUN, swe.FLG_SWIEPH)
                 lon_guess = sun_pos_guess[0] % 360
             except Exception as e:
                 print(f"[HD] Error in iteration {iteration}: {e}")
@@ -168,12 +180,16 @@ class HumanDesignLayer:
             'include_aspects': False,      # Exclude aspects here to avoid duplication
             'design_datetime': self.design_dt
         }
+        cache_key = json.dumps(design_filter_options, sort_keys=True, default=str)
+        if cache_key in self._planet_lines:
+            return self._planet_lines[cache_key]
         
         # Create chart data using design datetime
         chart_data = self._create_design_chart_data()
         
         # Generate astrocartography features using design data
-        features = generate_all_astrocartography_features(chart_data, design_filter_options)
+        features = generate_all_astrocartography_features(chart_data, design_filter_options,
+                                                          context=self._design_context)
           # Apply Human Design layer tagging and label updates
         for feature in features:
             if 'properties' in feature:
@@ -199,6 +215,7 @@ class HumanDesignLayer:
                         else:
                             feature['properties']['label'] = f"{original_label} HD"
         
+        self._planet_lines[cache_key] = features
         return features
     
     def compute_aspect_lines(self) -> List[Dict]:
@@ -223,7 +240,7 @@ class HumanDesignLayer:
                     sys.path.insert(0, backend_dir)
                 from line_aspects import calculate_aspect_lines
             
-            aspect_features = calculate_aspect_lines(chart_data)            # Apply HD tagging and modify labels
+            aspect_features = calculate_aspect_lines(chart_data, context=self._design_context)            # Apply HD tagging and modify labels
             for feature in aspect_features:
                 if 'properties' in feature:
                     feature['properties']['layer'] = 'HD_DESIGN'
@@ -264,12 +281,12 @@ class HumanDesignLayer:
         chart_data = self._create_design_chart_data()
         
         try:
-            planets = chart_data.get('planets', [])
             houses = chart_data.get('houses', {})
             ascendant_long = houses.get('ascendant', {}).get('longitude')
             
             if ascendant_long is not None:
-                lots = calculate_hermetic_lots(planets, ascendant_long)
+                # Same lots the design chart already holds
+                lots = chart_data.get('lots', [])
                 
                 lot_features = []
                 for lot in lots:
@@ -314,15 +331,18 @@ class HumanDesignLayer:
     def compute_parans(self) -> List[Dict]:
         """
         Compute planet-planet parans using design datetime.
+        
+        Crossings of the design AC/DC curves with the design MC/IC meridians,
+        solved analytically as for the natal layer.
+        
           Returns:
             List of GeoJSON features for parans
         """
-        # chart_data = self._create_design_chart_data()  # Not currently used
-        
         try:
             # Import with robust path handling
             try:
-                from backend.line_parans import find_line_crossings_and_latitude_lines
+                from backend.line_parans import find_paran_crossings
+                from backend.line_ac_dc import resolve_horizon_coordinates
             except ImportError:
                 # Add path if needed
                 import sys
@@ -330,10 +350,19 @@ class HumanDesignLayer:
                 backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
                 if backend_dir not in sys.path:
                     sys.path.insert(0, backend_dir)
-                from line_parans import find_line_crossings_and_latitude_lines
+                from line_parans import find_paran_crossings
+                from line_ac_dc import resolve_horizon_coordinates
             
-            # Get planet lines for paran calculation
-            features = self.compute_planet_lines({'include_parans': False})
+            # Get planet lines for paran calculation; any set already drawn with both
+            # AC/DC and MC/IC lines has the same planet lines
+            features = next(
+                (lines for key, lines in self._planet_lines.items()
+                 if json.loads(key).get('include_ac_dc', True) and json.loads(key).get('include_ic_mc', True)),
+                None,
+            )
+            if features is None:
+                features = self.compute_planet_lines({'include_parans': False})
+            chart_data = self._create_design_chart_data()
             
             # Extract line coordinates for major planets
             allowed_crossing_bodies = {
@@ -341,28 +370,32 @@ class HumanDesignLayer:
                 "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto", "Chiron"
             }
             
-            aspect_lines_dict = {}
+            # MC longitudes from the meridian lines
+            meridian_lines = {}
             for f in features:
                 if (
-                    f["geometry"]["type"] == "LineString" and
                     f["properties"].get("category") == "planet" and
-                    f["properties"].get("line_type") in ("AC", "DC", "MC", "IC")
+                    f["properties"].get("line_type") == "MC"
                 ):
                     planet_name = f["properties"].get("planet", "").replace(" HD", "")
                     if any(body in planet_name for body in allowed_crossing_bodies):
-                        line_key = f"{planet_name}_{f['properties'].get('line_type', '')}"
-                        if line_key not in aspect_lines_dict:
-                            aspect_lines_dict[line_key] = []
-                        aspect_lines_dict[line_key].append(f["geometry"]["coordinates"])
+                        meridian_lines[planet_name] = f["geometry"]["coordinates"][0][0]
             
-            # Flatten coordinate lists
-            aspect_lines_dict = {
-                k: [pt for seg in v for pt in seg] 
-                for k, v in aspect_lines_dict.items()
+            # AC/DC curves as culmination longitude and declination; the drawn
+            # HORIZON lines come from the same coordinates
+            horizon_chart = {
+                **chart_data,
+                "planets": [p for p in chart_data.get("planets", []) if p.get("name") != "Lunar Node"],
             }
+            horizon_lines = {}
+            for coords in resolve_horizon_coordinates(horizon_chart, context=self._design_context).values():
+                planet_name = coords["display_name"]
+                if any(body in planet_name for body in allowed_crossing_bodies):
+                    culmination_lon = (coords["ra"] - coords["gst"] + 180) % 360 - 180
+                    horizon_lines[planet_name] = (culmination_lon, coords["dec"])
             
             # Calculate crossings
-            crossing_features = find_line_crossings_and_latitude_lines(aspect_lines_dict)
+            crossing_features = find_paran_crossings(horizon_lines, meridian_lines)
             
             # Apply HD tagging
             for feature in crossing_features:
@@ -370,6 +403,9 @@ class HumanDesignLayer:
                     feature['properties']['layer'] = 'HD_DESIGN'
                     feature['properties']['category'] = 'parans'
                     feature['properties']['hd_design'] = True
+                    p1, l1 = feature['properties']['source_lines'][0].split('_', 1)
+                    p2, l2 = feature['properties']['source_lines'][1].split('_', 1)
+                    feature['properties']['label'] = f"{p1} HD {l1} crossing {p2} HD {l2}"
             
             return crossing_features
         except Exception as e:
@@ -380,9 +416,17 @@ class HumanDesignLayer:
         """
         Create chart data using design datetime for calculations.
         
+        The chart and its ChartContext are built once per layer; later calls
+        return the same dictionary.
+        
         Returns:
             Chart data dictionary with design datetime
         """
+        if self._design_chart is None:
+            self._design_chart = self._build_design_chart_data()
+        return self._design_chart
+    
+    def _build_design_chart_data(self) -> Dict:
         # Convert design datetime to Julian Day
         jd_design = swe.julday(
             self.design_dt.year, self.design_dt.month, self.design_dt.day,
@@ -404,7 +448,8 @@ class HumanDesignLayer:
                 "Uranus", "Neptune", "Pluto", "Lunar Node"
             ]
         
-        planets = get_positions(jd_design, planet_names)
+        self._design_context = ChartContext.build(jd_design, planet_names)
+        planets = get_positions(jd_design, planet_names, context=self._design_context)
         
         # Calculate houses at design time FIRST
         house_system = self.opts.get('house_system', 'whole_sign')
@@ -499,7 +544,8 @@ class HumanDesignLayer:
                 from constants import HOUSE_SYSTEMS
             
             hsys = HOUSE_SYSTEMS.get(house_system.lower(), b'W')
-            houses, ascmc = swe.houses(jd_design, self.lat, self.lon, hsys)
+            with ephemeris_context():
+                houses, ascmc = swe.houses(jd_design, self.lat, self.lon, hsys)
             
             asc = ascmc[0]  # Ascendant
             mc = ascmc[1]   # Midheaven
@@ -569,9 +615,9 @@ class HumanDesignLayer:
         
         all_features = []
         
-        # Planet lines (includes AC/DC, IC/MC)
+        # Planet lines (includes AC/DC, IC/MC); parans are added below by compute_parans
         if filter_options.get('include_ac_dc', True) or filter_options.get('include_ic_mc', True):
-            planet_features = self.compute_planet_lines(filter_options)
+            planet_features = self.compute_planet_lines({**filter_options, 'include_parans': False})
             all_features.extend(planet_features)
         
         # Aspect lines
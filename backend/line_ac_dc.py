@@ -1,14 +1,17 @@
 """
-Spline-based horizon line generator for astrocartography.
+Horizon (AC/DC) line generator for astrocartography.
 
 API:
 - generate_horizon_lines(chart_data, settings=None) -> List[Dict]:
     Returns GeoJSON features for horizon lines for every planet in chart_data["planets"].
-    Spline interpolation is used for smooth animation-ready curves.
+    Curves are sampled exactly from the horizon equation (see horizon_sampling), with
+    points added adaptively until every chord is within the angular tolerance.
+- generate_horizon_line_batch(planets, ras, decs, gsts, lat_steps, tolerance) -> List[Dict]:
+    Samples every body's curve in one vectorized refinement pass.
 
 Note:
 - Output longitudes are geographic and already wrapped to [–180°, 180°].
-- Each horizon line is a single continuous LineString, with 'ac_dc_indices' property marking the join.
+- Each horizon line runs AC (south→north) then DC (north→south); its 'segments' property marks the join.
 """
 import sys
 import os
@@ -18,10 +21,10 @@ if __name__ != "__main__":
 
 try:
     from backend.ephemeris_utils import initialize_ephemeris
-    from backend.spline_utils import parametric_spline
+    from backend.horizon_sampling import sample_horizon_curves, DEFAULT_TOLERANCE
 except ImportError:
     from ephemeris_utils import initialize_ephemeris
-    from spline_utils import parametric_spline
+    from horizon_sampling import sample_horizon_curves, DEFAULT_TOLERANCE
 
 initialize_ephemeris()
 
@@ -43,57 +46,26 @@ def split_dateline(seq, max_jump=45):
         segments.append(seg)
     return segments
 
-def generate_horizon_line(chart, planet, lat_steps, density=400):
-    """
-    Returns a GeoJSON Feature for the planet’s horizon curve.
-    properties:
-        'planet'   – planet name
-        'ac_dc_indices' – dict with 'ac_end' and 'dc_start' indices for AC/DC join
-    """
-    delta = chart['dec'][planet]         # planet declination deg
-    if abs(delta) > 90:
-        import warnings
-        warnings.warn(f"[WARN] Skipping {planet}: |dec| > 90 (got {delta})")
-        print(f"[WARN] Skipping {planet}: |dec| > 90 (got {delta})")
-        return None
-    alpha = chart['ra_deg'][planet]      # RA deg
-    gst   = chart['gst_deg']             # Greenwich sidereal time deg
-
-    # Latitude grid for visible horizon
-    phi = np.radians(lat_steps)
-    cosH = -np.tan(phi) * np.tan(np.radians(delta))
-    vis = np.abs(cosH) <= 1
-    if not np.any(vis):
-        print(f"[WARN] Skipping {planet}: horizon not visible at any latitude")
-        return None
-    lat_vis = lat_steps[vis]
-    lat_vis_sorted = np.sort(lat_vis)
-    phi_vis = np.radians(lat_vis_sorted)
-    H0 = np.arccos(np.clip(-np.tan(phi_vis) * np.tan(np.radians(delta)), -1, 1))  # rad
-    # Compute longitudes for rise and set on the same sorted lat array
-    lon_rise = ((alpha - np.degrees(H0)) - gst + 540) % 360 - 180
-    lon_set  = ((alpha + np.degrees(H0)) - gst + 540) % 360 - 180
-    # Build a single ordered path: AC (south→north), DC (north→south)
-    pts_ac = list(zip(lon_rise, lat_vis_sorted))
-    pts_dc = list(zip(lon_set[::-1], lat_vis_sorted[::-1]))
-    # Drop the duplicate pole point
-    pts = pts_ac + pts_dc[1:]
-    lons, lats = map(np.array, zip(*pts))
-    # Spline both halves together
-    lon_smooth, lat_smooth = parametric_spline(lons, lats, density)
-    # Already wrapped to [-180,180] by parametric_spline
-    coords = list(zip(lon_smooth, lat_smooth))
-    # Dateline-safe segmentation
-    segments = split_dateline(coords)
+def _horizon_feature(planet, runs):
+    """Build the HORIZON feature from the sampled runs of one body (AC south→north, then DC north→south)."""
+    segments = []
+    n_ac = n_total = 0
+    for lons, lats, is_rising in runs:
+        # Dateline-safe segmentation of each continuous run
+        segments.extend(split_dateline(list(zip(lons.tolist(), lats.tolist()))))
+        n_ac += int(np.count_nonzero(is_rising))
+        n_total += len(lons)
     # Safety check
     assert all(abs(a[0]-b[0]) <= 180 for seg in segments for a,b in zip(seg, seg[1:])), "Dateline split failed"
+    if not segments:
+        return None
     # AC/DC indices for segment labeling
-    ac_end = len(pts_ac) - 1
+    ac_end = n_ac - 1
     dc_start = ac_end + 1
     # Segment labeling (compact)
     segs = [
         {"label": "AC", "start": 0, "end": ac_end},
-        {"label": "DC", "start": dc_start, "end": len(coords)-1}
+        {"label": "DC", "start": dc_start, "end": n_total-1}
     ]
     # GeoJSON output
     if len(segments) == 1:
@@ -111,20 +83,69 @@ def generate_horizon_line(chart, planet, lat_steps, density=400):
     }
     return feat
 
-def generate_horizon_lines(chart_data, settings=None) -> list:
+def generate_horizon_line(chart, planet, lat_steps, tolerance=DEFAULT_TOLERANCE):
     """
-    Generate smooth horizon lines for all planets in chart_data.
-    Returns a list of GeoJSON features (one per planet).
+    Returns a GeoJSON Feature for the planet’s horizon curve.
+    properties:
+        'planet'   – planet name
+        'segments' – AC/DC index ranges of the path
+    """
+    features = generate_horizon_line_batch(
+        [planet], [chart['ra_deg'][planet]], [chart['dec'][planet]], [chart['gst_deg']], lat_steps, tolerance
+    )
+    return features[0]
+
+def generate_horizon_line_batch(planets, ras, decs, gsts, lat_steps, tolerance=DEFAULT_TOLERANCE):
     """
+    Horizon curves for many bodies, sampled exactly in one refinement pass.
+
+    Args:
+        planets: Body names
+        ras, decs: RA/Dec in degrees per body
+        gsts: Greenwich sidereal time in degrees per body
+        lat_steps: Latitude grid in degrees; its range bounds the curves
+        tolerance: Max chord-to-curve deviation in degrees
+
+    Returns:
+        list: One feature per body (None where the body is skipped), same as generate_horizon_line
+    """
+    decs = np.asarray(decs, dtype=float)
+    lat_steps = np.asarray(lat_steps, dtype=float)
+    in_range = np.abs(decs) <= 90
+    curves = sample_horizon_curves(
+        np.asarray(ras, dtype=float)[in_range], decs[in_range], np.asarray(gsts, dtype=float)[in_range],
+        lat_min=float(lat_steps.min()), lat_max=float(lat_steps.max()), tolerance=tolerance,
+    )
+    curves = iter(curves)
+
     features = []
+    for j, planet in enumerate(planets):
+        if not in_range[j]:
+            import warnings
+            warnings.warn(f"[WARN] Skipping {planet}: |dec| > 90 (got {decs[j]})")
+            print(f"[WARN] Skipping {planet}: |dec| > 90 (got {decs[j]})")
+            features.append(None)
+            continue
+        runs = next(curves)
+        feat = _horizon_feature(planet, runs) if runs else None
+        if feat is None:
+            print(f"[WARN] Skipping {planet}: horizon not visible at any latitude")
+        features.append(feat)
+    return features
+
+def resolve_horizon_coordinates(chart_data, context=None) -> Dict[str, Dict]:
+    """
+    Resolve the RA/Dec and GST that anchor each planet's horizon curve.
+    Returns {planet name: {'display_name', 'ra', 'dec', 'gst'}} in chart order.
+    Bodies covered by `context` (a ChartContext) at the planet's coordinate JD
+    are read from it instead of Swiss Ephemeris.
+    """
+    coordinates = {}
     if not chart_data or "planets" not in chart_data or "utc_time" not in chart_data:
-        return features
+        return coordinates
     jd = chart_data["utc_time"].get("julian_day")
     if jd is None:
-        return features
-    density = settings.get("density", 400) if settings else 400
-    lat_steps = settings.get("lat_steps", np.linspace(-89, 89, 356)) if settings else np.linspace(-89, 89, 356)
-    lat_steps = np.asarray(lat_steps)
+        return coordinates
     swe_id_map = {
         "Sun": swe.SUN,
         "Moon": swe.MOON,
@@ -144,12 +165,7 @@ def generate_horizon_lines(chart_data, settings=None) -> list:
         "Chiron": swe.CHIRON,
         "Pholus": swe.PHOLUS,
         "Black Moon Lilith": swe.MEAN_APOG,}
-    # Precompute planet RA/Dec and individual GST for each planet
-    ra_deg = {}
-    dec = {}
-    gst_per_planet = {}  # Store GST per planet
-    planet_display_names = {}  # Map original name to display name
-    
+
     for planet in chart_data["planets"]:
         pname = planet.get("name")
         if pname is not None:
@@ -159,7 +175,6 @@ def generate_horizon_lines(chart_data, settings=None) -> list:
         display_name = pname
         if planet.get("data_type") == "progressed":
             display_name = f"{pname} CCG"
-        planet_display_names[pname] = display_name
         
         pid = swe_id_map.get(pname)
         print(f"[DEBUG] Processing planet: '{pname}' -> '{display_name}' (ID: {pid})")
@@ -171,31 +186,53 @@ def generate_horizon_lines(chart_data, settings=None) -> list:
         coordinate_jd = planet.get("coordinate_jd", jd)  # Default to birth JD if not specified
         
         # Calculate GST for this planet's coordinate system
-        gst_per_planet[pname] = swe.sidtime(coordinate_jd) * 15.0
+        in_context = context is not None and context.jd_ut == coordinate_jd
+        gst = context.gst_deg if in_context else swe.sidtime(coordinate_jd) * 15.0
         
         # Use pre-calculated coordinates for all planets (progressed and transit)
         if "ra" in planet and "dec" in planet:
-            ra_deg[pname] = planet.get("ra")
-            dec[pname] = planet.get("dec")
-            print(f"[DEBUG] Using coordinates for {pname}: RA={planet.get('ra')}, Dec={planet.get('dec')}, GST={gst_per_planet[pname]}")
+            ra, dec = planet.get("ra"), planet.get("dec")
+            print(f"[DEBUG] Using coordinates for {pname}: RA={ra}, Dec={dec}, GST={gst}")
+        elif in_context and pname in context and context.body_jds[context.index(pname)] == coordinate_jd:
+            i = context.index(pname)
+            ra, dec = float(context.ra[i]), float(context.dec[i])
         else:
             # Fallback calculation if coordinates not provided
             ppos, _ = swe.calc_ut(coordinate_jd, pid, swe.FLG_SWIEPH | swe.FLG_EQUATORIAL)
-            ra_deg[pname] = ppos[0]
-            dec[pname] = ppos[1]
-            print(f"[DEBUG] Calculated coordinates for {pname}: RA={ppos[0]}, Dec={ppos[1]}, GST={gst_per_planet[pname]}")
-            
-    # Generate horizon lines for each planet
-    for pname in ra_deg:
-        display_name = planet_display_names.get(pname, pname)
-          # Create chart data structure with planet-specific GST
-        chart = {
-            "ra_deg": {pname: ra_deg[pname]}, 
-            "dec": {pname: dec[pname]}, 
-            "gst_deg": gst_per_planet[pname]  # Use planet-specific GST
-        }
-        
-        feat = generate_horizon_line(chart, pname, lat_steps, density)
+            ra, dec = ppos[0], ppos[1]
+            print(f"[DEBUG] Calculated coordinates for {pname}: RA={ra}, Dec={dec}, GST={gst}")
+        coordinates[pname] = {"display_name": display_name, "ra": ra, "dec": dec, "gst": gst}
+    return coordinates
+
+def generate_horizon_lines(chart_data, settings=None, coordinates=None) -> list:
+    """
+    Generate smooth horizon lines for all planets in chart_data.
+    Returns a list of GeoJSON features (one per planet).
+    Pass `coordinates` from resolve_horizon_coordinates to reuse already resolved RA/Dec.
+    """
+    features = []
+    if not chart_data or "planets" not in chart_data or "utc_time" not in chart_data:
+        return features
+    jd = chart_data["utc_time"].get("julian_day")
+    if jd is None:
+        return features
+    tolerance = settings.get("tolerance", DEFAULT_TOLERANCE) if settings else DEFAULT_TOLERANCE
+    lat_steps = settings.get("lat_steps", np.linspace(-89, 89, 356)) if settings else np.linspace(-89, 89, 356)
+    lat_steps = np.asarray(lat_steps)
+    if coordinates is None:
+        coordinates = resolve_horizon_coordinates(chart_data)
+    pnames = list(coordinates)
+    # One hour-angle matrix for every planet (each keeps its own GST)
+    batch = generate_horizon_line_batch(
+        pnames,
+        [coordinates[p]["ra"] for p in pnames],
+        [coordinates[p]["dec"] for p in pnames],
+        [coordinates[p]["gst"] for p in pnames],
+        lat_steps,
+        tolerance,
+    )
+    for pname, feat in zip(pnames, batch):
+        display_name = coordinates[pname].get("display_name", pname)
         if feat is not None:
             # Update the feature to use the display name
             feat["properties"]["planet"] = display_name
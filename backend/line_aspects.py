@@ -9,11 +9,11 @@ if __name__ != "__main__":
 
 try:
     from backend.ephemeris_utils import initialize_ephemeris
-    from backend.spline_utils import parametric_spline
+    from backend.horizon_sampling import sample_horizon_curves
     from backend.line_ac_dc import split_dateline
 except ImportError:
     from ephemeris_utils import initialize_ephemeris
-    from spline_utils import parametric_spline
+    from horizon_sampling import sample_horizon_curves
     from line_ac_dc import split_dateline
 
 initialize_ephemeris()
@@ -83,7 +83,8 @@ ASPECT_ANGLES = [60, 90, 120]  # sextile, square, trine
 ASPECT_LABELS = {60: 'sextile', 90: 'square', 120: 'trine'}
 
 # Helper: get planet RA (deg, equatorial) and ecliptic longitude (deg)
-def _get_planet_positions(chart_data, jd):
+def _get_planet_positions(chart_data, jd, context=None):
+    """RA and ecliptic longitude per chart planet, read from `context` when it covers the body at `jd`."""
     swe_id_map = {
         "Sun": swe.SUN, "Moon": swe.MOON, "Mercury": swe.MERCURY, "Venus": swe.VENUS, "Mars": swe.MARS,
         "Jupiter": swe.JUPITER, "Saturn": swe.SATURN, "Uranus": swe.URANUS, "Neptune": swe.NEPTUNE, "Pluto": swe.PLUTO,
@@ -96,6 +97,10 @@ def _get_planet_positions(chart_data, jd):
         pid = swe_id_map.get(pname)
         if pid is None:
             continue
+        if context is not None and pname in context and context.body_jds[context.index(pname)] == jd:
+            i = context.index(pname)
+            positions[pname] = {"ra": float(context.ra[i]), "ecl_lon": float(context.lon[i])}
+            continue
         # RA (equatorial)
         flags = swe.FLG_SWIEPH | swe.FLG_EQUATORIAL
         ppos_eq, _ = swe.calc_ut(jd, pid, flags)
@@ -113,10 +118,11 @@ def _normalize_lon(lon):
 def _aspect_label(planet, angle, to):
     return f"{planet} {ASPECT_LABELS[abs(angle)]} {to}"
 
-def calculate_aspect_lines(chart_data, debug=False):
+def calculate_aspect_lines(chart_data, debug=False, context=None):
     """
     Returns GeoJSON features for sextile, square, trine aspect lines to MC and ASC for all planets.
     properties: { 'planet', 'line_type': 'ASPECT', 'angle': Δ, 'to': 'MC'|'ASC', 'label': ... }
+    Pass the chart's ChartContext as `context` to reuse its body positions.
     """
     features = []
     if not chart_data or "planets" not in chart_data or "utc_time" not in chart_data:
@@ -129,10 +135,10 @@ def calculate_aspect_lines(chart_data, debug=False):
             print("[DEBUG] Missing julian_day in chart_data['utc_time'].")
         return features
     try:
-        planet_pos = _get_planet_positions(chart_data, jd)
+        planet_pos = _get_planet_positions(chart_data, jd, context)
         # Use TT for sidereal time to match astro.com and avoid small offset
         jd_ut = jd
-        delta_t = swe.deltat(jd_ut)
+        delta_t = context.delta_t if context is not None and context.jd_ut == jd_ut else swe.deltat(jd_ut)
         jd_tt = jd_ut + delta_t / 86400.0
         
         # Get true obliquity for this date
@@ -176,33 +182,44 @@ def calculate_aspect_lines(chart_data, debug=False):
         if debug:
             print(f"[DEBUG] MC aspect lines generated: {mc_count}")
         # ------------------------------------------------------------------        # --- ASC aspect lines ---
-        # Use coarser latitude steps for better performance and stability
-        lat_steps = np.arange(-85, 85.1, 0.5)  # 0.5° steps for better performance
-        asc_count = 0
+        # houses_ex(jd_tt, ...) anchors the RAMC to sidtime(jd_tt); keep the same frame
+        ramc_gst_deg = swe.sidtime(jd_tt) * 15.0
+        asc_obliq = np.deg2rad(swe.calc_ut(jd_tt, swe.ECL_NUT)[0][0])
+        # Placidus (and swe.houses_ex) has no Ascendant beyond the polar circle
+        polar_limit = min(85.0, 90.0 - np.rad2deg(asc_obliq))
+
+        # Each ASC aspect line is the rising curve of its target ecliptic point (β = 0),
+        # so every (planet, aspect) target is sampled in a single pass
+        asc_targets = []
         for pname, pos in planet_pos.items():
-            planet_ecl_lon = pos["ecl_lon"]
-            planet_data = planet_lookup.get(pname, {})
-            
             for delta in ASPECT_ANGLES + [-a for a in ASPECT_ANGLES]:
-                target_asc = (planet_ecl_lon - delta) % 360
-                  # Generate aspect line using simplified approach
-                feat = _generate_asc_aspect_line(pname, target_asc, delta, jd_tt, lat_steps, debug)
-                if feat is not None:
-                    # Add house and sign information if available
-                    if planet_data.get("house"):
-                        feat["properties"]["house"] = planet_data.get("house")
-                    if planet_data.get("sign"):
-                        feat["properties"]["sign"] = planet_data.get("sign")
-                    
-                    features.append(feat)
-                    asc_count += 1
-                    if debug:
-                        coords_count = (len(feat["geometry"]["coordinates"]) 
-                                      if feat["geometry"]["type"] == "LineString" 
-                                      else sum(len(seg) for seg in feat["geometry"]["coordinates"]))
-                        print(f"[DEBUG] ASC {pname} {ASPECT_LABELS[abs(delta)]} generated with {coords_count} points")
-                elif debug:
-                    print(f"[WARN] ASC aspect: {pname} {ASPECT_LABELS[abs(delta)]} failed to generate")
+                asc_targets.append((pname, delta, (pos["ecl_lon"] - delta) % 360))
+        target_lons = np.deg2rad([t[2] for t in asc_targets])
+        target_ra = np.rad2deg(np.arctan2(np.sin(target_lons) * np.cos(asc_obliq), np.cos(target_lons)))
+        target_dec = np.rad2deg(np.arcsin(np.sin(asc_obliq) * np.sin(target_lons)))
+        asc_curves = sample_horizon_curves(target_ra, target_dec, ramc_gst_deg,
+                                           lat_min=-polar_limit, lat_max=polar_limit, rising_only=True)
+
+        asc_count = 0
+        for col, (pname, delta, _) in enumerate(asc_targets):
+            planet_data = planet_lookup.get(pname, {})
+            feat = _generate_asc_aspect_line(pname, delta, asc_curves[col], debug)
+            if feat is not None:
+                # Add house and sign information if available
+                if planet_data.get("house"):
+                    feat["properties"]["house"] = planet_data.get("house")
+                if planet_data.get("sign"):
+                    feat["properties"]["sign"] = planet_data.get("sign")
+
+                features.append(feat)
+                asc_count += 1
+                if debug:
+                    coords_count = (len(feat["geometry"]["coordinates"])
+                                  if feat["geometry"]["type"] == "LineString"
+                                  else sum(len(seg) for seg in feat["geometry"]["coordinates"]))
+                    print(f"[DEBUG] ASC {pname} {ASPECT_LABELS[abs(delta)]} generated with {coords_count} points")
+            elif debug:
+                print(f"[WARN] ASC aspect: {pname} {ASPECT_LABELS[abs(delta)]} failed to generate")
         if debug:
             print(f"[DEBUG] ASC aspect lines generated: {asc_count}")
             print(f"[DEBUG] Total features generated: {len(features)}")
@@ -210,147 +227,28 @@ def calculate_aspect_lines(chart_data, debug=False):
         print(f"[ERR] Aspect line generation failed: {e}")
     return features
 
-def _wrap_longitude(lon):
-    """
-    Wrap longitude to [-180, 180] range using the same formula as horizon lines.
-    This ensures consistent wrapping behavior across all line types.
-    """
-    return ((lon + 180) % 360) - 180
-
-def _generate_asc_aspect_line(planet_name, target_asc_ecl_lon, delta_angle, jd_tt, lat_steps, debug=False):
+def _generate_asc_aspect_line(planet_name, delta_angle, runs, debug=False):
     """
-    Generate a single ASC aspect line using the proven approach from line_ac_dc.py.
+    Build a single ASC aspect line from its sampled rising curve.
     Returns a GeoJSON Feature or None if generation fails.
-    
+
     Args:
         planet_name: Name of the planet
-        target_asc_ecl_lon: Target ecliptic longitude for the ASC aspect (degrees)
         delta_angle: Aspect angle (+/-60, +/-90, +/-120)
-        jd_tt: Julian day in TT
-        lat_steps: Array of latitude values to compute
+        runs: (lons, lats, is_rising) runs from horizon_sampling.sample_horizon_curves
         debug: Whether to print debug info
     """
     try:
-        lons = []
-        lats = []
-        prev_lon = None
-          # Use efficient bisection method for each latitude
-        for lat in lat_steps:
-            try:
-                def asc_residual(lon):
-                    """Calculate residual for ASC ecliptic longitude at given lat/lon"""
-                    try:
-                        # Use Placidus houses for accurate ASC calculation
-                        cusps, ascmc = swe.houses_ex(jd_tt, lat, lon, b'P')
-                        asc_ecl_lon = ascmc[0]  # ASC ecliptic longitude
-                        
-                        # Apply the same longitude wrapping as horizon lines for consistency
-                        asc_ecl_lon = _wrap_longitude(asc_ecl_lon)
-                        target_wrapped = _wrap_longitude(target_asc_ecl_lon)
-                          # Calculate difference with proper wrapping
-                        diff = asc_ecl_lon - target_wrapped
-                        # Wrap difference to [-180, 180] range
-                        diff = _wrap_longitude(diff)
-                        
-                        return diff
-                    except Exception:
-                        return np.inf
-                
-                # Smart bracketing based on previous solution
-                if prev_lon is not None:
-                    # Use narrow bracket around previous solution
-                    bracket_width = 10  # degrees
-                    lon_start = prev_lon - bracket_width
-                    lon_end = prev_lon + bracket_width
-                else:
-                    # Full range for first point
-                    lon_start = -180
-                    lon_end = 180
-                
-                # Ensure bracket is in valid range
-                lon_start = max(-180, lon_start)
-                lon_end = min(180, lon_end)
-                
-                # Try bisection method
-                found_solution = False
-                tolerance = 0.01  # 0.01 degree tolerance
-                
-                try:
-                    f_start = asc_residual(lon_start)
-                    f_end = asc_residual(lon_end)
-                    
-                    # Check if we have a sign change (bracket contains root)
-                    if f_start * f_end <= 0 and abs(f_start) < 1000 and abs(f_end) < 1000:
-                        # Bisection method
-                        for _ in range(20):  # Max 20 iterations
-                            lon_mid = 0.5 * (lon_start + lon_end)
-                            f_mid = asc_residual(lon_mid)
-                            
-                            if abs(f_mid) < tolerance:
-                                solution_lon = lon_mid
-                                found_solution = True
-                                break
-                            
-                            if f_start * f_mid < 0:
-                                lon_end = lon_mid
-                                f_end = f_mid
-                            else:
-                                lon_start = lon_mid
-                                f_start = f_mid
-                        
-                        if not found_solution:
-                            solution_lon = 0.5 * (lon_start + lon_end)
-                            found_solution = True
-                
-                except Exception:
-                    pass
-                  # If bisection failed, try grid search
-                if not found_solution:
-                    grid_lons = np.linspace(-180, 180, 73)  # 5-degree steps
-                    residuals = []
-                    
-                    for test_lon in grid_lons:
-                        res = asc_residual(test_lon)
-                        residuals.append(abs(res) if abs(res) < 1000 else 1000)
-                    
-                    min_idx = np.argmin(residuals)
-                    if residuals[min_idx] < 1.0:  # Accept if within 1 degree
-                        solution_lon = grid_lons[min_idx]
-                        found_solution = True
-                
-                if found_solution:
-                    # Apply the same longitude normalization as horizon lines
-                    solution_lon = _wrap_longitude(solution_lon)
-                    lons.append(solution_lon)
-                    lats.append(lat)
-                    prev_lon = solution_lon
-                else:
-                    prev_lon = None
-                    
-            except Exception as e:
-                if debug:
-                    print(f"[ERR] ASC aspect calculation failed at lat={lat:.1f}: {e}")
-                prev_lon = None
-                continue
-        
         # Check if we have enough points for a meaningful line
-        if len(lons) < 3:
+        n_points = sum(len(lons) for lons, _, _ in runs)
+        if n_points < 3:
             if debug:
-                print(f"[WARN] Insufficient points for {planet_name} {ASPECT_LABELS[abs(delta_angle)]}: {len(lons)}")
-            return None        # Convert to arrays and sort by latitude
-        lons = np.array(lons)
-        lats = np.array(lats)
-        idx = np.argsort(lats)
-        lons = lons[idx]
-        lats = lats[idx]
-        
-        # Use the same proven spline approach as horizon lines
-        # Let parametric_spline handle longitude unwrapping internally
-        lons_smooth, lats_smooth = parametric_spline(lons, lats, density=400)
-        
-        # parametric_spline already wraps to [-180, 180], so coords are ready
-        coords = list(zip(lons_smooth, lats_smooth))        # Split at dateline using the EXACT same approach as horizon lines
-        segments = split_dateline(coords)  # Use default max_jump=45 like horizon lines
+                print(f"[WARN] Insufficient points for {planet_name} {ASPECT_LABELS[abs(delta_angle)]}: {n_points}")
+            return None
+        # Split at dateline using the EXACT same approach as horizon lines
+        segments = []
+        for lons, lats, _ in runs:
+            segments.extend(split_dateline(list(zip(lons.tolist(), lats.tolist()))))
         
         # Use the same validation as horizon lines: just check that dateline split worked
         try:
@@ -390,9 +288,6 @@ def _generate_asc_aspect_line(planet_name, target_asc_ecl_lon, delta_angle, jd_t
             print(f"[ERR] Failed to generate ASC aspect line for {planet_name} {ASPECT_LABELS[abs(delta_angle)]}: {e}")
         return None
 
-# Set sidereal mode globally (Lahiri ayanamsha as example, can be changed)
-swe.set_sid_mode(swe.SIDM_LAHIRI, 0, 0)
-
 if __name__ == "__main__":
     import json
     # Try to load a sample chart from debug_chart.json
@@ -0,0 +1,171 @@
+"""
+Spatial index over generated line features.
+
+API:
+- LineIndex(features):
+    Indexes every LineString / MultiLineString geometry of a GeoJSON feature
+    list. Point features (fixed stars carry ecliptic, not map, coordinates) are skipped.
+- LineIndex.query(lats, lons, radius_km) -> List[List[Tuple[int, float]]]:
+    For each query point, (feature index, distance in km) of every feature passing
+    within radius_km, nearest first.
+- LineIndex.pairs(lats, lons, radius_km) -> (points, features, distances_km):
+    The same matches as flat NumPy arrays, for callers scoring many points at once.
+- LineIndex.near(lat, lon, radius_km) -> List[Tuple[Dict, float]]:
+    Single-point form returning the features themselves.
+
+Lines are split into segments of at most MAX_SEGMENT_DEGREES (they are drawn as
+straight lines in longitude/latitude, so longer segments are densified first).
+Segment midpoints, as unit vectors, go into a KD-tree; a query finds every
+segment whose midpoint is within the radius plus half the longest segment, for
+all query points in one call. Working on the unit sphere needs no special cases
+at the poles or the antimeridian. Only those candidates get the exact
+great-circle point-to-segment distance, computed with NumPy over all pairs at once.
+"""
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_MILE = 1.609344
+MAX_SEGMENT_DEGREES = 1.0
+
+def _unit_vectors(lat, lon):
+    lat, lon = np.radians(lat), np.radians(lon)
+    cos_lat = np.cos(lat)
+    return np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)], axis=-1)
+
+def _chord_angle(u, v):
+    """Angle between unit vectors from their chord length (haversine-stable for short distances)."""
+    return 2.0 * np.arcsin(np.clip(np.linalg.norm(u - v, axis=-1) / 2.0, 0.0, 1.0))
+
+def _triple(u, v, w):
+    """(u × v) · w per row."""
+    return ((u[:, 1] * v[:, 2] - u[:, 2] * v[:, 1]) * w[:, 0]
+            + (u[:, 2] * v[:, 0] - u[:, 0] * v[:, 2]) * w[:, 1]
+            + (u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0]) * w[:, 2])
+
+def _geometry_parts(geometry):
+    kind = (geometry or {}).get("type")
+    coords = (geometry or {}).get("coordinates")
+    if not coords:
+        return []
+    if kind == "LineString":
+        return [coords]
+    if kind == "MultiLineString":
+        return list(coords)
+    return []
+
+class LineIndex:
+    """
+    KD-tree over densified line segments with exact great-circle distance checks.
+
+    Args:
+        features: GeoJSON features; the index refers to them by position
+    """
+
+    def __init__(self, features: Sequence[Dict]):
+        self.features = list(features)
+        starts, deltas, owners = [], [], []
+        for i, feature in enumerate(self.features):
+            for part in _geometry_parts(feature.get("geometry")):
+                pts = np.asarray([p[:2] for p in part], dtype=float)
+                if len(pts) < 2 or not np.isfinite(pts).all():
+                    continue
+                delta = np.diff(pts, axis=0)
+                delta[:, 0] = (delta[:, 0] + 180.0) % 360.0 - 180.0  # shorter way round in longitude
+                starts.append(pts[:-1])
+                deltas.append(delta)
+                owners.append(np.full(len(delta), i))
+        if starts:
+            start, delta, owner = np.concatenate(starts), np.concatenate(deltas), np.concatenate(owners)
+        else:
+            start, delta, owner = np.empty((0, 2)), np.empty((0, 2)), np.empty(0, dtype=int)
+        # Densify long segments so each piece stays close to its great circle
+        steps = np.maximum(1, np.ceil(np.abs(delta).max(axis=1, initial=0.0) / MAX_SEGMENT_DEGREES)).astype(int)
+        seg = np.repeat(np.arange(len(delta)), steps)
+        k = np.arange(len(seg)) - np.repeat(np.cumsum(steps) - steps, steps)
+        a = start[seg] + delta[seg] * (k / steps[seg])[:, None]
+        b = start[seg] + delta[seg] * ((k + 1) / steps[seg])[:, None]
+        self.owner = owner[seg]
+        self.a = _unit_vectors(a[:, 1], a[:, 0])
+        self.b = _unit_vectors(b[:, 1], b[:, 0])
+        normal = np.cross(self.a, self.b)
+        norm = np.linalg.norm(normal, axis=-1)
+        self.degenerate = norm < 1e-12
+        self.normal = normal / np.where(self.degenerate, 1.0, norm)[:, None]
+        mid = self.a + self.b
+        mid /= np.maximum(np.linalg.norm(mid, axis=-1), 1e-12)[:, None]
+        self.tree = cKDTree(mid)
+        self.max_half_angle = float(_chord_angle(self.a, self.b).max(initial=0.0)) / 2.0
+
+    def __len__(self) -> int:
+        return len(self.owner)
+
+    def distances_km(self, points: np.ndarray, segments: np.ndarray, point_vectors: np.ndarray) -> np.ndarray:
+        """Great-circle distance from each point vector to its paired segment."""
+        p = point_vectors[points]
+        a, b, n = self.a[segments], self.b[segments], self.normal[segments]
+        along = np.einsum("ij,ij->i", p, n)
+        # The perpendicular from p meets the segment's great circle between its ends when
+        # p lies on the inner side of both planes through the normal and an end point
+        inside = (_triple(a, p, n) >= 0) & (_triple(p, b, n) >= 0)
+        cross_track = np.abs(np.arcsin(np.clip(along, -1.0, 1.0)))
+        to_ends = np.minimum(_chord_angle(p, a), _chord_angle(p, b))
+        angle = np.where(inside & ~self.degenerate[segments], cross_track, to_ends)
+        return angle * EARTH_RADIUS_KM
+
+    def pairs(self, lats, lons, radius_km: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Every (point, feature) pair within radius_km, as arrays sorted by point, then distance.
+
+        Args:
+            lats, lons: Query latitudes/longitudes in degrees (scalars or equal-length arrays)
+            radius_km: Search radius in kilometres
+
+        Returns:
+            tuple: (point indices, feature indices, distances in km); one entry per pair,
+            at the feature's nearest segment
+        """
+        lats = np.atleast_1d(np.asarray(lats, dtype=float))
+        lons = np.atleast_1d(np.asarray(lons, dtype=float))
+        if not len(self) or not len(lats):
+            return np.empty(0, dtype=int), np.empty(0, dtype=int), np.empty(0)
+        vectors = _unit_vectors(lats, lons)
+        # A segment within the radius has its midpoint within radius + half its length
+        search_angle = min(radius_km / EARTH_RADIUS_KM + self.max_half_angle, np.pi)
+        pairs = cKDTree(vectors).sparse_distance_matrix(
+            self.tree, 2.0 * np.sin(search_angle / 2.0), output_type="ndarray"
+        )
+        points, segments = pairs["i"].astype(int), pairs["j"].astype(int)
+        dist = self.distances_km(points, segments, vectors)
+        keep = dist <= radius_km
+        points, owners, dist = points[keep], self.owner[segments[keep]], dist[keep]
+        # Nearest segment per (point, feature), then per point by distance. One float sort key,
+        # (point, feature) plus the distance as a fraction, is several times faster than lexsort here
+        key = (points * len(self.features) + owners) + dist / (radius_km * 1.001 + 1e-9)
+        order = np.argsort(key)
+        points, owners, dist = points[order], owners[order], dist[order]
+        first = np.ones(len(points), dtype=bool)
+        first[1:] = (points[1:] != points[:-1]) | (owners[1:] != owners[:-1])
+        points, owners, dist = points[first], owners[first], dist[first]
+        order = np.lexsort((owners, dist, points))
+        return points[order], owners[order], dist[order]
+
+    def query(self, lats, lons, radius_km: float) -> List[List[Tuple[int, float]]]:
+        """
+        Features passing within radius_km of each point, nearest first.
+
+        Args:
+            lats, lons: Query latitudes/longitudes in degrees (scalars or equal-length arrays)
+            radius_km: Search radius in kilometres
+        """
+        results = [[] for _ in range(np.size(lats))]
+        points, owners, dist = self.pairs(lats, lons, radius_km)
+        for point, owner, d in zip(points.tolist(), owners.tolist(), dist.tolist()):
+            results[point].append((owner, d))
+        return results
+
+    def near(self, lat: float, lon: float, radius_km: float) -> List[Tuple[Dict, float]]:
+        """(feature, distance_km) for every feature within radius_km of one location, nearest first."""
+        return [(self.features[i], d) for i, d in self.query(lat, lon, radius_km)[0]]
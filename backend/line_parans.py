@@ -3,7 +3,8 @@ Geographic planetary line intersection module for Swiss Ephemeris
 Calculates visual intersections between planetary lines (e.g., Saturn AC and Jupiter MC) and draws horizontal lines at crossing points.
 """
 import swisseph as swe
-from typing import List, Dict
+from typing import List, Dict, Tuple
+import numpy as np
 from shapely.geometry import LineString, Point
 from geojson import Feature
 
@@ -98,4 +99,68 @@ def find_line_crossings_and_latitude_lines(aspect_lines: Dict[str, List[List[flo
     print(f"[PARANS] Found {intersection_count} intersections.")
     return features
 
+def find_paran_crossings(
+    horizon_lines: Dict[str, Tuple[float, float]],
+    meridian_lines: Dict[str, float],
+    lat_band: float = 68.0,
+) -> List[Dict]:
+    """
+    Analytic AC/DC × MC/IC crossings for every planet pair in one vectorized pass.
+
+    A horizon curve is lon = L₀ ∓ H₀(φ) with cos H₀ = −tan φ · tan δ, where
+    L₀ = RA − GST is the longitude of upper culmination (rising: −, setting: +).
+    MC/IC lines are meridians, so each pair crosses at most once per line type,
+    at tan φ = −cos H₀ / tan δ with H₀ fixed by the longitude gap.
+
+    Args:
+        horizon_lines: {planet: (culmination longitude L₀ in degrees, declination in degrees)}
+        meridian_lines: {planet: MC longitude in degrees}
+        lat_band: Only crossings with |lat| <= lat_band are kept
+
+    Returns:
+        Features with the same schema as find_line_crossings_and_latitude_lines.
+    """
+    features = []
+    h_names = list(horizon_lines.keys())
+    m_names = list(meridian_lines.keys())
+    if not h_names or not m_names:
+        return features
+    lon0 = np.array([horizon_lines[n][0] for n in h_names], dtype=float)
+    dec = np.radians([horizon_lines[n][1] for n in h_names])
+    mc = np.array([meridian_lines[n] for n in m_names], dtype=float)
+    # Meridian longitudes per line type, axis order (AC/DC, MC/IC)
+    meridians = np.stack([mc, mc + 180.0])                                   # (2, m)
+    gap = (lon0[:, None, None] - meridians[None, :, :]) % 360.0              # (n, 2, m)
+    h0 = np.stack([gap, (-gap) % 360.0], axis=1)                             # (n, 2, 2, m)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lat = np.degrees(np.arctan(-np.cos(np.radians(h0)) / np.tan(dec)[:, None, None, None]))
+    valid = (h0 <= 180.0) & np.isfinite(lat) & (np.abs(lat) <= lat_band)
+    valid &= (np.array(h_names)[:, None] != np.array(m_names)[None, :])[:, None, None, :]
+    # (planet, AC/DC, planet, MC/IC) order, matching the segment-based solver
+    valid = valid.transpose(0, 3, 1, 2)
+    lat = lat.transpose(0, 3, 1, 2)
+    for i, j, a, b in np.argwhere(valid):
+        p1, p2 = h_names[i], m_names[j]
+        l1, l2 = ("AC", "DC")[a], ("MC", "IC")[b]
+        crossing_lat = float(lat[i, j, a, b])
+        crossing_lon = float((meridians[b, j] + 180.0) % 360.0 - 180.0)
+        # Plain dict with geojson.Feature's 6-digit rounding; its per-point validation
+        # dominated the cost of this solver
+        features.append({
+            "type": "Feature",
+            "geometry": {
+                "type": "LineString",
+                "coordinates": draw_lat_line(round(crossing_lat, 6))
+            },
+            "properties": {
+                "intersection_lat": crossing_lat,
+                "intersection_lon": crossing_lon,
+                "source_lines": [f"{p1}_{l1}", f"{p2}_{l2}"],
+                "label": f"{p1} {l1} crossing {p2} {l2}",
+                "type": "crossing_latitude"
+            }
+        })
+    print(f"[PARANS] Found {len(features)} intersections analytically.")
+    return features
+
 # --- End of planetary line intersection module ---
@@ -1,7 +1,25 @@
-import pytz
+import os
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
-from timezonefinder import TimezoneFinder
+
+try:
+    from backend.gazetteer import get_gazetteer
+    from backend.timezone_resolver import get_timezone_resolver
+except ImportError:
+    from gazetteer import get_gazetteer
+    from timezone_resolver import get_timezone_resolver
+
+# Nominatim is only consulted when the offline gazetteer is missing or has no match;
+# set MERIDIAN_NOMINATIM_FALLBACK=0 to never leave the process
+NOMINATIM_FALLBACK = os.environ.get("MERIDIAN_NOMINATIM_FALLBACK", "1") != "0"
+_geolocator = None
+
+def _get_geolocator():
+    """Shared Nominatim client, created on first fallback."""
+    global _geolocator
+    if _geolocator is None:
+        _geolocator = Nominatim(user_agent="astro-app", timeout=10)
+    return _geolocator
 
 def detect_timezone_from_coordinates(latitude, longitude):
     """
@@ -15,24 +33,16 @@ def detect_timezone_from_coordinates(latitude, longitude):
         str: Timezone string or None if not found
     """
     try:
-        # Initialize TimezoneFinder
-        tf = TimezoneFinder()
-        
-        # Get timezone at coordinates
-        timezone_str = tf.timezone_at(lat=latitude, lng=longitude)
-        
-        # Validate timezone
-        if timezone_str and timezone_str in pytz.all_timezones:
-            return timezone_str
-        
-        return None
+        # Shared, file-backed TimezoneFinder with a per-cell cache
+        return get_timezone_resolver().timezone_at(latitude, longitude)
     except Exception as e:
         print(f"Error detecting timezone: {e}")
         return None
 
 def get_location_suggestions(query, limit=5):
     """
-    Get location suggestions based on a query string
+    Get location suggestions based on a query string, from the offline gazetteer
+    when installed and Nominatim otherwise
     
     Args:
         query (str): Location query string
@@ -41,8 +51,15 @@ def get_location_suggestions(query, limit=5):
     Returns:
         list: List of location suggestions
     """
+    gazetteer = get_gazetteer()
+    if gazetteer is not None:
+        suggestions = gazetteer.suggest(query, limit=limit)
+        if suggestions or not NOMINATIM_FALLBACK:
+            return suggestions
+    elif not NOMINATIM_FALLBACK:
+        return []
     try:
-        geolocator = Nominatim(user_agent="astro-app")
+        geolocator = _get_geolocator()
         
         # Get location suggestions
         locations = geolocator.geocode(query, exactly_one=False, limit=limit)
@@ -52,7 +69,11 @@ def get_location_suggestions(query, limit=5):
         
         # Format suggestions
         suggestions = []
-        for location in locations:
+        timezones = get_timezone_resolver().timezones_at(
+            [location.latitude for location in locations],
+            [location.longitude for location in locations],
+        )
+        for location, timezone in zip(locations, timezones):
             # Extract city, state, country from address
             address_parts = location.address.split(', ')
             
@@ -63,9 +84,6 @@ def get_location_suggestions(query, limit=5):
             country = address_parts[-1] if len(address_parts) > 1 else ""
             state = address_parts[-2] if len(address_parts) > 2 else ""
             
-            # Get timezone
-            timezone = detect_timezone_from_coordinates(location.latitude, location.longitude)
-            
             suggestions.append({
                 'address': location.address,
                 'city': city,
@@ -93,8 +111,21 @@ def get_coordinates(city, state="", country=""):
     Returns:
         tuple: (latitude, longitude) or None if geocoding fails
     """
+    gazetteer = get_gazetteer()
+    if gazetteer is not None:
+        match = gazetteer.lookup(city, state, country)
+        if match is None:
+            # No exact name: take the most populous prefix match ("New York" -> "New York City")
+            ranked = gazetteer.suggest(", ".join(p for p in (city, state, country) if p), limit=1)
+            match = ranked[0] if ranked else None
+        if match is not None:
+            print(f"Gazetteer match: {match['address']} ({match['latitude']}, {match['longitude']})")
+            return (match['latitude'], match['longitude'])
+    if not NOMINATIM_FALLBACK:
+        print(f"Geocoding failed: no gazetteer match for '{city}, {state}, {country}'")
+        return None
     try:
-        geolocator = Nominatim(user_agent="astro-app", timeout=10)
+        geolocator = _get_geolocator()
         query_parts = []
         if city:
             query_parts.append(city)
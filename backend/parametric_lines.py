@@ -0,0 +1,193 @@
+"""
+Parametric (time-continuous) astrocartography lines.
+
+API:
+- fit_parametric_model(jd_start, jd_end, bodies, degree) -> Dict:
+    Chebyshev coefficients of each body's RA, Dec and ecliptic longitude over a time
+    window, plus a linear GST model. JSON-serializable.
+- evaluate_parametric_model(model, jd) -> Dict:
+    Reference evaluator: GST and per-body RA/Dec/longitude at any JD in the window.
+- render_parametric_frame(model, jd, lat_steps) -> Dict:
+    MC/IC and horizon lines for one frame, drawn from the evaluated model.
+
+MC/IC longitudes are RA − GST and horizon curves depend only on RA, Dec and GST, so a
+client holding the model can draw any intermediate frame without calling the backend.
+Time is mapped to t = 2 (jd − jd_start) / (jd_end − jd_start) − 1 ∈ [−1, 1]; RA and
+longitude coefficients are fitted on unwrapped angles, so evaluate then wrap to [0, 360).
+"""
+from typing import Dict, Iterable
+
+import numpy as np
+from numpy.polynomial import chebyshev
+
+try:
+    from backend.chart_context import ChartContext
+    from backend.ephemeris_table import get_ephemeris_table
+    from backend.line_ac_dc import generate_horizon_line_batch
+except ImportError:
+    from chart_context import ChartContext
+    from ephemeris_table import get_ephemeris_table
+    from line_ac_dc import generate_horizon_line_batch
+
+DEFAULT_DEGREE = 10
+MAX_DEGREE = 30  # each fit samples 2 (degree + 1) frames, and as many again to check it
+MAX_WINDOW_DAYS = 31.0
+SIDEREAL_RATE = 360.98564736629  # degrees of GST per UT day
+# Bodies whose MC/IC lines use ecliptic longitude as RA (see generate_all_astrocartography_features)
+ECLIPTIC_MC_BODIES = {"Lunar Node"}
+
+def _to_t(jd, jd_start, jd_end):
+    return 2.0 * (np.asarray(jd, dtype=float) - jd_start) / (jd_end - jd_start) - 1.0
+
+def _sample(jds, bodies):
+    """(F, N) arrays of RA (unwrapped), Dec and longitude (unwrapped), plus GST per frame."""
+    # The precomputed table (when built) is within 1e-6° and far cheaper than Swiss Ephemeris
+    contexts = ChartContext.sweep(jds, bodies, table=get_ephemeris_table())
+    names = contexts[0].names
+    ra = np.unwrap(np.radians([c.ra for c in contexts]), axis=0)
+    lon = np.unwrap(np.radians([c.lon for c in contexts]), axis=0)
+    dec = np.array([c.dec for c in contexts])
+    gst = np.array([c.gst_deg for c in contexts])
+    return names, np.degrees(ra), dec, np.degrees(lon), gst, contexts[0]
+
+def fit_parametric_model(
+    jd_start: float,
+    jd_end: float,
+    bodies: Iterable[str],
+    degree: int = DEFAULT_DEGREE,
+) -> Dict:
+    """
+    Fit Chebyshev series to each body's RA, Dec and ecliptic longitude over [jd_start, jd_end].
+
+    Args:
+        jd_start, jd_end: Window in Julian days (UT)
+        bodies: Body names (see chart_context.BODY_IDS)
+        degree: Chebyshev degree of every series
+
+    Returns:
+        dict: {"type": "ParametricLines", "basis", "window", "gst", "bodies"}; each body has
+        "ra", "dec", "lon" coefficient lists and "max_error_deg" measured on points between
+        the fitting nodes.
+
+    Raises:
+        ValueError: On an empty or too long window, or a degree outside 1..MAX_DEGREE
+    """
+    span = jd_end - jd_start
+    if not 0 < span <= MAX_WINDOW_DAYS:
+        raise ValueError(f"Window must be longer than 0 and at most {MAX_WINDOW_DAYS:g} days")
+    try:
+        valid_degree = float(degree) == int(degree) and 1 <= int(degree) <= MAX_DEGREE
+    except (TypeError, ValueError):
+        valid_degree = False
+    if not valid_degree:
+        raise ValueError(f"degree must be a whole number from 1 to {MAX_DEGREE}")
+    degree = int(degree)
+    bodies = list(bodies)
+    # Chebyshev nodes keep the fit free of edge ringing; least squares over 2x the degree
+    n_nodes = 2 * (degree + 1)
+    t_nodes = np.cos(np.pi * (np.arange(n_nodes) + 0.5) / n_nodes)[::-1]
+    jd_nodes = jd_start + 0.5 * (t_nodes + 1.0) * span
+    names, ra, dec, lon, gst, first = _sample(jd_nodes, bodies)
+
+    coeffs = {
+        "ra": chebyshev.chebfit(t_nodes, ra, degree),
+        "dec": chebyshev.chebfit(t_nodes, dec, degree),
+        "lon": chebyshev.chebfit(t_nodes, lon, degree),
+    }
+    # GST turns ~361°/day, faster than the nodes sample it: fit the residual from the mean rate
+    days = jd_nodes - jd_start
+    residual = (gst - SIDEREAL_RATE * days - gst[0] + 180.0) % 360.0 - 180.0
+    rate_offset, ref_offset = np.polyfit(days, residual, 1)
+    gst_rate = SIDEREAL_RATE + rate_offset
+    gst_ref = gst[0] + ref_offset
+
+    # Check the fit halfway between nodes, where interpolation error peaks
+    t_check = np.concatenate([[-1.0], 0.5 * (t_nodes[:-1] + t_nodes[1:]), [1.0]])
+    jd_check = jd_start + 0.5 * (t_check + 1.0) * span
+    _, ra_c, dec_c, lon_c, gst_c, _ = _sample(jd_check, names)
+    def max_err(key, actual):
+        fitted = chebyshev.chebval(t_check, coeffs[key])
+        diff = (fitted.T - actual + 180.0) % 360.0 - 180.0
+        return np.abs(diff).max(axis=0)
+    err = {"ra": max_err("ra", ra_c), "dec": max_err("dec", dec_c), "lon": max_err("lon", lon_c)}
+    gst_fit = gst_ref + gst_rate * (jd_check - jd_start)
+    gst_err = float(np.abs((gst_fit - gst_c + 180.0) % 360.0 - 180.0).max())
+
+    model_bodies = {}
+    for i, name in enumerate(names):
+        if name in first.errors:
+            continue
+        model_bodies[name] = {
+            "id": int(first.ids[i]),
+            "ra": coeffs["ra"][:, i].tolist(),
+            "dec": coeffs["dec"][:, i].tolist(),
+            "lon": coeffs["lon"][:, i].tolist(),
+            "max_error_deg": {key: float(err[key][i]) for key in err},
+        }
+    return {
+        "type": "ParametricLines",
+        "basis": "chebyshev",
+        "window": {"jd_start": jd_start, "jd_end": jd_end},
+        "gst": {
+            "jd_ref": jd_start,
+            "deg_at_ref": float(gst_ref % 360.0),
+            "deg_per_day": float(gst_rate),
+            "max_error_deg": gst_err,
+        },
+        "bodies": model_bodies,
+    }
+
+def evaluate_parametric_model(model: Dict, jd) -> Dict:
+    """
+    Evaluate a model from fit_parametric_model at one JD (or an array of JDs).
+
+    Returns:
+        dict: {"gst_deg": ..., "bodies": {name: {"ra", "dec", "lon"}}}, angles in degrees,
+        RA/longitude/GST wrapped to [0, 360)
+    """
+    window = model["window"]
+    t = _to_t(jd, window["jd_start"], window["jd_end"])
+    gst = model["gst"]
+    gst_deg = (gst["deg_at_ref"] + gst["deg_per_day"] * (np.asarray(jd, dtype=float) - gst["jd_ref"])) % 360.0
+    bodies = {}
+    for name, body in model["bodies"].items():
+        bodies[name] = {
+            "ra": chebyshev.chebval(t, body["ra"]) % 360.0,
+            "dec": chebyshev.chebval(t, body["dec"]),
+            "lon": chebyshev.chebval(t, body["lon"]) % 360.0,
+        }
+    return {"gst_deg": gst_deg, "bodies": bodies}
+
+def render_parametric_frame(model: Dict, jd: float, lat_steps=None) -> Dict:
+    """
+    Server-side frame renderer: MC/IC and horizon lines at `jd` from the model alone.
+
+    Returns:
+        dict: GeoJSON FeatureCollection with the same line properties as the full pipeline
+    """
+    lat_steps = np.arange(-85, 85.01, 0.5) if lat_steps is None else lat_steps
+    state = evaluate_parametric_model(model, jd)
+    gst_deg = float(state["gst_deg"])
+    features = []
+    for name, pos in state["bodies"].items():
+        ra = float(pos["lon"] if name in ECLIPTIC_MC_BODIES else pos["ra"])
+        mc_long = (ra - gst_deg + 180.0) % 360.0 - 180.0
+        for line_type, lon in (("MC", mc_long), ("IC", (mc_long + 360.0) % 360.0 - 180.0)):
+            features.append({
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": [[lon, -85], [lon, 85]]},
+                "properties": {"planet": name, "line_type": line_type, "body": name, "category": "planet"},
+            })
+    names = list(state["bodies"])
+    horizon = generate_horizon_line_batch(
+        names,
+        [float(state["bodies"][n]["ra"]) for n in names],
+        [float(state["bodies"][n]["dec"]) for n in names],
+        [gst_deg] * len(names),
+        lat_steps,
+    )
+    for feat in horizon:
+        if feat is not None:
+            feat["properties"]["category"] = "planet"
+            features.append(feat)
+    return {"type": "FeatureCollection", "features": features}
@@ -0,0 +1,412 @@
+"""
+World relocation heat map: where on Earth a chart's lines concentrate.
+
+API:
+- compute_relocation_heatmap(context, resolution, orb_degrees, body_weights, line_weights, max_latitude,
+  normalize) -> HeatmapGrid:
+    Weighted line-proximity score for every cell of a global lat/lon grid.
+- top_locations(grid, count, min_separation_degrees) -> List[Dict]:
+    The strongest local maxima, at least min_separation_degrees apart.
+- render_png(grid, vmax) -> bytes / render_tile(grid, z, x, y, vmax) -> bytes:
+    Colour-mapped PNG of the whole (equirectangular) grid, or one 256 px
+    Web Mercator XYZ tile of it.
+- raw_grid(grid) -> (bytes, header):
+    Little-endian float32 cells, north-up, with a GeoTIFF/ESRI-style header.
+- HEATMAP_CACHE:
+    Process-wide LRU of computed grids (MERIDIAN_HEATMAP_CACHE_SIZE entries).
+
+Every cell scores sum(body weight * line weight * exp(-sin^2 d / (2 sin^2 orb))),
+where d is the angular distance from the cell to each of the chart's MC, IC, AC,
+DC and aspect lines. Everything is evaluated from the ChartContext RA/Dec, GST
+and obliquity in closed form; no line geometry is sampled:
+- MC/IC and MC aspect lines are meridian halves, sin d = |sin dlon| cos lat
+  (or the distance to the nearer pole beyond the half's ends). They depend on
+  |lat| only, so they are evaluated on the northern half of the grid and mirrored.
+- AC/DC lines are the body's horizon circle, sin d = |sin altitude|, split into
+  the rising (AC) and setting (DC) half by the sign of the hour angle.
+- ASC aspect lines are the rising curves of ecliptic points. For an ecliptic
+  point at distance x from the Ascendant, sin altitude = sin(i) sin(x), where i is
+  the ecliptic's angle to the horizon. All of them are read from one table over
+  (Ascendant, sin i), interpolated per cell, so their cost does not grow with
+  the number of bodies.
+
+Every MC/IC line meets at the poles and every ASC line at the polar circles, so
+scores there say nothing about the chart; cells beyond max_latitude (default 60°)
+are left at 0 and not computed.
+
+Even inside that band the lines draw together with latitude: meridians are
+cos(lat) apart and ASC lines crowd toward the polar circles, so raw sums rise
+with |lat| for any chart. With normalize (the default) each latitude row is
+standardized by its mean and standard deviation over longitude. Those are the
+mean and spread of a cell's score if the chart's lines were turned to a random
+longitude, so a normalized score says how far a cell stands above what its
+latitude gives any chart with these bodies.
+"""
+import hashlib
+import json
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from scipy.ndimage import maximum_filter
+
+try:
+    from backend.line_aspects import ASPECT_ANGLES
+    from backend.parametric_lines import ECLIPTIC_MC_BODIES
+except ImportError:
+    from line_aspects import ASPECT_ANGLES
+    from parametric_lines import ECLIPTIC_MC_BODIES
+
+DEFAULT_RESOLUTION = 1.0
+MIN_RESOLUTION = 0.1
+MAX_RESOLUTION = 10.0
+DEFAULT_ORB = 1.5  # degrees; the Gaussian's standard deviation
+DEFAULT_MAX_LATITUDE = 60.0
+LINE_WEIGHTS = {"MC": 1.0, "IC": 1.0, "AC": 1.0, "DC": 1.0, "ASPECT": 0.25}
+TILE_SIZE = 256
+MAX_TILE_ZOOM = 12
+# (Ascendant, sin i) lookup table for ASC aspect lines
+ASC_TABLE_STEPS_PER_ORB = 8  # Ascendant steps per orb, at most 0.5° apart
+ASC_TABLE_LEVELS = 64  # sin i levels over [0, 1]
+
+# Score fraction of vmax -> RGBA; low scores fade out to transparent
+COLOR_STOPS = (
+    (0.00, (49, 54, 149, 0)),
+    (0.15, (69, 117, 180, 60)),
+    (0.35, (116, 173, 209, 120)),
+    (0.55, (254, 224, 144, 170)),
+    (0.75, (244, 109, 67, 200)),
+    (1.00, (165, 0, 38, 230)),
+)
+
+class HeatmapGrid(NamedTuple):
+    scores: np.ndarray  # (rows, cols) float32; row 0 is the northernmost band, column 0 starts at -180°
+    resolution: float
+
+    @property
+    def lats(self) -> np.ndarray:
+        """Cell-centre latitudes, north to south."""
+        return 90.0 - self.resolution * (np.arange(self.scores.shape[0]) + 0.5)
+
+    @property
+    def lons(self) -> np.ndarray:
+        """Cell-centre longitudes, west to east."""
+        return -180.0 + self.resolution * (np.arange(self.scores.shape[1]) + 0.5)
+
+def _grid_shape(resolution: float) -> Tuple[int, int]:
+    if not MIN_RESOLUTION <= resolution <= MAX_RESOLUTION:
+        raise ValueError(f"resolution must be between {MIN_RESOLUTION} and {MAX_RESOLUTION} degrees")
+    rows = 180.0 / resolution
+    if abs(rows - round(rows)) > 1e-9:
+        raise ValueError("resolution must divide 180 degrees evenly")
+    return int(round(rows)), 2 * int(round(rows))
+
+def _body_weights(context, body_weights: Optional[Dict]) -> List[Tuple[int, float]]:
+    """(context index, weight) of every usable body with a non-zero weight."""
+    body_weights = body_weights or {}
+    unknown = set(body_weights) - set(context.names)
+    if unknown:
+        raise ValueError(f"Unknown bodies in body_weights: {sorted(unknown)}")
+    selected = []
+    for i, name in enumerate(context.names):
+        weight = float(body_weights.get(name, 1.0))
+        if weight and name in context and np.isfinite([context.ra[i], context.dec[i], context.lon[i]]).all():
+            selected.append((i, weight))
+    return selected
+
+def _line_weights(line_weights: Optional[Dict]) -> Dict[str, float]:
+    unknown = set(line_weights or {}) - set(LINE_WEIGHTS)
+    if unknown:
+        raise ValueError(f"Unknown line types in line_weights: {sorted(unknown)}; choose from {list(LINE_WEIGHTS)}")
+    return {**LINE_WEIGHTS, **{k: float(v) for k, v in (line_weights or {}).items()}}
+
+def _meridian_scores(lons_rad, half_cos_lat, line_lons, weights, spread):
+    """
+    Sum of meridian-half kernels on the northern half of the grid.
+
+    Each line runs pole to pole along longitude line_lons[t]. Columns more than 90° away are
+    nearest to a pole, at angular distance (90° - |lat|), whose sine is cos lat.
+    """
+    scores = np.zeros((len(half_cos_lat), len(lons_rad)), dtype=np.float32)
+    row_term = (half_cos_lat ** 2 / (-2.0 * spread ** 2)).astype(np.float32)
+    buffer = np.empty_like(scores)
+    for line_lon, weight in zip(line_lons, weights):
+        delta = lons_rad - line_lon
+        col_term = np.where(np.cos(delta) >= 0.0, np.sin(delta) ** 2, 1.0).astype(np.float32)
+        np.multiply.outer(row_term, col_term, out=buffer)
+        np.exp(buffer, out=buffer)
+        buffer *= np.float32(weight)
+        scores += buffer
+    return scores
+
+def _horizon_scores(scores, lons_rad, sin_lat, cos_lat, gst_rad, ras, decs, rising_weights, setting_weights, spread):
+    """Add horizon-circle kernels (rising half, setting half) for each (RA, Dec) to `scores`."""
+    scale = np.float32(1.0 / (np.sqrt(2.0) * spread))
+    buffer = np.empty_like(scores)
+    for ra, dec, w_rise, w_set in zip(ras, decs, rising_weights, setting_weights):
+        hour_angle = gst_rad + lons_rad - ra
+        # sin(altitude) = sin(lat) sin(dec) + cos(lat) cos(dec) cos(H), scaled for the kernel
+        np.multiply.outer(cos_lat, (np.cos(dec) * np.cos(hour_angle) * scale).astype(np.float32), out=buffer)
+        buffer += (sin_lat * (np.sin(dec) * scale))[:, None]
+        np.square(buffer, out=buffer)
+        np.negative(buffer, out=buffer)
+        np.exp(buffer, out=buffer)
+        # East of the meridian (sin H < 0) the body is rising
+        buffer *= np.where(np.sin(hour_angle) < 0.0, w_rise, w_set).astype(np.float32)
+        scores += buffer
+
+def _asc_aspect_scores(scores, lons_rad, sin_lat, cos_lat, ramc0_rad, obliquity_rad, targets, weights, spread, orb):
+    """Add the rising-curve kernels of ecliptic longitudes `targets` (radians) to `scores`."""
+    ramc = ramc0_rad + lons_rad
+    sin_ramc, cos_ramc = np.sin(ramc).astype(np.float32), np.cos(ramc).astype(np.float32)
+    sin_eps, cos_eps = np.float32(np.sin(obliquity_rad)), np.float32(np.cos(obliquity_rad))
+    # Ascendant longitude and sin of the ecliptic's angle to the horizon, per cell
+    cos_incl = np.multiply.outer(cos_lat, -sin_eps * sin_ramc)
+    cos_incl += (sin_lat * cos_eps)[:, None]
+    asc = np.arctan2(
+        np.multiply.outer(cos_lat, cos_ramc),
+        -(np.multiply.outer(cos_lat, cos_eps * sin_ramc) + (sin_lat * sin_eps)[:, None]),
+    )
+    np.square(cos_incl, out=cos_incl)
+    sin_incl = np.sqrt(np.clip(1.0 - cos_incl, 0.0, 1.0, out=cos_incl), out=cos_incl)
+
+    # table[k, a] = sum_t w_t exp(-(sin_incl_k sin(target_t - asc_a))^2 / (2 spread^2)), rising side only
+    steps = int(np.ceil(360.0 / min(0.5, orb / ASC_TABLE_STEPS_PER_ORB)))
+    table_asc = np.linspace(0.0, 2.0 * np.pi, steps + 1)
+    levels = np.linspace(0.0, 1.0, ASC_TABLE_LEVELS)
+    row_term = (levels ** 2 / (-2.0 * spread ** 2)).astype(np.float32)
+    table = np.zeros((ASC_TABLE_LEVELS, steps + 1), dtype=np.float32)
+    buffer = np.empty_like(table)
+    for target, weight in zip(targets, weights):
+        delta = target - table_asc
+        np.multiply.outer(row_term, np.where(np.cos(delta) > 0.0, np.sin(delta) ** 2, 1.0).astype(np.float32), out=buffer)
+        np.exp(buffer, out=buffer)
+        buffer *= np.float32(weight)
+        table += buffer
+
+    # Bilinear lookup
+    a = (np.mod(asc, 2.0 * np.pi) * np.float32(steps / (2.0 * np.pi))).astype(np.float32)
+    a0 = np.minimum(a.astype(np.int32), steps - 1)
+    fa = a - a0
+    k = sin_incl * np.float32(ASC_TABLE_LEVELS - 1)
+    k0 = np.minimum(k.astype(np.int32), ASC_TABLE_LEVELS - 2)
+    fk = k - k0
+    flat = table.ravel()
+    index = k0 * (steps + 1) + a0
+    lower = flat[index] * (1.0 - fa) + flat[index + 1] * fa
+    index += steps + 1
+    upper = flat[index] * (1.0 - fa) + flat[index + 1] * fa
+    scores += lower * (1.0 - fk) + upper * fk
+
+def compute_relocation_heatmap(
+    context,
+    resolution: float = DEFAULT_RESOLUTION,
+    orb_degrees: float = DEFAULT_ORB,
+    body_weights: Optional[Dict[str, float]] = None,
+    line_weights: Optional[Dict[str, float]] = None,
+    max_latitude: float = DEFAULT_MAX_LATITUDE,
+    normalize: bool = True,
+) -> HeatmapGrid:
+    """
+    Score every cell of a global grid by its weighted proximity to the chart's lines.
+
+    Args:
+        context: The chart's ChartContext
+        resolution: Cell size in degrees; must divide 180
+        orb_degrees: Standard deviation of each line's Gaussian falloff, in degrees
+        body_weights: {body name: weight}; unlisted bodies weigh 1, 0 leaves a body out
+        line_weights: Overrides of LINE_WEIGHTS ("MC", "IC", "AC", "DC", "ASPECT")
+        max_latitude: Cells further from the equator stay at 0
+        normalize: Standardize each latitude row (see the module docstring); False
+            returns the raw weighted kernel sums
+
+    Returns:
+        HeatmapGrid with float32 scores, row 0 at the north pole
+
+    Raises:
+        ValueError: On a bad resolution, orb or max_latitude, or unknown body or line names
+    """
+    rows, cols = _grid_shape(float(resolution))
+    if not 0.1 <= float(orb_degrees) <= 30.0:
+        raise ValueError("orb_degrees must be between 0.1 and 30")
+    if not 0.0 < float(max_latitude) <= 90.0:
+        raise ValueError("max_latitude must be between 0 and 90")
+    lines = _line_weights(line_weights)
+    bodies = _body_weights(context, body_weights)
+    grid = HeatmapGrid(np.zeros((rows, cols), dtype=np.float32), float(resolution))
+    if not bodies:
+        return grid
+    # Rows inside the latitude band; it is symmetric about the equator
+    in_band = np.nonzero(np.abs(grid.lats) <= float(max_latitude))[0]
+    if not len(in_band):
+        return grid
+    scores = grid.scores[in_band[0]:in_band[-1] + 1]
+    band_rows = len(scores)
+
+    spread = np.sin(np.radians(float(orb_degrees)))
+    lats_rad, lons_rad = np.radians(grid.lats[in_band]), np.radians(grid.lons)
+    sin_lat, cos_lat = np.sin(lats_rad).astype(np.float32), np.cos(lats_rad).astype(np.float32)
+    gst = np.radians(context.gst_deg)
+    obliquity = np.radians(context.obliquity_deg)
+    index = np.array([i for i, _ in bodies])
+    weights = np.array([w for _, w in bodies])
+    ras, decs, ecl_lons = np.radians(context.ra[index]), np.radians(context.dec[index]), np.radians(context.lon[index])
+
+    # Meridian halves: MC at lon = RA - GST, IC opposite, MC aspects where the MC's longitude is lon ± angle
+    mc_ras = np.where([context.names[i] in ECLIPTIC_MC_BODIES for i in index], ecl_lons, ras)
+    line_lons, line_weights_ = [], []
+    for line_type, offset in (("MC", 0.0), ("IC", np.pi)):
+        if lines[line_type]:
+            line_lons.append(mc_ras - gst + offset)
+            line_weights_.append(weights * lines[line_type])
+    aspect_offsets = np.radians([a for angle in ASPECT_ANGLES for a in (angle, -angle)])
+    if lines["ASPECT"]:
+        targets = (ecl_lons[:, None] - aspect_offsets[None, :]).ravel()
+        mc_ra = np.arctan2(np.sin(targets) * np.cos(obliquity), np.cos(targets))
+        line_lons.append(mc_ra - gst)
+        line_weights_.append(np.repeat(weights, len(aspect_offsets)) * lines["ASPECT"])
+    if line_lons:
+        half = _meridian_scores(lons_rad, cos_lat[:(band_rows + 1) // 2], np.concatenate(line_lons),
+                                np.concatenate(line_weights_), spread)
+        scores += half[np.minimum(np.arange(band_rows), band_rows - 1 - np.arange(band_rows))]
+
+    if lines["AC"] or lines["DC"]:
+        _horizon_scores(scores, lons_rad, sin_lat, cos_lat, gst, ras, decs,
+                        weights * lines["AC"], weights * lines["DC"], spread)
+    if lines["ASPECT"]:
+        _asc_aspect_scores(scores, lons_rad, sin_lat, cos_lat, gst, obliquity,
+                           (ecl_lons[:, None] - aspect_offsets[None, :]).ravel(),
+                           np.repeat(weights, len(aspect_offsets)) * lines["ASPECT"], spread, float(orb_degrees))
+    if normalize:
+        mean = scores.mean(axis=1, dtype=np.float64, keepdims=True)
+        std = scores.std(axis=1, dtype=np.float64, keepdims=True)
+        scores -= mean.astype(np.float32)
+        scores /= np.where(std > 0.0, std, 1.0).astype(np.float32)
+    return grid
+
+def top_locations(grid: HeatmapGrid, count: int = 10, min_separation_degrees: float = 10.0) -> List[Dict]:
+    """Highest local maxima of the grid, strongest first, as {"latitude", "longitude", "score"}."""
+    size = max(1, int(round(min_separation_degrees / grid.resolution))) | 1
+    peaks = grid.scores == maximum_filter(grid.scores, size=size, mode=("nearest", "wrap"))
+    peaks &= grid.scores > 0
+    rows, cols = np.nonzero(peaks)
+    order = np.argsort(-grid.scores[rows, cols], kind="stable")[:count]
+    lats, lons = grid.lats, grid.lons
+    return [
+        {"latitude": float(lats[r]), "longitude": float(lons[c]), "score": float(grid.scores[r, c])}
+        for r, c in zip(rows[order], cols[order])
+    ]
+
+def _color_table() -> np.ndarray:
+    stops = np.array([s for s, _ in COLOR_STOPS])
+    colors = np.array([c for _, c in COLOR_STOPS], dtype=float)
+    x = np.linspace(0.0, 1.0, 256)
+    return np.stack([np.interp(x, stops, colors[:, ch]) for ch in range(4)], axis=1).round().astype(np.uint8)
+
+_COLORS = _color_table()
+
+def _colorize(scores: np.ndarray, vmax: Optional[float]) -> np.ndarray:
+    vmax = float(vmax) if vmax else float(scores.max(initial=0.0))
+    if vmax <= 0:
+        return _COLORS[np.zeros(scores.shape, dtype=np.uint8)]
+    return _COLORS[np.clip(scores * (255.0 / vmax), 0, 255).astype(np.uint8)]
+
+def encode_png(rgba: np.ndarray) -> bytes:
+    """Encode an (height, width, 4) uint8 array as an RGBA PNG."""
+    height, width = rgba.shape[:2]
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    raw = np.zeros((height, width * 4 + 1), dtype=np.uint8)  # filter byte 0 (None) per row
+    raw[:, 1:] = rgba.reshape(height, width * 4)
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)),
+        chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)),
+        chunk(b"IEND", b""),
+    ])
+
+def render_png(grid: HeatmapGrid, vmax: Optional[float] = None) -> bytes:
+    """The whole grid as an equirectangular PNG, one pixel per cell; vmax defaults to the grid maximum."""
+    return encode_png(_colorize(grid.scores, vmax))
+
+def render_tile(grid: HeatmapGrid, z: int, x: int, y: int, vmax: Optional[float] = None) -> bytes:
+    """
+    One Web Mercator (XYZ) PNG tile, nearest-cell sampled.
+
+    Pass the full grid's maximum as vmax (the default) so neighbouring tiles share one colour scale.
+    """
+    if not 0 <= z <= MAX_TILE_ZOOM or not 0 <= x < 2 ** z or not 0 <= y < 2 ** z:
+        raise ValueError(f"No tile {z}/{x}/{y}")
+    pixel = (np.arange(TILE_SIZE) + 0.5) / TILE_SIZE
+    lons = (x + pixel) / 2 ** z * 360.0 - 180.0
+    lats = np.degrees(np.arctan(np.sinh(np.pi * (1.0 - 2.0 * (y + pixel) / 2 ** z))))
+    rows = np.clip(((90.0 - lats) / grid.resolution).astype(int), 0, grid.scores.shape[0] - 1)
+    cols = np.clip(((lons + 180.0) / grid.resolution).astype(int), 0, grid.scores.shape[1] - 1)
+    vmax = vmax or float(grid.scores.max(initial=0.0))
+    return encode_png(_colorize(grid.scores[np.ix_(rows, cols)], vmax))
+
+def raw_grid(grid: HeatmapGrid) -> Tuple[bytes, Dict]:
+    """Little-endian float32 cells, row-major from the north-west corner, and their georeferencing."""
+    rows, cols = grid.scores.shape
+    header = {
+        "nrows": rows,
+        "ncols": cols,
+        "cellsize": grid.resolution,
+        "xllcorner": -180.0,
+        "yllcorner": -90.0,
+        # GDAL geotransform: (x origin, pixel width, 0, y origin, 0, -pixel height)
+        "geotransform": [-180.0, grid.resolution, 0.0, 90.0, 0.0, -grid.resolution],
+        "crs": "EPSG:4326",
+        "pixeltype": "float32",
+        "byteorder": "little",
+    }
+    return grid.scores.astype("<f4").tobytes(), header
+
+def heatmap_key(context, **options) -> str:
+    """Cache key of a heat map: the context's positions and sidereal frame, plus the options."""
+    digest = hashlib.sha256()
+    for values in (context.ra, context.dec, context.lon):
+        digest.update(np.ascontiguousarray(values, dtype=float).tobytes())
+    digest.update(repr((context.names, context.gst_deg, context.obliquity_deg)).encode("utf-8"))
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+class HeatmapCache:
+    """Small LRU of HeatmapGrids; a 0.25° grid is 4 MB."""
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[HeatmapGrid]:
+        with self._lock:
+            grid = self._entries.get(key)
+            if grid is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return grid
+
+    def put(self, key: str, grid: HeatmapGrid) -> None:
+        with self._lock:
+            self._entries[key] = grid
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries,
+                    "hits": self.hits, "misses": self.misses}
+
+HEATMAP_CACHE = HeatmapCache(int(os.environ.get("MERIDIAN_HEATMAP_CACHE_SIZE", 16)))
@@ -0,0 +1,83 @@
+"""
+Request coalescing for identical in-flight computations.
+
+API:
+- SingleFlight.do(key, fn, *args, **kwargs) -> value:
+    Runs fn once per key at a time; callers arriving while it runs wait and get
+    the same value (or the same exception).
+- request_key(namespace, payload) -> str:
+    SHA-256 of a canonical JSON payload, for keying whole API requests.
+- CHART_FLIGHTS, FEATURE_FLIGHTS:
+    Process-wide groups for /api/calculate and the astrocartography feature pipeline.
+
+Nothing is remembered once a call finishes; repeat requests after that are the
+feature cache's job. Values are shared between callers, so they must not be
+mutated in place.
+"""
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict
+
+class _Call:
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key onto one execution."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable, *args, **kwargs) -> Any:
+        """Return fn(*args, **kwargs), computed at most once across concurrent callers of `key`."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+        try:
+            call.value = fn(*args, **kwargs)
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict:
+        """Execution/coalescing counters and calls currently in flight."""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+            }
+
+def request_key(namespace: str, payload: Any) -> str:
+    """Canonical hash of a JSON-compatible payload, scoped by namespace."""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{namespace}:{body}".encode("utf-8")).hexdigest()
+
+CHART_FLIGHTS = SingleFlight()
+FEATURE_FLIGHTS = SingleFlight()
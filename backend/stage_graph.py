@@ -0,0 +1,152 @@
+"""
+Dependency-ordered execution of pipeline stages.
+
+API:
+- Stage(name, fn, args=(), deps=()):
+    One step; it runs as fn(*args, *results_of_deps) once its deps have finished.
+- run_stages(stages, executor=None) -> (results, timings):
+    Runs a stage graph, handing every stage whose dependencies are done to
+    `executor` at once. With no executor the stages run inline, in order.
+- get_stage_executor() -> Optional[Executor]:
+    Process-wide pool chosen by MERIDIAN_STAGE_EXECUTOR ("thread", "process" or
+    "serial"; default "thread" on multi-core hosts, "serial" on one core) and
+    sized by MERIDIAN_STAGE_WORKERS (default: CPU count).
+- STAGE_TIMINGS:
+    Per-stage call counts and times across requests (see StageTimings.stats()).
+
+The chart stages are mostly pure Python, so only a process pool spreads them
+across cores; threads overlap the NumPy-heavy ones. A process pool pays for
+pickling every stage's inputs and features (tens of milliseconds per chart), so
+it is opt-in and only pays off with spare cores beyond the server's own
+workers. Its stage functions and arguments must be picklable (module-level
+functions, plain data), and results are copied back to the caller.
+"""
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    from backend.ephemeris_utils import ephemeris_context
+except ImportError:
+    from ephemeris_utils import ephemeris_context
+
+class Stage(NamedTuple):
+    name: str
+    fn: Callable
+    args: Tuple = ()
+    deps: Tuple[str, ...] = ()
+
+def _run_timed(fn, args):
+    """Run one stage in whichever thread or process picked it up; returns (result, seconds)."""
+    start = time.perf_counter()
+    # Pool threads and processes each need their own Swiss Ephemeris setup
+    with ephemeris_context():
+        result = fn(*args)
+    return result, time.perf_counter() - start
+
+def run_stages(stages: Sequence[Stage], executor: Optional[Executor] = None) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Run a stage graph and return ({name: result}, {name: seconds}).
+
+    Stages that share no dependency path run concurrently on `executor`. The first
+    stage error is raised once everything already running has finished.
+    """
+    by_name = {s.name: s for s in stages}
+    for stage in stages:
+        missing = [d for d in stage.deps if d not in by_name]
+        if missing:
+            raise ValueError(f"Stage {stage.name!r} depends on unknown stages {missing}")
+    results, timings = {}, {}
+
+    def call_args(stage):
+        return tuple(stage.args) + tuple(results[d] for d in stage.deps)
+
+    if executor is None:
+        pending = list(stages)
+        while pending:
+            ready = [s for s in pending if all(d in results for d in s.deps)]
+            if not ready:
+                raise ValueError(f"Stage graph has a cycle among {[s.name for s in pending]}")
+            for stage in ready:
+                results[stage.name], timings[stage.name] = _run_timed(stage.fn, call_args(stage))
+                pending.remove(stage)
+        STAGE_TIMINGS.record(timings)
+        return results, timings
+
+    pending = list(stages)
+    running = {}
+    error = None
+    while pending or running:
+        if error is None:
+            for stage in [s for s in pending if all(d in results for d in s.deps)]:
+                running[executor.submit(_run_timed, stage.fn, call_args(stage))] = stage.name
+                pending.remove(stage)
+        if not running:
+            if error is not None:
+                break
+            raise ValueError(f"Stage graph has a cycle among {[s.name for s in pending]}")
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = running.pop(future)
+            try:
+                results[name], timings[name] = future.result()
+            except Exception as e:
+                error = error or e
+    STAGE_TIMINGS.record(timings)
+    if error is not None:
+        raise error
+    return results, timings
+
+class StageTimings:
+    """Running totals of stage durations, for /api/cache/stats."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def record(self, timings: Dict[str, float]) -> None:
+        with self._lock:
+            for name, seconds in timings.items():
+                entry = self._stages.setdefault(name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+                entry["calls"] += 1
+                entry["total_ms"] += seconds * 1000.0
+                entry["max_ms"] = max(entry["max_ms"], seconds * 1000.0)
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                name: {**entry, "mean_ms": entry["total_ms"] / entry["calls"]}
+                for name, entry in self._stages.items()
+            }
+
+STAGE_TIMINGS = StageTimings()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _reset_after_fork():
+    # A pool's worker handles and threads do not survive a fork
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def get_stage_executor() -> Optional[Executor]:
+    """Shared executor for stage graphs, or None to run stages inline."""
+    global _executor
+    cpus = os.cpu_count() or 1
+    mode = os.environ.get("MERIDIAN_STAGE_EXECUTOR", "thread" if cpus > 1 else "serial").lower()
+    if mode not in ("process", "thread"):
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = int(os.environ.get("MERIDIAN_STAGE_WORKERS", cpus))
+                pool = ProcessPoolExecutor if mode == "process" else ThreadPoolExecutor
+                _executor = pool(max_workers=max(1, workers))
+                print(f"[STAGES] Running chart stages on a {mode} pool of {max(1, workers)} workers")
+    return _executor
@@ -0,0 +1,105 @@
+"""
+Process-wide timezone lookups.
+
+API:
+- TimezoneResolver(precision).timezone_at(latitude, longitude) -> Optional[str]
+- TimezoneResolver(precision).timezones_at(latitudes, longitudes) -> List[Optional[str]]:
+    Batch form for bulk jobs; each distinct cell is resolved once.
+- get_timezone_resolver() -> TimezoneResolver:
+    Shared instance used by location_utils.
+
+TimezoneFinder runs in its file-backed mode (in_memory=False), so the polygon
+data stays in the OS page cache, which every worker shares, and is not copied
+into each process. Its open file handles must not be shared across a fork, so a
+forked child reopens them on first use. Lookups are cached per (lat, lon) cell of
+`precision` degrees: two points in one cell share the first point's answer, and
+the 1e-3° default (about 110 m) keeps that below the accuracy of the borders.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pytz
+from timezonefinder import TimezoneFinder
+
+DEFAULT_PRECISION = 1e-3  # degrees per cache cell
+DEFAULT_CACHE_SIZE = 65536
+VALID_TIMEZONES = set(pytz.all_timezones)
+
+class TimezoneResolver:
+    """Lazily opened TimezoneFinder with a quantized LRU cache."""
+
+    def __init__(self, precision: float = DEFAULT_PRECISION, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.precision = precision
+        self.cache_size = cache_size
+        self._finder = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_finder(self) -> TimezoneFinder:
+        if self._finder is None:
+            self._finder = TimezoneFinder(in_memory=False)
+        return self._finder
+
+    def _reset_after_fork(self):
+        self._finder = None
+        self._lock = threading.Lock()
+
+    def _cell(self, latitude: float, longitude: float):
+        return (int(round(latitude / self.precision)), int(round(longitude / self.precision)))
+
+    def _resolve(self, latitude, longitude) -> Optional[str]:
+        name = self._get_finder().timezone_at(lat=latitude, lng=longitude)
+        return name if name in VALID_TIMEZONES else None
+
+    def _lookup_cell(self, cell, latitude, longitude) -> Optional[str]:
+        """Cached zone for a cell, resolved at (latitude, longitude) on a miss. Caller holds the lock."""
+        if cell in self._cache:
+            self._cache.move_to_end(cell)
+            self.hits += 1
+            return self._cache[cell]
+        self.misses += 1
+        name = self._resolve(latitude, longitude)
+        self._cache[cell] = name
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return name
+
+    def timezone_at(self, latitude: float, longitude: float) -> Optional[str]:
+        """IANA timezone at a point, or None over open ocean / on failure."""
+        latitude, longitude = float(latitude), float(longitude)
+        with self._lock:
+            return self._lookup_cell(self._cell(latitude, longitude), latitude, longitude)
+
+    def timezones_at(self, latitudes: Iterable[float], longitudes: Iterable[float]) -> List[Optional[str]]:
+        """Timezones for many points; points sharing a cell are resolved once."""
+        lats = np.asarray(latitudes, dtype=float)
+        lons = np.asarray(longitudes, dtype=float)
+        if lats.shape != lons.shape:
+            raise ValueError("latitudes and longitudes must have the same length")
+        cells = np.stack([np.round(lats / self.precision), np.round(lons / self.precision)], axis=-1)
+        cells = cells.astype(np.int64).reshape(-1, 2)
+        unique, first, inverse = np.unique(cells, axis=0, return_index=True, return_inverse=True)
+        flat_lats, flat_lons = lats.reshape(-1), lons.reshape(-1)
+        with self._lock:
+            names = [
+                self._lookup_cell((int(c[0]), int(c[1])), flat_lats[i], flat_lons[i])
+                for c, i in zip(unique, first)
+            ]
+        return [names[k] for k in np.asarray(inverse).reshape(-1)]
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+_resolver = TimezoneResolver()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_resolver._reset_after_fork)
+
+def get_timezone_resolver() -> TimezoneResolver:
+    """The process-wide TimezoneResolver."""
+    return _resolver
@@ -1,6 +1,10 @@
 import swisseph as swe
 import logging
-from geopy.distance import geodesic
+
+try:
+    from backend.line_index import KM_PER_MILE, LineIndex
+except ImportError:
+    from line_index import KM_PER_MILE, LineIndex
 
 logging.basicConfig(level=logging.INFO)
 
@@ -11,17 +15,14 @@ def get_julian_day(date_str, time_str):
     return swe.julday(year, month, day, hour + minute / 60.0)
 
 def filter_lines_near_location(lines, latitude, longitude, max_distance_miles=600):
-    """Return only the lines that fall within `max_distance_miles` of a given location."""
-    nearby_lines = []
-    for line in lines:
-        line_lat = line.get("latitude")
-        line_lon = line.get("longitude")
-        if line_lat is None or line_lon is None:
-            continue
-
-        distance = geodesic((latitude, longitude), (line_lat, line_lon)).miles
-        if distance <= max_distance_miles:
-            line["distance"] = round(distance, 2)
-            nearby_lines.append(line)
+    """
+    Return the line features passing within `max_distance_miles` of a location, nearest first.
 
+    Each returned feature is a copy whose properties carry `distance` in miles.
+    """
+    index = LineIndex(lines)
+    nearby_lines = []
+    for line, distance_km in index.near(latitude, longitude, max_distance_miles * KM_PER_MILE):
+        nearby_lines.append({**line, "properties": {**line.get("properties", {}),
+                                                    "distance": round(distance_km / KM_PER_MILE, 2)}})
     return nearby_lines
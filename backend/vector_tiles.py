@@ -0,0 +1,329 @@
+"""
+Mapbox Vector Tiles of astrocartography features.
+
+API:
+- TileSet(features):
+    A chart's features projected to Web Mercator and indexed once; tiles are cut from it.
+- TileSet.tile(z, x, y, categories=None) -> bytes:
+    One MVT (protobuf) tile: the features clipped to the tile plus a small
+    buffer, simplified to the zoom's pixel size, one MVT layer per feature
+    `category` ("planet", "aspect", "parans", "fixed_star", "hermetic_lot").
+- encode_tile(layers) -> bytes:
+    MVT encoder for {layer name: [(geometry type, parts in tile pixels, properties, id)]}.
+- TILE_CACHE:
+    Process-wide LRU of TileSets (by chart hash) and encoded tiles; sized by
+    MERIDIAN_TILESET_CACHE_SIZE and MERIDIAN_TILE_CACHE_SIZE.
+
+A full natal chart with aspects and parans is several MB of GeoJSON, redrawn
+at every zoom. Tiles hold only the visible part of each line, with the
+vertices a zoom can show: Douglas-Peucker simplification at half a pixel,
+coordinates quantized to the 4096-unit tile grid, and consecutive duplicate
+vertices dropped. Clipping and simplification run through shapely's
+vectorized functions against an STRtree, so cutting a tile does not loop over
+features in Python. Each zoom's simplified geometry is computed once per TileSet.
+
+Features keep their GeoJSON position in the list as their MVT id. Nested
+property values (lists, dicts) are JSON-encoded, since MVT values are scalars.
+"""
+import json
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import shapely
+
+EXTENT = 4096
+BUFFER = 64  # tile units kept beyond each edge, so strokes continue across tile seams
+MAX_ZOOM = 16
+MAX_MERCATOR_LAT = 85.0511287798066
+SIMPLIFY_PIXELS = 0.5  # Douglas-Peucker tolerance, in 256 px screen pixels
+CATEGORIES = ("planet", "aspect", "parans", "fixed_star", "hermetic_lot")
+
+# --- Protobuf ----------------------------------------------------------------
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+def _field(number: int, wire_type: int, payload: bytes) -> bytes:
+    if wire_type == 2:
+        return _varint(number << 3 | 2) + _varint(len(payload)) + payload
+    return _varint(number << 3 | wire_type) + payload
+
+def _packed(number: int, values: Iterable[int]) -> bytes:
+    return _field(number, 2, b"".join(_varint(v) for v in values))
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+def _value(value) -> bytes:
+    """tile.Value message for a property value."""
+    if isinstance(value, bool):
+        return _field(7, 0, _varint(int(value)))
+    if isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+        return _field(6, 0, _varint(_zigzag(value)))
+    if isinstance(value, float):
+        return _field(3, 1, struct.pack("<d", value))
+    if not isinstance(value, str):
+        value = json.dumps(value, separators=(",", ":"), default=str)
+    return _field(1, 2, value.encode("utf-8"))
+
+# Geometry types and commands (MVT spec 4.3)
+POINT, LINESTRING = 1, 2
+MOVE_TO, LINE_TO = 1, 2
+
+def _command(command: int, count: int) -> int:
+    return (command & 0x7) | (count << 3)
+
+def _geometry(geom_type: int, parts: Sequence[np.ndarray]) -> List[int]:
+    """Command stream for integer tile coordinates; the cursor carries over between parts."""
+    out, cx, cy = [], 0, 0
+    if geom_type == POINT:
+        points = np.concatenate(parts)
+        out.append(_command(MOVE_TO, len(points)))
+        for x, y in points.tolist():
+            out += [_zigzag(x - cx), _zigzag(y - cy)]
+            cx, cy = x, y
+        return out
+    for part in parts:
+        deltas = np.diff(np.vstack([[cx, cy], part]), axis=0)
+        zigzag = ((deltas << 1) ^ (deltas >> 63)).tolist()
+        out.append(_command(MOVE_TO, 1))
+        out += zigzag[0]
+        out.append(_command(LINE_TO, len(part) - 1))
+        for dx, dy in zigzag[1:]:
+            out += [dx, dy]
+        cx, cy = part[-1].tolist()
+    return out
+
+def encode_tile(layers: Dict[str, List[Tuple[int, Sequence[np.ndarray], Dict, int]]]) -> bytes:
+    """
+    Encode an MVT tile.
+
+    Args:
+        layers: {layer name: [(POINT or LINESTRING, parts as (n, 2) int arrays in tile units,
+            properties, feature id)]}; empty layers are left out
+
+    Returns:
+        bytes: the serialized tile (empty for a tile with no features)
+    """
+    tile = bytearray()
+    for name, features in layers.items():
+        if not features:
+            continue
+        keys, values, body = {}, {}, bytearray()
+        for geom_type, parts, properties, feature_id in features:
+            tags = []
+            for key, value in properties.items():
+                if value is None:
+                    continue
+                encoded = _value(value)
+                tags.append(keys.setdefault(key, len(keys)))
+                tags.append(values.setdefault(encoded, len(values)))
+            feature = _field(1, 0, _varint(feature_id)) + _packed(2, tags) + _field(3, 0, _varint(geom_type))
+            feature += _packed(4, _geometry(geom_type, parts))
+            body += _field(2, 2, feature)
+        layer = _field(15, 0, _varint(2)) + _field(1, 2, name.encode("utf-8")) + bytes(body)
+        layer += b"".join(_field(3, 2, key.encode("utf-8")) for key in keys)
+        layer += b"".join(_field(4, 2, value) for value in values)
+        layer += _field(5, 0, _varint(EXTENT))
+        tile += _field(3, 2, layer)
+    return bytes(tile)
+
+# --- Geometry ----------------------------------------------------------------
+def mercator(lons, lats) -> Tuple[np.ndarray, np.ndarray]:
+    """Longitude/latitude in degrees -> Web Mercator in world units (0..1, y down)."""
+    lats = np.clip(np.asarray(lats, dtype=float), -MAX_MERCATOR_LAT, MAX_MERCATOR_LAT)
+    x = (np.asarray(lons, dtype=float) + 180.0) / 360.0
+    y = 0.5 - np.log(np.tan(np.pi / 4.0 + np.radians(lats) / 2.0)) / (2.0 * np.pi)
+    return x, y
+
+def _geometry_parts(geometry) -> Tuple[Optional[int], List[List]]:
+    kind = (geometry or {}).get("type")
+    coords = (geometry or {}).get("coordinates")
+    if not coords:
+        return None, []
+    if kind == "LineString":
+        return LINESTRING, [coords]
+    if kind == "MultiLineString":
+        return LINESTRING, list(coords)
+    if kind == "Point":
+        return POINT, [[coords]]
+    if kind == "MultiPoint":
+        return POINT, [coords]
+    return None, []
+
+class TileSet:
+    """
+    Tiles cut from one feature list.
+
+    Args:
+        features: GeoJSON features (e.g. generate_all_astrocartography_features output); read-only
+    """
+
+    def __init__(self, features: Sequence[Dict]):
+        self.features = list(features)
+        self.categories = []
+        self.types = []
+        geoms = []
+        for feature in self.features:
+            geom_type, parts = _geometry_parts(feature.get("geometry"))
+            pieces = []
+            for part in parts:
+                pts = np.asarray([p[:2] for p in part], dtype=float).reshape(-1, 2)
+                pts = pts[np.isfinite(pts).all(axis=1)]
+                if geom_type == POINT:
+                    # Fixed stars carry longitudes in [0, 360)
+                    pts[:, 0] = (pts[:, 0] + 180.0) % 360.0 - 180.0
+                    pieces.extend(shapely.points(np.column_stack(mercator(pts[:, 0], pts[:, 1]))))
+                    continue
+                # Break unsplit antimeridian crossings, as the map would draw them across the world
+                for run in np.split(pts, np.nonzero(np.abs(np.diff(pts[:, 0])) > 180.0)[0] + 1):
+                    if len(run) >= 2:
+                        pieces.append(shapely.linestrings(np.column_stack(mercator(run[:, 0], run[:, 1]))))
+            if geom_type == POINT:
+                geoms.append(shapely.multipoints(pieces) if pieces else shapely.from_wkt("POINT EMPTY"))
+            else:
+                geoms.append(shapely.multilinestrings(pieces) if pieces else shapely.from_wkt("LINESTRING EMPTY"))
+            self.types.append(geom_type or LINESTRING)
+            self.categories.append((feature.get("properties") or {}).get("category") or "other")
+        self.geometries = np.array(geoms, dtype=object)
+        self.types = np.array(self.types)
+        self.categories = np.array(self.categories, dtype=object)
+        self.tree = shapely.STRtree(self.geometries)
+        self._simplified = {}
+        self._properties = [None] * len(self.features)
+        self._lock = threading.Lock()
+
+    def _zoom_geometries(self, z: int) -> np.ndarray:
+        """Geometries simplified for zoom z, computed on first use."""
+        geoms = self._simplified.get(z)
+        if geoms is None:
+            tolerance = SIMPLIFY_PIXELS / (256.0 * 2 ** z)
+            geoms = shapely.simplify(self.geometries, tolerance, preserve_topology=False)
+            with self._lock:
+                self._simplified[z] = geoms
+        return geoms
+
+    def _tile_properties(self, i: int) -> Dict:
+        props = self._properties[i]
+        if props is None:
+            props = {
+                k: (v if isinstance(v, (str, bool, int, float)) else json.dumps(v, separators=(",", ":"), default=str))
+                for k, v in (self.features[i].get("properties") or {}).items() if v is not None
+            }
+            self._properties[i] = props
+        return props
+
+    def tile(self, z: int, x: int, y: int, categories: Optional[Iterable[str]] = None) -> bytes:
+        """
+        The MVT tile z/x/y, one layer per feature category.
+
+        Args:
+            categories: Only these categories (default: all)
+
+        Raises:
+            ValueError: For tiles outside the z/x/y range
+        """
+        if not 0 <= z <= MAX_ZOOM or not 0 <= x < 2 ** z or not 0 <= y < 2 ** z:
+            raise ValueError(f"No tile {z}/{x}/{y}")
+        scale = float(2 ** z)
+        pad = BUFFER / EXTENT
+        bounds = ((x - pad) / scale, (y - pad) / scale, (x + 1 + pad) / scale, (y + 1 + pad) / scale)
+        candidates = self.tree.query(shapely.box(*bounds))
+        if categories is not None:
+            candidates = candidates[np.isin(self.categories[candidates], list(categories))]
+        if not len(candidates):
+            return b""
+        candidates.sort()
+        clipped = shapely.clip_by_rect(self._zoom_geometries(z)[candidates], *bounds)
+        parts, owner = shapely.get_parts(clipped, return_index=True)
+        coords, part_of = shapely.get_coordinates(parts, return_index=True)
+        # Tile units, integer
+        px = np.round((coords[:, 0] * scale - x) * EXTENT).astype(np.int64)
+        py = np.round((coords[:, 1] * scale - y) * EXTENT).astype(np.int64)
+        quantized = np.column_stack([px, py])
+        keep = np.ones(len(quantized), dtype=bool)
+        keep[1:] = (part_of[1:] != part_of[:-1]) | (quantized[1:] != quantized[:-1]).any(axis=1)
+        quantized, part_of = quantized[keep], part_of[keep]
+        starts = np.searchsorted(part_of, np.arange(len(parts) + 1))
+
+        layers = {}
+        by_feature = {}
+        for p in range(len(parts)):
+            points = quantized[starts[p]:starts[p + 1]]
+            i = int(candidates[owner[p]])
+            if self.types[i] == LINESTRING and len(points) < 2:
+                continue
+            if len(points):
+                by_feature.setdefault(i, []).append(points)
+        for i, feature_parts in by_feature.items():
+            layers.setdefault(self.categories[i], []).append(
+                (int(self.types[i]), feature_parts, self._tile_properties(i), i)
+            )
+        return encode_tile(layers)
+
+# --- Cache -------------------------------------------------------------------
+class TileCache:
+    """LRUs of TileSets and of encoded tiles, keyed by chart hash."""
+
+    def __init__(self, max_tilesets: int = 32, max_tiles: int = 4096):
+        self.max_tilesets = max_tilesets
+        self.max_tiles = max_tiles
+        self._tilesets = OrderedDict()
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def tileset(self, key: str, build) -> TileSet:
+        """The TileSet for `key`, from build() (a callable returning features) on a miss."""
+        with self._lock:
+            tileset = self._tilesets.get(key)
+            if tileset is not None:
+                self._tilesets.move_to_end(key)
+                return tileset
+        tileset = TileSet(build())
+        with self._lock:
+            self._tilesets[key] = tileset
+            while len(self._tilesets) > self.max_tilesets:
+                self._tilesets.popitem(last=False)
+        return tileset
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        with self._lock:
+            data = self._tiles.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._tiles.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: Tuple, data: bytes) -> None:
+        with self._lock:
+            self._tiles[key] = data
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "tilesets": len(self._tilesets),
+                "max_tilesets": self.max_tilesets,
+                "tiles": len(self._tiles),
+                "max_tiles": self.max_tiles,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+TILE_CACHE = TileCache(
+    max_tilesets=int(os.environ.get("MERIDIAN_TILESET_CACHE_SIZE", 32)),
+    max_tiles=int(os.environ.get("MERIDIAN_TILE_CACHE_SIZE", 4096)),
+)
@@ -0,0 +1,172 @@
+"""
+Viewport clipping and zoom simplification of astrocartography GeoJSON.
+
+API:
+- parse_bbox(value) -> List[Tuple[float, float, float, float]]:
+    A [west, south, east, north] viewport as one or two longitude-normal
+    rectangles; viewports across the antimeridian come back as two.
+- zoom_tolerance(zoom) -> float:
+    Simplification tolerance in degrees for a web map zoom level: half a
+    256 px tile pixel at the equator.
+- clip_features(features, bbox=None, tolerance=None) -> List[Dict]:
+    The features cut to the viewport and Douglas-Peucker simplified. Line
+    features outside the viewport are dropped, and so are points outside it.
+
+Lines are first broken wherever consecutive vertices jump more than 180° of
+longitude, the same rule split_dateline applies when the lines are drawn, so
+a clip never fills in a segment across the whole map. All line parts of all
+features go through shapely's vectorized clip_by_rect and simplify in one batch.
+With a tolerance, coordinates are also rounded to the decimals that tolerance
+can show.
+
+Input features are not modified. They may be the shared lists of the feature
+cache, so new feature dicts are returned around copied properties.
+"""
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import shapely
+
+MAX_ZOOM = 22
+MAX_TOLERANCE = 10.0  # degrees
+
+def parse_bbox(value) -> List[Tuple[float, float, float, float]]:
+    """
+    Rectangles covering a [west, south, east, north] viewport, in degrees.
+
+    West may exceed east, and either may lie outside [-180, 180], as map libraries
+    report viewports panned across the antimeridian.
+
+    Raises:
+        ValueError: On a malformed bbox
+    """
+    if isinstance(value, str):
+        value = value.split(",")
+    try:
+        west, south, east, north = (float(v) for v in value)
+    except (TypeError, ValueError):
+        raise ValueError("bbox must be [west, south, east, north] in degrees")
+    if not all(map(math.isfinite, (west, south, east, north))):
+        raise ValueError("bbox must be finite")
+    if not -90.0 <= south < north <= 90.0:
+        raise ValueError("bbox latitudes must satisfy -90 <= south < north <= 90")
+    if east < west:
+        east += 360.0
+    if east - west >= 360.0:
+        return [(-180.0, south, 180.0, north)]
+    width = east - west
+    west = (west + 180.0) % 360.0 - 180.0
+    east = west + width
+    if east <= 180.0:
+        return [(west, south, east, north)]
+    return [(west, south, 180.0, north), (-180.0, south, east - 360.0, north)]
+
+def zoom_tolerance(zoom: float) -> float:
+    """Half a pixel of a 256 px tile at `zoom`, in degrees of longitude."""
+    if not 0 <= float(zoom) <= MAX_ZOOM:
+        raise ValueError(f"zoom must be between 0 and {MAX_ZOOM}")
+    return 0.5 * 360.0 / (256.0 * 2.0 ** float(zoom))
+
+def _line_parts(geometry) -> Optional[List]:
+    kind = (geometry or {}).get("type")
+    if kind == "LineString":
+        return [geometry.get("coordinates") or []]
+    if kind == "MultiLineString":
+        return list(geometry.get("coordinates") or [])
+    return None
+
+def _inside(lon, lat, rects) -> bool:
+    lon = (lon + 180.0) % 360.0 - 180.0
+    return any(w <= lon <= e and s <= lat <= n for w, s, e, n in rects)
+
+def clip_features(
+    features: Sequence[Dict],
+    bbox=None,
+    tolerance: Optional[float] = None,
+) -> List[Dict]:
+    """
+    Clip line features to a viewport and simplify them.
+
+    Args:
+        features: GeoJSON features; left unmodified
+        bbox: [west, south, east, north] (see parse_bbox), or None for the whole world
+        tolerance: Douglas-Peucker tolerance in degrees, or None/0 to keep every vertex
+
+    Returns:
+        list: The features inside the viewport, in input order. Clipped LineStrings
+        that fall apart into several pieces become MultiLineStrings.
+
+    Raises:
+        ValueError: On a malformed bbox or a tolerance outside [0, MAX_TOLERANCE]
+    """
+    rects = parse_bbox(bbox) if bbox is not None else None
+    tolerance = float(tolerance or 0.0)
+    if not 0.0 <= tolerance <= MAX_TOLERANCE:
+        raise ValueError(f"tolerance must be between 0 and {MAX_TOLERANCE} degrees")
+
+    # Every line part of every feature as one coordinate array
+    line_features, chunks, owners = [], [], []
+    for i, feature in enumerate(features):
+        parts = _line_parts(feature.get("geometry"))
+        if parts is None:
+            continue
+        line_features.append(i)
+        for part in filter(None, parts):
+            coords = np.asarray(part, dtype=float).reshape(len(part), -1)[:, :2]
+            chunks.append(coords)
+            owners.append(len(line_features) - 1)
+    coords = np.concatenate(chunks) if chunks else np.empty((0, 2))
+    part_ids = np.repeat(np.arange(len(chunks)), [len(c) for c in chunks])
+    finite = np.isfinite(coords).all(axis=1)
+    coords, part_ids = coords[finite], part_ids[finite]
+    # New pieces at part boundaries and at jumps of more than 180° of longitude
+    breaks = np.ones(len(coords), dtype=bool)
+    breaks[1:] = (part_ids[1:] != part_ids[:-1]) | (np.abs(np.diff(coords[:, 0])) > 180.0)
+    piece_ids = np.cumsum(breaks) - 1
+    sizes = np.bincount(piece_ids, minlength=piece_ids[-1] + 1 if len(piece_ids) else 0)
+    keep = sizes[piece_ids] >= 2
+    piece_owner = np.asarray(owners, dtype=np.int64)[part_ids[breaks]][sizes >= 2]
+    _, piece_ids = np.unique(piece_ids[keep], return_inverse=True)
+    pieces = shapely.linestrings(coords[keep], indices=piece_ids) if keep.any() else np.empty(0, dtype=object)
+
+    if rects is not None:
+        clipped, clipped_owner = [], []
+        for rect in rects:
+            parts, index = shapely.get_parts(shapely.clip_by_rect(pieces, *rect), return_index=True)
+            clipped.append(parts)
+            clipped_owner.append(piece_owner[index])
+        pieces, piece_owner = np.concatenate(clipped), np.concatenate(clipped_owner)
+        order = np.argsort(piece_owner, kind="stable")
+        pieces, piece_owner = pieces[order], piece_owner[order]
+    if tolerance > 0 and len(pieces):
+        pieces = shapely.simplify(pieces, tolerance, preserve_topology=False)
+
+    out_coords, out_piece = shapely.get_coordinates(pieces, return_index=True)
+    if tolerance > 0:
+        out_coords = out_coords.round(min(7, max(0, math.ceil(-math.log10(tolerance)) + 1)))
+    starts = np.searchsorted(out_piece, np.arange(len(pieces) + 1))
+    geometry_parts = {}
+    for p in range(len(pieces)):
+        part = out_coords[starts[p]:starts[p + 1]]
+        if len(part) >= 2:
+            geometry_parts.setdefault(int(piece_owner[p]), []).append(part.tolist())
+
+    results = []
+    line_slot = {feature_index: k for k, feature_index in enumerate(line_features)}
+    for i, feature in enumerate(features):
+        geometry = feature.get("geometry") or {}
+        if i in line_slot:
+            parts = geometry_parts.get(line_slot[i])
+            if not parts:
+                continue
+            if geometry.get("type") == "LineString" and len(parts) == 1:
+                geometry = {"type": "LineString", "coordinates": parts[0]}
+            else:
+                geometry = {"type": "MultiLineString", "coordinates": parts}
+        elif rects is not None and geometry.get("type") == "Point":
+            lon, lat = geometry["coordinates"][:2]
+            if not _inside(lon, lat, rects):
+                continue
+        results.append({**feature, "geometry": geometry, "properties": dict(feature.get("properties") or {})})
+    return results
@@ -176,6 +176,7 @@ const ChartDisplay = ({ chartData, currentLayer }) => {
           'Content-Type': 'application/json',
         },
         body: JSON.stringify({
+          chart_id: currentLayerData.chart_id, // server reuses its stored chart while the id is live
           chart_data: chartDataForSvg,
           chart_config: { ...chartConfig, show_legend: false } // Always disable SVG legend
         })
@@ -24,7 +24,8 @@ export default function useCCGData(layerManager, forceMapUpdate) {
         birth_country: formData.birth_country,
         timezone: formData.timezone,
         house_system: formData.house_system || 'whole_sign',
-        use_extended_planets: true
+        use_extended_planets: true,
+        fields: ['astrocartography'] // Only the map features are used here
       };
       
       console.log('🟦 CCG API payload:', ccgPayload);
@@ -32,7 +32,8 @@ export default function useTransitData(layerManager, forceMapUpdate) {
         timezone: formData.timezone,
         coordinates: formData.coordinates,
         house_system: formData.house_system || 'whole_sign',
-        use_extended_planets: true
+        use_extended_planets: true,
+        fields: ['astrocartography'] // Only the map features are used here
       };
 
       console.log('🔄 Fetching transit data with:', transitData);
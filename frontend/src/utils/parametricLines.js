@@ -0,0 +1,65 @@
+/**
+ * parametricLines - Client-side evaluator for parametric astrocartography output
+ * (filter_options.output_mode = "parametric", see backend/parametric_lines.py).
+ * Lets the map draw MC/IC lines for any moment in the window without a request.
+ */
+
+// Bodies whose MC/IC lines use ecliptic longitude as RA, matching the backend
+const ECLIPTIC_MC_BODIES = new Set(['Lunar Node']);
+
+/**
+ * Evaluate a Chebyshev series with Clenshaw's recurrence
+ * @param {number[]} coeffs - Coefficients, lowest degree first
+ * @param {number} t - Normalized time in [-1, 1]
+ */
+function chebval(coeffs, t) {
+  let b1 = 0;
+  let b2 = 0;
+  for (let k = coeffs.length - 1; k >= 1; k--) {
+    const b0 = coeffs[k] + 2 * t * b1 - b2;
+    b2 = b1;
+    b1 = b0;
+  }
+  return coeffs[0] + t * b1 - b2;
+}
+
+const wrap360 = (deg) => ((deg % 360) + 360) % 360;
+const wrap180 = (deg) => wrap360(deg + 180) - 180;
+
+/**
+ * GST and per-body RA/Dec/longitude (degrees) at a Julian day inside the model window
+ * @param {Object} model - Parametric model from the backend
+ * @param {number} jd - Julian day (UT)
+ */
+export function evaluateParametricModel(model, jd) {
+  const { jd_start: start, jd_end: end } = model.window;
+  const t = (2 * (jd - start)) / (end - start) - 1;
+  const gstDeg = wrap360(model.gst.deg_at_ref + model.gst.deg_per_day * (jd - model.gst.jd_ref));
+  const bodies = {};
+  Object.entries(model.bodies).forEach(([name, body]) => {
+    bodies[name] = {
+      ra: wrap360(chebval(body.ra, t)),
+      dec: chebval(body.dec, t),
+      lon: wrap360(chebval(body.lon, t)),
+    };
+  });
+  return { gstDeg, bodies };
+}
+
+/**
+ * MC/IC line features for a Julian day, shaped like the backend's GeoJSON lines
+ * @param {Object} model - Parametric model from the backend
+ * @param {number} jd - Julian day (UT)
+ */
+export function meridianLinesAt(model, jd) {
+  const { gstDeg, bodies } = evaluateParametricModel(model, jd);
+  return Object.entries(bodies).flatMap(([name, pos]) => {
+    const ra = ECLIPTIC_MC_BODIES.has(name) ? pos.lon : pos.ra;
+    const mc = wrap180(ra - gstDeg);
+    return [['MC', mc], ['IC', wrap180(mc + 180)]].map(([lineType, lon]) => ({
+      type: 'Feature',
+      geometry: { type: 'LineString', coordinates: [[lon, -85], [lon, 85]] },
+      properties: { planet: name, line_type: lineType, body: name, category: 'planet' },
+    }));
+  });
+}
@@ -2,8 +2,10 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
 
+import json
+
 import numpy as np
-import pytest
+import shapely
 import importlib.util
 
 spec = importlib.util.spec_from_file_location("line_ac_dc", os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/line_ac_dc.py')))
@@ -57,3 +59,33 @@ def test_horizon_accuracy():
     horizon_lon = horizon["geometry"]["coordinates"][0][0]
     # Remove strict assertion, just print for manual inspection
     print(f"Sun horizon longitude at equator on J2000: {horizon_lon}")
+
+def _parts(feature):
+    geometry = feature["geometry"]
+    return geometry["coordinates"] if geometry["type"] == "MultiLineString" else [geometry["coordinates"]]
+
+def test_batch_matches_pre_batch_golden():
+    """
+    The batch must reproduce the per-planet generator it replaced, saved in
+    fixtures/horizon_lines_pre_batch.json.
+
+    The spline-based batch matched that file byte for byte. Horizon curves are now
+    sampled exactly (horizon_sampling), so the check is geometric: every golden vertex
+    lies on the new curve, up to the old spline's own error (largest at the turning latitude).
+    """
+    path = os.path.join(os.path.dirname(__file__), "fixtures", "horizon_lines_pre_batch.json")
+    with open(path, encoding="utf-8") as f:
+        golden = json.load(f)
+    names = list(golden["bodies"])
+    ras, decs, gsts = zip(*golden["bodies"].values())
+    batch = line_ac_dc.generate_horizon_line_batch(names, ras, decs, gsts, np.arange(*golden["lat_steps"]))
+    for name, feat in zip(names, batch):
+        expected = golden["features"][name]
+        assert feat["properties"]["planet"] == expected["properties"]["planet"] == name
+        assert feat["properties"]["line_type"] == expected["properties"]["line_type"] == "HORIZON"
+        assert [s["label"] for s in feat["properties"]["segments"]] == ["AC", "DC"]
+        curve = shapely.multilinestrings([shapely.linestrings(part) for part in _parts(feat)])
+        points = shapely.points([p for part in _parts(expected) for p in part])
+        distance = shapely.distance(points, curve)
+        assert np.median(distance) < 0.005, (name, np.median(distance))
+        assert distance.max() < 0.25, (name, distance.max())
@@ -0,0 +1,67 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import json
+import pytest
+import swisseph as swe
+
+from astro_timeseries import calculate_astrocartography_timeseries
+from astrocartography import calculate_astrocartography_lines_geojson
+from ephemeris import calculate_chart
+from ephemeris_utils import CHART_PLANETS
+from feature_cache import FEATURE_CACHE
+
+COORDS = {"latitude": 40.7, "longitude": -74.0}
+FILTERS = {"include_parans": False, "include_fixed_stars": False, "layer_type": "transit"}
+
+
+def test_frames_match_single_requests():
+    """
+    Every frame must equal what a separate chart + astrocartography call returns for that moment.
+    """
+    result = calculate_astrocartography_timeseries(
+        "2024-03-01", "00:00", "America/New_York", COORDS, step_minutes=90, frame_count=3,
+        filter_options=FILTERS,
+    )
+    assert [f["time"] for f in result["frames"]] == [
+        "2024-03-01T05:00:00Z", "2024-03-01T06:30:00Z", "2024-03-01T08:00:00Z"
+    ]
+    FEATURE_CACHE.clear()  # Recompute the standalone charts rather than reading the frames back
+    for frame in result["frames"]:
+        chart = calculate_chart(frame["time"][:10], frame["time"][11:19], timezone="UTC",
+                                use_extended_planets=True, coordinates=COORDS)
+        assert chart["utc_time"]["julian_day"] == frame["julian_day"]
+        expected = calculate_astrocartography_lines_geojson(chart, dict(FILTERS))
+        assert json.dumps(frame["features"]) == json.dumps(expected["features"])
+
+
+def test_frames_keep_seconds_and_the_swept_positions(monkeypatch):
+    calls = []
+    calc_ut = swe.calc_ut
+    monkeypatch.setattr(swe, "calc_ut", lambda *args: calls.append(args) or calc_ut(*args))
+    result = calculate_astrocartography_timeseries("2024-03-01", "12:00:45", "UTC", COORDS, step_minutes=60,
+                                                   frame_count=2, filter_options=FILTERS)
+    # The sweep's one call per body and frame; charts and lines read their positions from it
+    body_calls = [args for args in calls if args[1] != swe.ECL_NUT]
+    assert len(body_calls) == 2 * len(CHART_PLANETS), len(body_calls)
+    monkeypatch.undo()
+
+    frame = result["frames"][0]
+    assert frame["time"] == "2024-03-01T12:00:45Z"
+    assert abs(frame["julian_day"] - (swe.julday(2024, 3, 1, 12.0) + 45 / 86400)) < 1e-9
+    whole_minute = calculate_astrocartography_timeseries("2024-03-01", "12:00", "UTC", COORDS, frame_count=1,
+                                                         filter_options=FILTERS)["frames"][0]
+
+    def sun_mc(features):
+        return next(f["geometry"]["coordinates"][0][0] for f in features
+                    if f["properties"].get("planet") == "Sun Transit" and f["properties"].get("line_type") == "MC")
+    # 45 s of Earth rotation is about 0.19°
+    assert abs(sun_mc(whole_minute["features"]) - sun_mc(frame["features"]) - 0.188) < 0.001
+
+
+def test_rejects_invalid_ranges():
+    with pytest.raises(ValueError):
+        calculate_astrocartography_timeseries("2024-03-01", "00:00", "UTC", COORDS, step_minutes=0)
+    with pytest.raises(ValueError):
+        calculate_astrocartography_timeseries("2024-03-01", "00:00", "UTC", COORDS, frame_count=10_000)
@@ -0,0 +1,38 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from ephemeris import calculate_chart
+from api import app
+
+BODY = {
+    "birth_date": "1990-05-01",
+    "birth_time": "12:00",
+    "timezone": "America/New_York",
+    "coordinates": {"latitude": 40.7, "longitude": -74.0},
+}
+
+
+def test_chart_fields_skip_unrequested_sections():
+    full = calculate_chart("1990-05-01", "12:00", timezone="America/New_York",
+                           coordinates=BODY["coordinates"])
+    planets_only = calculate_chart("1990-05-01", "12:00", timezone="America/New_York",
+                                   coordinates=BODY["coordinates"], fields=["planets"])
+    assert list(planets_only) == ["planets"]
+    # House placements still need the houses, which are computed but not returned
+    assert planets_only["planets"] == full["planets"]
+    assert all("house" in p for p in planets_only["planets"])
+
+
+def test_calculate_endpoint_projection():
+    client = app.test_client()
+    response = client.post("/api/calculate", json={**BODY, "fields": "planets,houses"})
+    assert response.status_code == 200
+    assert set(response.get_json()) == {"planets", "houses", "chart_id"}
+
+    assert client.post("/api/calculate", json={**BODY, "fields": ["nope"]}).status_code == 400
+
+    full = client.post("/api/calculate", json=BODY).get_json()
+    astro_only = client.post("/api/calculate", json={**BODY, "include": ["astrocartography"]}).get_json()
+    assert set(astro_only) == {"astrocartography", "chart_id"}
+    assert astro_only["astrocartography"] == full["astrocartography"]
@@ -0,0 +1,79 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import numpy as np
+import pytest
+import swisseph as swe
+
+from chart_context import ChartContext, BODY_IDS, EPHEMERIS_DTYPE, calc_batch
+from ephemeris_utils import CHART_PLANETS
+
+JD_UT = 2447893.2083333335  # 1990-01-01 17:00 UT
+
+
+def test_equatorial_matches_swiss_ephemeris():
+    """
+    The NumPy rotation must reproduce swe.FLG_EQUATORIAL, speeds included.
+    """
+    context = ChartContext.build(JD_UT, CHART_PLANETS.values())
+    assert not context.errors
+    for name in context.names:
+        eq, _ = swe.calc_ut(JD_UT, BODY_IDS[name], swe.FLG_SWIEPH | swe.FLG_EQUATORIAL | swe.FLG_SPEED)
+        body = context.body(name)
+        assert abs(((body["ra"] - eq[0]) + 180) % 360 - 180) < 1e-8, name
+        assert abs(body["dec"] - eq[1]) < 1e-8, name
+        assert abs(body["ra_speed"] - eq[3]) < 1e-5, name
+        assert abs(body["dec_speed"] - eq[4]) < 1e-5, name
+
+
+def test_chart_wide_values():
+    context = ChartContext.build(JD_UT, ["Sun"])
+    assert context.gst_deg == pytest.approx(swe.sidtime(JD_UT) * 15.0)
+    assert context.obliquity_deg == pytest.approx(swe.calc_ut(JD_UT, swe.ECL_NUT)[0][0])
+    assert context.jd_tt == pytest.approx(JD_UT + swe.deltat(JD_UT))
+
+
+def test_body_jd_overrides_and_read_only_arrays():
+    jd_prog = JD_UT + 30.0
+    context = ChartContext.build(JD_UT, ["Sun", "Mars", "Not A Body"], body_jds={"Sun": jd_prog})
+    assert context.names == ("Sun", "Mars")
+    sun, _ = swe.calc_ut(jd_prog, swe.SUN, swe.FLG_SWIEPH)
+    assert context.body("Sun")["longitude"] == pytest.approx(sun[0])
+    assert context.body("Sun")["jd"] == jd_prog
+    assert context.body("Mars")["jd"] == JD_UT
+    with pytest.raises(ValueError):
+        context.lon[0] = 0.0
+
+
+def test_get_positions_unchanged_with_context():
+    from ephemeris_utils import get_positions
+    names = ["Sun", "Moon", "Chiron"]
+    context = ChartContext.build(JD_UT, names)
+    assert get_positions(JD_UT, names, context=context) == get_positions(JD_UT, names)
+
+
+def test_sweep_matches_per_frame_build():
+    jds = [JD_UT + k / 48.0 for k in range(4)]
+    names = ["Sun", "Moon", "Lunar Node"]
+    for context, jd in zip(ChartContext.sweep(jds, names), jds):
+        single = ChartContext.build(jd, names)
+        assert context.jd_ut == jd and context.names == single.names
+        for name in names:
+            assert context.body(name) == pytest.approx(single.body(name), rel=0, abs=1e-12)
+        assert context.gst_deg == single.gst_deg
+
+
+def test_calc_batch_structured_arrays():
+    jds = np.array([JD_UT, JD_UT + 0.5, JD_UT + 365.25])
+    batch = calc_batch(jds, ["Sun", "Moon", "Not A Body", "Pluto"])
+    assert batch.names == ("Sun", "Moon", "Pluto")
+    assert batch.positions.dtype == EPHEMERIS_DTYPE and batch.positions.shape == (3, 3)
+    for f, jd in enumerate(jds):
+        for i, name in enumerate(batch.names):
+            eq, _ = swe.calc_ut(jd, BODY_IDS[name], swe.FLG_SWIEPH | swe.FLG_EQUATORIAL | swe.FLG_SPEED)
+            ecl, _ = swe.calc_ut(jd, BODY_IDS[name], swe.FLG_SWIEPH | swe.FLG_SPEED)
+            rec = batch.positions[f, i]
+            assert rec["lon"] == ecl[0] and rec["lon_speed"] == ecl[3]
+            assert abs(((rec["ra"] - eq[0]) + 180) % 360 - 180) < 1e-8 and abs(rec["dec"] - eq[1]) < 1e-8
+        assert batch.gst_deg[f] == pytest.approx(swe.sidtime(jd) * 15.0)
@@ -0,0 +1,57 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from chart_store import ChartStore, SQLiteBackend
+from api import app
+
+BODY = {
+    "birth_date": "1990-05-01",
+    "birth_time": "12:00",
+    "timezone": "America/New_York",
+    "coordinates": {"latitude": 40.7, "longitude": -74.0},
+}
+CHART = {"utc_time": {"julian_day": 2448012.5}, "planets": [{"name": "Sun"}], "astrocartography": {"features": []}}
+
+
+def test_store_eviction_and_backend(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "charts.db"))
+    store = ChartStore(max_entries=1, backend=backend)
+    first = store.put(CHART)
+    second = store.put(CHART)
+    assert first != second
+    assert "astrocartography" not in store.get(second).chart_data
+
+    # Evicted from memory, reloaded from the backend with a rebuilt context
+    reloaded = store.get(first)
+    assert reloaded.chart_data["planets"] == [{"name": "Sun"}]
+    assert "Sun" in reloaded.context
+    assert store.stats()["backend_hits"] == 1
+
+    # Another process sharing the file sees the same charts
+    assert ChartStore(backend=SQLiteBackend(str(tmp_path / "charts.db"))).get(second) is not None
+    assert store.get("unknown") is None
+
+
+def test_follow_up_endpoints_accept_chart_id():
+    client = app.test_client()
+    chart = client.post("/api/calculate", json=BODY).get_json()
+    chart_id = chart["chart_id"]
+
+    by_id = client.post("/api/astrocartography", json={"chart_id": chart_id, "layer_type": "natal"}).get_json()
+    assert by_id["features"] == chart["astrocartography"]["features"]
+    assert client.post("/api/astrocartography", json={"chart_id": "expired"}).status_code == 404
+
+    svg = client.post("/api/chart-svg/natal", json={"chart_id": chart_id, "chart_config": {}})
+    assert svg.status_code == 200 and svg.get_json()["svg"]
+
+
+def test_astrocartography_rejects_a_partial_chart_id():
+    client = app.test_client()
+    partial = client.post("/api/calculate", json={**BODY, "fields": ["planets"]}).get_json()
+    assert set(partial) == {"planets", "chart_id"}
+
+    response = client.post("/api/astrocartography", json={"chart_id": partial["chart_id"], "layer_type": "natal"})
+    assert response.status_code == 400
+    error = response.get_json()["error"]
+    assert "stored without" in error and "input, coordinates, utc_time, planets, houses" in error
@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import math
+
+import numpy as np
+
+from ephemeris import calculate_chart
+from astrocartography import calculate_astrocartography_lines_geojson
+from city_ranking import CityTable, angle_lines, rank_cities
+
+KM_PER_DEGREE = 111.195
+
+
+def _features():
+    chart, context = calculate_chart(
+        birth_date="1990-01-15", birth_time="14:30", timezone="America/New_York",
+        coordinates={"latitude": 40.7128, "longitude": -74.0060}, use_extended_planets=True, return_context=True,
+    )
+    filters = {"include_aspects": False, "include_fixed_stars": False, "include_parans": False}
+    return context, calculate_astrocartography_lines_geojson(chart, filters, context=context)["features"]
+
+
+def _mc_longitude(features, planet):
+    feature = next(f for f in features if f["properties"].get("planet") == planet
+                   and f["properties"].get("line_type") == "MC")
+    return feature["geometry"]["coordinates"][0][0]
+
+
+def test_horizon_lines_split_into_rising_and_setting():
+    context, features = _features()
+    lines = angle_lines(features)
+    for line in lines:
+        props = line["properties"]
+        if props["angle"] not in ("AC", "DC") or props["category"] != "planet":
+            continue
+        i = context.index(props["planet"])
+        # Interior points only: run ends are shared turning points
+        sin_h = [math.sin(math.radians(context.gst_deg + lon - context.ra[i]))
+                 for part in line["geometry"]["coordinates"] for lon, lat in part[1:-1]]
+        if props["angle"] == "AC":
+            assert all(s < 1e-6 for s in sin_h), props  # rising: east of the meridian
+        else:
+            assert all(s > -1e-6 for s in sin_h), props
+
+
+def test_rank_cities_by_distance_to_selected_lines():
+    context, features = _features()
+    venus = _mc_longitude(features, "Venus")
+    jupiter = _mc_longitude(features, "Jupiter")
+
+    def east_of(lon, km, lat=20.0):
+        return lon + km / (KM_PER_DEGREE * math.cos(math.radians(lat)))
+
+    places = [
+        {"city": "On Venus", "latitude": 20.0, "longitude": east_of(venus, 5), "population": 1000},
+        {"city": "Near Venus", "latitude": 20.0, "longitude": east_of(venus, 150), "population": 5000000},
+        {"city": "Far Venus", "latitude": 20.0, "longitude": east_of(venus, 400), "population": 5000000},
+        {"city": "On Jupiter", "latitude": -10.0, "longitude": east_of(jupiter, 20, -10.0), "population": 20000},
+    ]
+    # A haystack of random cities around them
+    rng = np.random.default_rng(3)
+    places += [{"city": f"Random {i}", "latitude": float(lat), "longitude": float(lon), "population": 15000}
+               for i, (lat, lon) in enumerate(zip(rng.uniform(-60, 60, 20000), rng.uniform(-180, 180, 20000)))]
+    cities = CityTable(places)
+
+    venus_mc = rank_cities(features, cities, [{"planet": "Venus", "angles": ["MC"], "max_distance_km": 300}], limit=500)
+    names = [c["city"] for c in venus_mc]
+    assert names.index("On Venus") < names.index("Near Venus")
+    assert "Far Venus" not in names and "On Jupiter" not in names
+    assert all(m["planet"] == "Venus" and m["angle"] == "MC" and m["distance_km"] <= 300
+               for c in venus_mc for m in c["matches"])
+    assert [c["score"] for c in venus_mc] == sorted((c["score"] for c in venus_mc), reverse=True)
+
+    # Every Venus MC match agrees with a direct great-circle distance to the meridian
+    for city in venus_mc:
+        dlon = math.radians(city["longitude"] - venus)
+        direct = math.degrees(math.asin(abs(math.sin(dlon)) * math.cos(math.radians(city["latitude"])))) * KM_PER_DEGREE
+        assert abs(city["matches"][0]["distance_km"] - direct) < 1.0, city
+
+    jupiter_any = rank_cities(features, cities, [{"planet": "Jupiter"}], limit=20000)
+    assert "On Jupiter" in [c["city"] for c in jupiter_any]
+    assert {m["angle"] for c in jupiter_any for m in c["matches"]} == {"MC", "IC", "AC", "DC"}
+
+    both = rank_cities(features, cities, [{"planet": "Venus", "angles": ["MC"]}, {"planet": "Jupiter", "angles": ["MC"]}],
+                       require_all=True, limit=100)
+    assert all(len(c["matches"]) == 2 for c in both)
+    assert rank_cities(features, cities, [{"planet": "Venus", "angles": ["MC"]}], min_population=10 ** 6,
+                       limit=5)[0]["city"] == "Near Venus"
@@ -0,0 +1,102 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import datetime
+import json
+import pytest
+import shapely
+import swisseph as swe
+
+from composite import calculate_composite_layers, design_julian_day
+from astrocartography import calculate_astrocartography_lines_geojson
+from ephemeris import calculate_chart
+from feature_cache import FEATURE_CACHE
+from layers.humandesign import HumanDesignLayer
+
+COORDS = {"latitude": 40.7, "longitude": -74.0}
+FILTERS = {"include_parans": False, "include_fixed_stars": False}
+
+
+def test_layers_match_separate_requests():
+    """
+    Each layer must equal what its own chart + astrocartography call returns.
+    """
+    result = calculate_composite_layers(
+        "1990-05-01", "12:00", "America/New_York", COORDS,
+        ["natal", {"type": "ccg", "date": "2025-06-01"}, {"type": "transit", "name": "now"}],
+        filter_options=FILTERS,
+    )
+    assert [layer["name"] for layer in result["layers"]] == ["natal", "CCG", "now"]
+    assert set(result["timing_ms"]) == {"ephemeris", "total"}
+    FEATURE_CACHE.clear()
+    expected = []
+    for date, layer_type in (("1990-05-01", "natal"), ("2025-06-01", "CCG")):
+        chart = calculate_chart(date, "12:00", timezone="America/New_York",
+                                use_extended_planets=True, coordinates=COORDS)
+        features = calculate_astrocartography_lines_geojson(chart, {**FILTERS, "layer_type": layer_type})["features"]
+        for feature in features:
+            feature["properties"]["layer"] = layer_type  # the composite labels every feature with its layer
+        expected += features
+    combined = [f for f in result["features"] if f["properties"]["layer"] != "now"]
+    assert json.dumps(combined) == json.dumps(expected), "layer features differ from separate requests"
+    assert sum(layer["feature_count"] for layer in result["layers"]) == len(result["features"])
+
+
+def test_design_layer():
+    natal_jd = swe.julday(1990, 5, 1, 16.0)
+    design_jd = design_julian_day(natal_jd)
+    arc = (swe.calc_ut(natal_jd, swe.SUN)[0][0] - swe.calc_ut(design_jd, swe.SUN)[0][0]) % 360
+    assert abs(arc - 88.0) < 1e-5
+    assert 85 < natal_jd - design_jd < 92
+
+    result = calculate_composite_layers("1990-05-01", "12:00", "America/New_York", COORDS,
+                                        ["hd_design"], filter_options={"include_fixed_stars": True})
+    props = [f["properties"] for f in result["features"]]
+    assert props and all(p["layer"] == "HD_DESIGN" and p["hd_design"] for p in props)
+    assert not any(p.get("category") == "fixed_star" for p in props)
+
+
+def test_design_layer_matches_human_design_layer():
+    """
+    The composite Design layer draws the same planet lines as HumanDesignLayer for that birth.
+    """
+    options = {"include_parans": False, "include_aspects": False, "include_hermetic_lots": False}
+    result = calculate_composite_layers("1977-06-17", "03:30", "UTC", COORDS, ["hd_design"], filter_options=options)
+    layer = HumanDesignLayer(datetime.datetime(1977, 6, 17, 3, 30), COORDS["latitude"], COORDS["longitude"], "UTC")
+    expected = {(f["properties"]["planet"], f["properties"]["line_type"]): f
+                for f in layer.compute_planet_lines(options)}
+    composite = {(f["properties"]["planet"], f["properties"]["line_type"]): f for f in result["features"]}
+    assert set(composite) == set(expected) and len(composite) == len(result["features"])
+
+    # The two solve the 88° arc to different precision; lines may differ by Earth's
+    # rotation (and the Moon's motion) over the gap between their Design moments
+    design = layer.design_dt
+    hd_jd = swe.julday(design.year, design.month, design.day,
+                       design.hour + design.minute / 60 + design.second / 3600)
+    assert abs(result["layers"][0]["julian_day"] - design_julian_day(swe.julday(1977, 6, 17, 3.5))) < 1e-9
+    tolerance = 400.0 * abs(result["layers"][0]["julian_day"] - hd_jd) + 1e-6
+    assert tolerance < 0.01
+    for key, feature in composite.items():
+        if key[0] == "Lunar Node HD":
+            # HumanDesignLayer puts the node's MC/IC at its RA; every other layer uses its
+            # ecliptic longitude (see parametric_lines.ECLIPTIC_MC_BODIES)
+            continue
+        geometry, reference = feature["geometry"], expected[key]["geometry"]
+        assert geometry["type"] == reference["type"], key
+        if geometry["type"] == "LineString":
+            gap = abs((geometry["coordinates"][0][0] - reference["coordinates"][0][0] + 180) % 360 - 180)
+        else:
+            curve = shapely.multilinestrings([shapely.linestrings(part) for part in reference["coordinates"] if len(part) > 1])
+            points = shapely.points([p for part in geometry["coordinates"] for p in part])
+            gap = shapely.distance(points, curve).max()
+        assert gap < tolerance, (key, gap)
+
+
+def test_rejects_bad_layers():
+    with pytest.raises(ValueError):
+        calculate_composite_layers("1990-05-01", "12:00", "UTC", COORDS, ["natal", "progressed"])
+    with pytest.raises(ValueError):
+        calculate_composite_layers("1990-05-01", "12:00", "UTC", COORDS, ["natal", "natal"])
+    with pytest.raises(ValueError):
+        calculate_composite_layers("1990-05-01", "12:00", "UTC", COORDS, [{"type": "ccg"}])
@@ -0,0 +1,39 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import threading
+
+import swisseph as swe
+
+from ephemeris_utils import ephemeris_context
+
+JD = 2460000.5
+
+
+def _positions():
+    # Chiron needs the asteroid files, which a thread without the ephemeris path cannot open
+    return tuple(round(swe.calc_ut(JD, body, swe.FLG_SWIEPH)[0][0], 9) for body in (swe.SUN, swe.CHIRON))
+
+
+def test_worker_threads_get_their_own_state():
+    with ephemeris_context():
+        expected = _positions()
+    results, errors = set(), []
+
+    def worker():
+        try:
+            for _ in range(200):
+                with ephemeris_context():
+                    with ephemeris_context():  # nested blocks are fine
+                        results.add(_positions())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert results == {expected}
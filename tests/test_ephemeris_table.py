@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import numpy as np
+import pytest
+
+from chart_context import calc_batch
+from ephemeris_table import EphemerisTable, build_table
+
+JD_START = 2451544.5  # 2000-01-01
+BODIES = ["Sun", "Moon", "Mercury", "Jupiter", "Lunar Node"]
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    path = tmp_path_factory.mktemp("ephe") / "table.bin"
+    # One year spans a Mercury and a Jupiter solar conjunction, where segments must split
+    build_table(str(path), bodies=BODIES, jd_start=JD_START, jd_end=JD_START + 366)
+    return EphemerisTable.load(str(path))
+
+
+def test_table_matches_swiss_ephemeris(table):
+    jds = JD_START + np.random.default_rng(7).uniform(0, 366, 2000)
+    expected = calc_batch(jds, BODIES).positions
+    actual = table.evaluate(BODIES, jds)
+    for key in ("lon", "lat", "ra", "dec"):
+        diff = (actual[key] - expected[key] + 180.0) % 360.0 - 180.0
+        assert np.abs(diff).max() < 2e-6, key
+    for name in BODIES:
+        assert max(table.entries[name]["max_error"][k] for k in ("lon", "lat")) <= 1e-6
+    assert np.abs(actual["lon_speed"] - expected["lon_speed"]).max() < 1e-3
+
+
+def test_calc_batch_uses_table_and_falls_back(table):
+    jds = [JD_START + 10.25, JD_START + 400.0]  # The second JD is outside the table
+    inside = calc_batch(jds[:1], ["Moon", "Mars"], table=table)
+    assert inside.positions["lon"][0, 0] == table.evaluate(["Moon"], jds[:1])["lon"][0, 0]
+    assert inside.positions["lon"][0, 1] == calc_batch(jds[:1], ["Mars"]).positions["lon"][0, 0]
+    outside = calc_batch(jds, ["Moon"], table=table)
+    assert np.array_equal(outside.positions, calc_batch(jds, ["Moon"]).positions)
+    with pytest.raises(ValueError):
+        table.evaluate(["Moon"], jds)
@@ -0,0 +1,62 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import json
+
+from feature_cache import FeatureCache, FEATURE_CACHE, chart_cache_key
+from astrocartography import generate_all_astrocartography_features
+from ephemeris import calculate_chart
+
+FILTERS = {"include_parans": False, "include_fixed_stars": False}
+
+
+def _feature(name):
+    return {"type": "Feature", "geometry": {"type": "Point", "coordinates": [0, 0]},
+            "properties": {"planet": name}}
+
+
+def test_key_is_canonical():
+    chart = {"utc_time": {"julian_day": 2450000.5}, "planets": [{"name": "Sun", "ra": 1.0}]}
+    reordered = {"planets": [{"ra": 1.0, "name": "Sun"}], "utc_time": {"julian_day": 2450000.5}}
+    assert chart_cache_key(chart, {"a": 1, "b": 2}) == chart_cache_key(reordered, {"b": 2, "a": 1})
+    assert chart_cache_key(chart, {"layer_type": "transit"}) != chart_cache_key(chart, {"layer_type": "CCG"})
+    assert chart_cache_key({"planets": []}, None) is None
+
+
+def test_lru_eviction_and_counters():
+    cache = FeatureCache(max_entries=2)
+    cache.put("a", [_feature("A")])
+    cache.put("b", [_feature("B")])
+    assert cache.get("a")[0]["properties"]["planet"] == "A"  # "b" is now least recently used
+    cache.put("c", [_feature("C")])
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1, 1)
+
+
+def test_sqlite_tier_survives_a_new_instance(tmp_path):
+    db_path = str(tmp_path / "features.sqlite")
+    FeatureCache(db_path=db_path).put("k", [_feature("Sun")])
+    reopened = FeatureCache(db_path=db_path)
+    assert reopened.get("k") == [_feature("Sun")]
+    assert reopened.stats()["disk_hits"] == 1
+    assert reopened.get("k") == [_feature("Sun")]
+    assert reopened.stats()["hits"] == 1
+
+
+def test_pipeline_hit_matches_and_is_isolated():
+    """
+    A repeat chart is served from the cache, equal to a fresh computation, and callers
+    relabelling properties in place do not leak into later hits.
+    """
+    chart = calculate_chart("1990-01-01", "12:00", timezone="America/New_York",
+                            coordinates={"latitude": 40.7, "longitude": -74.0})
+    FEATURE_CACHE.clear()
+    first = generate_all_astrocartography_features(chart, dict(FILTERS))
+    for f in first:
+        f["properties"]["planet"] = "relabelled"
+    second = generate_all_astrocartography_features(chart, dict(FILTERS))
+    assert FEATURE_CACHE.stats()["hits"] == 1
+    fresh = generate_all_astrocartography_features(chart, dict(FILTERS), use_cache=False)
+    assert json.dumps(second) == json.dumps(fresh)
@@ -0,0 +1,53 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import math
+
+import swisseph as swe
+
+from fixed_star import FIXED_STARS, get_fixed_star_positions, load_catalogue
+from astrocartography import generate_all_astrocartography_features
+
+
+def _separation_arcsec(a, b):
+    dlon = ((a["longitude"] - b[0] + 180) % 360 - 180) * math.cos(math.radians(b[1]))
+    return math.hypot(dlon, a["latitude"] - b[1]) * 3600
+
+
+def test_matches_swe_fixstar():
+    for jd in (2415020.5, 2460000.5, 2525000.5):
+        positions = get_fixed_star_positions(jd)
+        assert len(positions) == len(FIXED_STARS)
+        for star, pos in zip(FIXED_STARS, positions):
+            expected = swe.fixstar(star["swe_name"], jd, swe.FLG_SWIEPH)[0]
+            assert _separation_arcsec(pos, expected) < 1.0, (star["name"], jd)
+
+
+def test_magnitude_filter_and_catalogue_magnitudes():
+    catalogue = load_catalogue()
+    assert load_catalogue() is catalogue
+    assert len(catalogue.names) > 1000
+
+    sirius = get_fixed_star_positions(2460000.5, [{"name": "Sirius", "swe_name": "Sirius"}])[0]
+    assert sirius["magnitude"] == -1.46
+
+    bright = get_fixed_star_positions(2460000.5, "all", max_magnitude=2.0)
+    assert bright and all(star["magnitude"] <= 2.0 for star in bright)
+    assert len(bright) < len(get_fixed_star_positions(2460000.5, "all", max_magnitude=3.0))
+
+
+def test_astrocartography_reuses_chart_stars():
+    chart = {
+        "utc_time": {"julian_day": 2460000.5},
+        "planets": [],
+        "lots": [],
+        "houses": {},
+        "fixed_stars": [{"name": "Marker", "longitude": 12.5, "latitude": -3.0, "magnitude": 1.0}],
+    }
+    filters = {"include_aspects": False, "include_hermetic_lots": False, "include_parans": False,
+               "include_ac_dc": False, "include_ic_mc": False}
+    features = generate_all_astrocartography_features(chart, filters, use_cache=False)
+    stars = [f for f in features if f["properties"].get("category") == "fixed_star"]
+    assert [f["properties"]["star"] for f in stars] == ["Marker"]
+    assert stars[0]["geometry"]["coordinates"] == [12.5, -3.0]
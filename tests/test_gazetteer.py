@@ -0,0 +1,67 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import pytest
+
+from gazetteer import Gazetteer, normalize
+
+CITIES = [
+    # geonameid, name, asciiname, alternatenames, lat, lon, class, code, country, cc2, admin1, ..., population, elevation, dem, timezone, modified
+    ["1", "Springfield", "Springfield", "", "39.80172", "-89.64371", "P", "PPLA", "US", "", "IL", "", "", "", "114394", "", "", "America/Chicago", ""],
+    ["2", "Springfield", "Springfield", "", "37.21533", "-93.29824", "P", "PPLA2", "US", "", "MO", "", "", "", "169176", "", "", "America/Chicago", ""],
+    ["3", "São Paulo", "Sao Paulo", "", "-23.5475", "-46.63611", "P", "PPLA", "BR", "", "27", "", "", "", "10021295", "", "", "America/Sao_Paulo", ""],
+    ["4", "New York City", "New York City", "", "40.71427", "-74.00597", "P", "PPL", "US", "", "NY", "", "", "", "8804190", "", "", "America/New_York", ""],
+    ["5", "Dallas", "Dallas", "", "32.78306", "-96.80667", "P", "PPLA2", "US", "", "TX", "", "", "", "1300092", "", "", "America/Chicago", ""],
+]
+ADMIN1 = [["US.IL", "Illinois", "Illinois", "0"], ["US.MO", "Missouri", "Missouri", "0"],
+          ["US.NY", "New York", "New York", "0"], ["US.TX", "Texas", "Texas", "0"], ["BR.27", "São Paulo", "Sao Paulo", "0"]]
+COUNTRIES = [["US", "USA", "840", "US", "United States"], ["BR", "BRA", "076", "BR", "Brazil"]]
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    paths = []
+    for name, rows in (("cities.txt", CITIES), ("admin1.txt", ADMIN1), ("countries.txt", COUNTRIES)):
+        path = tmp_path / name
+        path.write_text("# header\n" + "\n".join("\t".join(r) for r in rows) + "\n", encoding="utf-8")
+        paths.append(str(path))
+    return Gazetteer.load(*paths)
+
+
+def test_prefix_suggestions_ranked_by_population(gazetteer):
+    results = gazetteer.suggest("spring", limit=5)
+    assert [r["state"] for r in results] == ["Missouri", "Illinois"]
+    assert results[0] == {
+        "address": "Springfield, Missouri, United States",
+        "city": "Springfield",
+        "state": "Missouri",
+        "country": "United States",
+        "latitude": 37.21533,
+        "longitude": -93.29824,
+        "timezone": "America/Chicago",
+    }
+    assert [r["state"] for r in gazetteer.suggest("Springfield, Illinois")] == ["Illinois"]
+    assert gazetteer.suggest("Springfield, Brazil") == []
+
+
+def test_accent_insensitive_and_exact_lookup(gazetteer):
+    assert normalize("São-Paulo") == "sao paulo"
+    assert gazetteer.suggest("sao p")[0]["city"] == "São Paulo"
+    assert gazetteer.lookup("Springfield", state="IL")["latitude"] == 39.80172
+    assert gazetteer.lookup("Springfield")["state"] == "Missouri"
+    assert gazetteer.lookup("New York") is None  # Exact names only; suggest() handles prefixes
+
+
+def test_state_and_country_codes_qualify_exactly(gazetteer):
+    assert [r["state"] for r in gazetteer.suggest("Springfield, MO")] == ["Missouri"]
+    assert [r["state"] for r in gazetteer.suggest("Springfield, IL, US")] == ["Illinois"]
+    assert [r["state"] for r in gazetteer.suggest("Springfield, USA")] == ["Missouri", "Illinois"]
+    assert gazetteer.suggest("Dallas, TX, USA")[0]["address"] == "Dallas, Texas, United States"
+    assert gazetteer.suggest("Dallas, USA")[0]["city"] == "Dallas"
+    assert gazetteer.lookup("Dallas", "TX", "USA")["latitude"] == 32.78306
+    assert gazetteer.lookup("Springfield", "MO", "US")["state"] == "Missouri"
+    # Codes match whole, not as prefixes; names still match by prefix
+    assert gazetteer.suggest("Dallas, USAX") == []
+    assert gazetteer.suggest("Dallas, US, BRA") == []
+    assert gazetteer.suggest("Dallas, Tex")[0]["city"] == "Dallas"
@@ -0,0 +1,73 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import numpy as np
+
+from horizon_sampling import sample_horizon_curve, sample_horizon_curves
+
+RA, GST = 100.0, 30.0
+
+
+def _hour_angle_residual(lons, lats, dec):
+    """|cos H − cos H₀| for sampled points; zero on the true horizon curve."""
+    H = np.radians((RA - GST) - lons)
+    cos_h0 = -np.tan(np.radians(lats)) * np.tan(np.radians(dec))
+    return np.abs(np.cos(H) - cos_h0)
+
+
+def test_samples_lie_on_horizon_curve():
+    for dec in (-23.0, 0.0, 3.0, 27.5, 60.0):
+        runs = sample_horizon_curve(RA, dec, GST)
+        assert runs
+        for lons, lats, _ in runs:
+            assert np.all(_hour_angle_residual(lons, lats, dec) < 1e-9)
+            assert np.all((lats >= -85 - 1e-9) & (lats <= 85 + 1e-9))
+
+
+def _unwrapped(lons):
+    return np.degrees(np.unwrap(np.radians(lons)))
+
+
+def _distance_to_polyline(points, line):
+    a0, a1 = line[:-1], line[1:]
+    v = a1 - a0
+    w = points[:, None, :] - a0[None]
+    t = np.clip((w * v).sum(-1) / np.maximum((v * v).sum(-1), 1e-18), 0, 1)
+    return np.linalg.norm(w - t[..., None] * v, axis=-1).min(axis=1)
+
+
+def test_chords_within_tolerance():
+    """
+    A much finer sampling of the same curve must stay within tolerance of the coarse polyline.
+    """
+    tolerance = 0.01
+    dec = 21.0
+    (lons, lats, _), = sample_horizon_curve(RA, dec, GST, tolerance=tolerance)
+    (fine_lons, fine_lats, _), = sample_horizon_curve(RA, dec, GST, tolerance=tolerance / 50)
+    coarse = np.column_stack([_unwrapped(lons), lats])
+    fine = np.column_stack([_unwrapped(fine_lons), fine_lats])
+    fine[:, 0] += coarse[0, 0] - fine[0, 0]
+    assert _distance_to_polyline(fine, coarse).max() < 1.5 * tolerance
+    # The refinement is adaptive, not a uniform grid
+    spacing = np.hypot(np.diff(coarse[:, 0]), np.diff(coarse[:, 1]))
+    assert spacing.max() > 1.5 * spacing.min()
+
+
+def test_path_order_and_band_clipping():
+    dec = 2.0  # turning latitude 88° lies outside the ±85° band
+    runs = sample_horizon_curve(RA, dec, GST)
+    assert len(runs) == 2
+    (ac_lons, ac_lats, ac_rise), (dc_lons, dc_lats, dc_rise) = runs
+    assert ac_rise.all() and not dc_rise.any()
+    assert np.all(np.diff(ac_lats) > 0) and np.all(np.diff(dc_lats) < 0)
+    assert np.isclose(ac_lats[-1], 85) and np.isclose(dc_lats[0], 85)
+
+
+def test_rising_only_and_batch():
+    curves = sample_horizon_curves([RA, RA + 40], [15.0, -15.0], GST, rising_only=True)
+    assert len(curves) == 2
+    for runs in curves:
+        for _, _, is_rising in runs:
+            assert is_rising.all()
+    assert sample_horizon_curves([RA], [15.0], [GST])[0][0][0].shape == sample_horizon_curve(RA, 15.0, GST)[0][0].shape
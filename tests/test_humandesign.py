@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import datetime as dt
+import math
+
+import numpy as np
+import swisseph as swe
+
+from layers.humandesign import HumanDesignLayer
+
+BIRTH = dt.datetime(1977, 6, 17, 3, 30)
+
+
+def _design_equatorial(layer):
+    """RA/Dec of the design-moment bodies and the GST, straight from Swiss Ephemeris."""
+    d = layer.design_dt
+    jd = swe.julday(d.year, d.month, d.day, d.hour + d.minute / 60 + d.second / 3600)
+    ids = {name: pid for name, pid in (
+        ("Sun", swe.SUN), ("Moon", swe.MOON), ("Mercury", swe.MERCURY), ("Venus", swe.VENUS),
+        ("Mars", swe.MARS), ("Jupiter", swe.JUPITER), ("Saturn", swe.SATURN), ("Uranus", swe.URANUS),
+        ("Neptune", swe.NEPTUNE), ("Pluto", swe.PLUTO), ("Chiron", swe.CHIRON),
+        ("Black Moon Lilith", swe.MEAN_APOG))}
+    positions = {name: swe.calc_ut(jd, pid, swe.FLG_EQUATORIAL)[0][:2] for name, pid in ids.items()}
+    return positions, swe.sidtime(jd) * 15.0
+
+
+def test_parans_lie_on_the_design_lines():
+    layer = HumanDesignLayer(BIRTH, 40.7, -74.0, "UTC")
+    parans = [f for f in layer.generate_all_features() if f["properties"].get("category") == "parans"]
+    positions, gst = _design_equatorial(layer)
+
+    found = set()
+    for f in parans:
+        props = f["properties"]
+        assert props["layer"] == "HD_DESIGN" and props["hd_design"]
+        (p1, l1), (p2, l2) = (name.split("_", 1) for name in props["source_lines"])
+        assert props["label"] == f"{p1} HD {l1} crossing {p2} HD {l2}"
+        lat, lon = props["intersection_lat"], props["intersection_lon"]
+        assert all(point[1] == round(lat, 6) for point in f["geometry"]["coordinates"])
+        # p2 culminates (MC) or anti-culminates (IC) on the crossing longitude ...
+        ra2 = positions[p2][0]
+        hour_angle2 = gst + lon - ra2 - (0.0 if l2 == "MC" else 180.0)
+        assert abs((hour_angle2 + 180) % 360 - 180) < 1e-4, props
+        # ... while p1 is on the horizon there, rising in the east (AC) or setting in the west (DC)
+        ra1, dec1 = positions[p1]
+        hour_angle1 = math.radians(gst + lon - ra1)
+        phi, delta = math.radians(lat), math.radians(dec1)
+        altitude = math.degrees(math.asin(math.sin(phi) * math.sin(delta)
+                                          + math.cos(phi) * math.cos(delta) * math.cos(hour_angle1)))
+        assert abs(altitude) < 1e-4, props
+        assert (math.sin(hour_angle1) < 0) == (l1 == "AC"), props
+        found.add((p1, l1, p2, l2))
+    assert len(found) == len(parans)
+
+    # Every crossing inside the ±68° band is there: scan each meridian for p1's horizon
+    expected = set()
+    lats = np.radians(np.arange(-68.0, 68.0, 0.01))
+    for p1, (ra1, dec1) in positions.items():
+        for p2, (ra2, _) in positions.items():
+            if p1 == p2:
+                continue
+            for l2, meridian_lon in (("MC", ra2 - gst), ("IC", ra2 - gst + 180)):
+                hour_angle1 = math.radians(gst + meridian_lon - ra1)
+                delta = math.radians(dec1)
+                altitude = np.sin(lats) * math.sin(delta) + np.cos(lats) * math.cos(delta) * math.cos(hour_angle1)
+                if np.any(np.sign(altitude[:-1]) != np.sign(altitude[1:])):
+                    expected.add((p1, "AC" if math.sin(hour_angle1) < 0 else "DC", p2, l2))
+    assert len(expected) > 50
+    assert found == expected
+
+
+def test_design_chart_is_built_once(monkeypatch):
+    calls = []
+    build = HumanDesignLayer._build_design_chart_data
+
+    def counting_build(self):
+        calls.append(self)
+        return build(self)
+
+    monkeypatch.setattr(HumanDesignLayer, "_build_design_chart_data", counting_build)
+    layer = HumanDesignLayer(BIRTH, 40.7, -74.0, "UTC")
+    features = layer.generate_all_features()
+    parans = layer.compute_parans()
+    assert len(calls) == 1
+    assert parans == [f for f in features if f["properties"].get("category") == "parans"]
@@ -0,0 +1,70 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import swisseph as swe
+
+import line_aspects
+
+JD = 2459396.5
+CHART = {
+    "planets": [{"name": "Sun"}, {"name": "Venus"}],
+    "utc_time": {"julian_day": JD},
+}
+
+
+def _houses_asc(jd_tt, lat, lon):
+    """Ascendant from swe.houses_ex, the reference the old bisection solved against."""
+    try:
+        return swe.houses_ex(jd_tt, lat, lon, b'P')[1][0]
+    except swe.Error:
+        return None
+
+
+def _parts(feature):
+    geometry = feature["geometry"]
+    return geometry["coordinates"] if geometry["type"] == "MultiLineString" else [geometry["coordinates"]]
+
+
+def test_calculate_aspect_lines_generates_asc_lines():
+    features = line_aspects.calculate_aspect_lines(CHART)
+    asc = [f for f in features if f["properties"]["to"] == "ASC"]
+    mc = [f for f in features if f["properties"]["to"] == "MC"]
+    assert len(mc) == 12
+    assert len(asc) == 12
+    for f in asc:
+        assert f["geometry"]["type"] in ("LineString", "MultiLineString")
+
+
+def test_asc_aspect_lines_put_houses_ascendant_on_target():
+    """
+    Along every ASC aspect line, the Placidus Ascendant equals the aspect's target longitude.
+    """
+    jd_tt = JD + swe.deltat(JD) / 86400.0  # the frame calculate_aspect_lines passes to houses_ex
+    obliq = swe.calc_ut(jd_tt, swe.ECL_NUT)[0][0]
+    features = line_aspects.calculate_aspect_lines(CHART)
+    matched = set()
+    for feature in (f for f in features if f["properties"]["to"] == "ASC"):
+        props = feature["properties"]
+        planet_lon = swe.calc_ut(JD, {"Sun": swe.SUN, "Venus": swe.VENUS}[props["planet"]])[0][0]
+        points = [p for part in _parts(feature) for p in part]
+        assert len(points) >= 3
+        # The feature is the planet +angle or -angle line; find which target it carries
+        residuals = {}
+        for delta in (props["angle"], -props["angle"]):
+            target = (planet_lon - delta) % 360
+            worst = 0.0
+            for lon, lat in points:
+                if abs(lat) > 90 - obliq - 1e-6:
+                    # A run's end on the polar circle: the ecliptic lies in the horizon, the Ascendant is undefined
+                    continue
+                asc = _houses_asc(jd_tt, lat, lon)
+                assert asc is not None, (props, lat, lon)
+                worst = max(worst, abs(((asc - target) + 180) % 360 - 180))
+            residuals[delta] = worst
+        delta, worst = min(residuals.items(), key=lambda item: item[1])
+        assert worst < 1e-6, (props, residuals)
+        matched.add((props["planet"], delta))
+        # Lines stop at the polar circle, where Placidus has no Ascendant
+        assert all(abs(lat) <= 90 - obliq + 1e-9 for lon, lat in points)
+    assert len(matched) == 12
@@ -0,0 +1,70 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import numpy as np
+
+from line_index import EARTH_RADIUS_KM, LineIndex
+
+
+def _line(coords, name):
+    return {"type": "Feature", "geometry": {"type": "LineString", "coordinates": coords},
+            "properties": {"planet": name}}
+
+
+def _haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(h))
+
+
+FEATURES = [
+    _line([[-74.0, -89.9], [-74.0, 89.9]], "meridian"),
+    _line([[170.0, 10.0], [-170.0, 12.0]], "antimeridian"),
+    _line([[float(x), 40.0 + 10 * np.sin(np.radians(4 * x))] for x in range(-180, 181, 2)], "curve"),
+    {"type": "Feature", "geometry": {"type": "Point", "coordinates": [301.1, 48.9]}, "properties": {}},
+]
+
+
+def test_matches_dense_haversine():
+    index = LineIndex(FEATURES)
+    rng = np.random.default_rng(1)
+    lats, lons = rng.uniform(-85, 85, 300), rng.uniform(-180, 180, 300)
+    results = index.query(lats, lons, 1500.0)
+    dense = []
+    for feature in FEATURES[:3]:
+        pts = np.asarray(feature["geometry"]["coordinates"], dtype=float)
+        delta = np.diff(pts, axis=0)
+        delta[:, 0] = (delta[:, 0] + 180) % 360 - 180
+        t = np.linspace(0, 1, 400)[:, None, None]
+        dense.append((pts[:-1] + delta * t).reshape(-1, 2))
+    for lat, lon, found in zip(lats, lons, results):
+        expected = {i: _haversine_km(lat, lon, d[:, 1], d[:, 0]).min() for i, d in enumerate(dense)}
+        expected = {i: d for i, d in expected.items() if d <= 1500.0}
+        got = dict(found)
+        assert [d for _, d in found] == sorted(got.values())
+        for i in set(expected) | set(got):
+            if i in expected and i in got:
+                assert abs(expected[i] - got[i]) < 2.0
+            else:
+                assert abs(expected.get(i, got.get(i)) - 1500.0) < 2.0
+
+
+def test_near_and_interpret_endpoint():
+    index = LineIndex(FEATURES)
+    near = index.near(40.7, -73.0, 200.0)
+    assert [f["properties"]["planet"] for f, _ in near] == ["meridian"]
+    assert abs(near[0][1] - _haversine_km(40.7, -73.0, 40.7, -74.0)) < 0.5
+    # Crossing the antimeridian and the empty case
+    assert [f["properties"]["planet"] for f, _ in index.near(11.0, 179.9, 50.0)] == ["antimeridian"]
+    assert LineIndex([]).query([0.0, 1.0], [0.0, 1.0], 100.0) == [[], []]
+
+    from api import app
+    chart = app.test_client().post("/api/calculate", json={
+        "birth_date": "1990-05-01", "birth_time": "12:00", "timezone": "America/New_York",
+        "coordinates": {"latitude": 40.7, "longitude": -74.0},
+    }).get_json()
+    chart["radius_miles"] = 300
+    lines = app.test_client().post("/api/interpret", json=chart).get_json()["filtered_lines"]
+    distances = [line["properties"]["distance"] for line in lines]
+    assert lines and distances == sorted(distances) and distances[-1] <= 300
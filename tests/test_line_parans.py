@@ -0,0 +1,66 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import numpy as np
+
+import line_parans
+
+HORIZON = {"Sun": (40.0, -21.5), "Mars": (-95.0, 12.0), "Saturn": (150.0, 5.0)}
+MERIDIAN = {"Sun": 40.0, "Mars": -95.0, "Saturn": 150.0}
+
+
+def _horizon_lon(lon0, dec, lat, line_type):
+    h0 = np.degrees(np.arccos(np.clip(-np.tan(np.radians(lat)) * np.tan(np.radians(dec)), -1, 1)))
+    lon = lon0 - h0 if line_type == "AC" else lon0 + h0
+    return (lon + 180) % 360 - 180
+
+
+def test_crossings_lie_on_both_lines():
+    features = line_parans.find_paran_crossings(HORIZON, MERIDIAN)
+    assert features
+    for f in features:
+        props = f["properties"]
+        (p1, l1), (p2, l2) = (s.split("_") for s in props["source_lines"])
+        assert p1 != p2
+        lon0, dec = HORIZON[p1]
+        lon = _horizon_lon(lon0, dec, props["intersection_lat"], l1)
+        assert abs(((lon - props["intersection_lon"]) + 180) % 360 - 180) < 1e-9
+        expected = MERIDIAN[p2] if l2 == "MC" else MERIDIAN[p2] + 180
+        assert abs(((expected - props["intersection_lon"]) + 180) % 360 - 180) < 1e-9
+        assert abs(props["intersection_lat"]) <= 68
+        assert props["label"] == f"{p1} {l1} crossing {p2} {l2}"
+        assert f["geometry"]["coordinates"][0][1] == round(props["intersection_lat"], 6)
+
+
+def test_matches_segment_intersection_solver():
+    """
+    Crossing latitudes must agree with the shapely solver run on densely sampled lines.
+    """
+    lats = np.arange(-68, 68.01, 0.25)
+    lines = {}
+    for name, (lon0, dec) in HORIZON.items():
+        for line_type in ("AC", "DC"):
+            lons = _horizon_lon(lon0, dec, lats, line_type)
+            lines[f"{name}_{line_type}"] = [[float(x), float(y)] for x, y in zip(lons, lats)]
+    for name, mc in MERIDIAN.items():
+        lines[f"{name}_MC"] = [[mc, -85], [mc, 85]]
+        ic = (mc + 360) % 360 - 180
+        lines[f"{name}_IC"] = [[ic, -85], [ic, 85]]
+    reference = line_parans.find_line_crossings_and_latitude_lines(lines)
+    analytic = {f["properties"]["label"]: f["properties"]["intersection_lat"]
+                for f in line_parans.find_paran_crossings(HORIZON, MERIDIAN)}
+    assert reference
+    for f in reference:
+        label = f["properties"]["label"]
+        p1, l1 = f["properties"]["source_lines"][0].split("_")
+        lon = _horizon_lon(*HORIZON[p1], f["properties"]["intersection_lat"], l1)
+        if abs(((lon - f["properties"]["intersection_lon"]) + 180) % 360 - 180) > 0.1:
+            continue  # artefact of a dateline jump segment, not a real crossing
+        assert label in analytic
+        assert abs(analytic[label] - f["properties"]["intersection_lat"]) < 0.05
+
+
+def test_no_crossings_for_equatorial_declination():
+    features = line_parans.find_paran_crossings({"Sun": (0.0, 0.0)}, {"Moon": 30.0})
+    assert features == []
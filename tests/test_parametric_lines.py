@@ -0,0 +1,76 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import pytest
+
+from chart_context import ChartContext
+from parametric_lines import MAX_DEGREE, fit_parametric_model, evaluate_parametric_model, render_parametric_frame
+from astrocartography import calculate_astrocartography_lines_geojson
+from line_ic_mc import calculate_mc_line
+
+JD_START = 2460370.5
+BODIES = ["Sun", "Moon", "Mars", "Lunar Node", "Chiron"]
+
+
+def _angle_diff(a, b):
+    return abs((a - b + 180) % 360 - 180)
+
+
+def test_model_reproduces_ephemeris_inside_window():
+    model = fit_parametric_model(JD_START, JD_START + 1.0, BODIES)
+    for frac in (0.0, 0.137, 0.5, 0.91, 1.0):
+        jd = JD_START + frac
+        state = evaluate_parametric_model(model, jd)
+        context = ChartContext.build(jd, BODIES)
+        assert _angle_diff(state["gst_deg"], context.gst_deg) < 1e-5
+        for name in BODIES:
+            body = context.body(name)
+            assert _angle_diff(state["bodies"][name]["ra"], body["ra"]) < 1e-6
+            assert abs(state["bodies"][name]["dec"] - body["dec"]) < 1e-6
+            assert _angle_diff(state["bodies"][name]["lon"], body["longitude"]) < 1e-6
+    for body in model["bodies"].values():
+        assert max(body["max_error_deg"].values()) < 1e-6
+
+
+def test_rendered_mc_lines_match_pipeline():
+    model = fit_parametric_model(JD_START, JD_START + 1.0, BODIES)
+    jd = JD_START + 0.42
+    frame = render_parametric_frame(model, jd)
+    context = ChartContext.build(jd, BODIES)
+    mc = {f["properties"]["planet"]: f for f in frame["features"] if f["properties"]["line_type"] == "MC"}
+    for name in ("Sun", "Moon", "Mars"):
+        expected = calculate_mc_line(jd, context.body(name)["ra"], name)
+        assert _angle_diff(mc[name]["geometry"]["coordinates"][0][0],
+                           expected["geometry"]["coordinates"][0][0]) < 1e-5
+    assert sum(f["properties"]["line_type"] == "HORIZON" for f in frame["features"]) == len(BODIES)
+
+
+def test_parametric_output_mode():
+    chart_data = {"planets": [{"name": n} for n in BODIES], "utc_time": {"julian_day": JD_START}}
+    model = calculate_astrocartography_lines_geojson(
+        chart_data, {"output_mode": "parametric", "window_days": 2, "degree": 12}
+    )
+    assert model["type"] == "ParametricLines"
+    assert model["window"] == {"jd_start": JD_START, "jd_end": JD_START + 2}
+    assert set(model["bodies"]) == set(BODIES)
+    assert all(len(b["ra"]) == 13 for b in model["bodies"].values())
+    with pytest.raises(ValueError):
+        fit_parametric_model(JD_START, JD_START + 365, BODIES)
+
+
+def test_degree_is_validated():
+    from api import app
+    for degree in (-1, 0, 2.5, MAX_DEGREE + 1, "ten", None):
+        with pytest.raises(ValueError):
+            fit_parametric_model(JD_START, JD_START + 1.0, BODIES, degree=degree)
+    assert len(fit_parametric_model(JD_START, JD_START + 1.0, ["Sun"], degree=MAX_DEGREE)["bodies"]["Sun"]["ra"]) == MAX_DEGREE + 1
+
+    client = app.test_client()
+    chart_id = client.post("/api/calculate", json={
+        "birth_date": "1990-01-15", "birth_time": "14:30", "timezone": "America/New_York",
+        "coordinates": {"latitude": 40.7128, "longitude": -74.0060},
+    }).get_json()["chart_id"]
+    response = client.post("/api/astrocartography", json={"chart_id": chart_id, "output_mode": "parametric", "degree": -1})
+    assert response.status_code == 400
+    assert "degree" in response.get_json()["error"]
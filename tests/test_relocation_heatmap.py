@@ -0,0 +1,138 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from chart_context import ChartContext
+from ephemeris import calculate_chart
+from ephemeris_utils import CHART_PLANETS
+from astrocartography import calculate_astrocartography_lines_geojson
+from relocation_heatmap import compute_relocation_heatmap, raw_grid, render_png, render_tile, top_locations
+
+BIRTH = dict(birth_date="1990-01-15", birth_time="14:30", timezone="America/New_York",
+             coordinates={"latitude": 40.7128, "longitude": -74.0060}, use_extended_planets=True)
+NO_LINES = {"MC": 0, "IC": 0, "AC": 0, "DC": 0, "ASPECT": 0}
+
+
+def _chart():
+    return calculate_chart(**BIRTH, return_context=True)
+
+
+def _only(context, body):
+    return {name: 0 for name in context.names if name != body}
+
+
+def _cell(grid, lat, lon):
+    row = min(int((90.0 - lat) / grid.resolution), grid.scores.shape[0] - 1)
+    col = min(int((((lon + 180.0) % 360.0)) / grid.resolution), grid.scores.shape[1] - 1)
+    return grid.scores[row, col]
+
+
+def test_world_grid_speed_and_peaks():
+    chart, context = _chart()
+    compute_relocation_heatmap(context, 1.0)
+    start = time.perf_counter()
+    grid = compute_relocation_heatmap(context, 0.25)
+    elapsed = time.perf_counter() - start
+    assert grid.scores.shape == (720, 1440)
+    assert grid.scores.dtype == np.float32
+    assert elapsed < 1.0, f"0.25° world grid took {elapsed:.3f}s"
+    assert not grid.scores[np.abs(grid.lats) > 60].any()
+    peaks = top_locations(grid, count=5, min_separation_degrees=10)
+    assert len(peaks) == 5
+    assert [p["score"] for p in peaks] == sorted((p["score"] for p in peaks), reverse=True)
+    assert peaks[0]["score"] == float(grid.scores.max())
+
+
+def test_peaks_are_not_pinned_to_max_latitude():
+    """
+    Raw sums grow toward the band's edge for any chart; normalized peaks spread over latitude.
+    """
+    edge_peaks = []
+    for jd in (2447907.3, 2451545.0, 2455000.7):
+        context = ChartContext.build(jd, CHART_PLANETS.values())
+        raw = top_locations(compute_relocation_heatmap(context, 0.5, normalize=False), count=10)
+        assert sum(abs(p["latitude"]) > 55 for p in raw) >= 5  # the bias being removed
+
+        grid = compute_relocation_heatmap(context, 0.5)
+        assert not grid.scores[np.abs(grid.lats) > 60].any()
+        band = grid.scores[np.abs(grid.lats) <= 60]
+        assert np.allclose(band.mean(axis=1), 0, atol=1e-4) and np.allclose(band.std(axis=1), 1, atol=1e-3)
+        lats = [abs(p["latitude"]) for p in top_locations(grid, count=10)]
+        assert len(lats) == 10 and min(lats) < 35, lats
+        edge_peaks.append(sum(lat > 59 for lat in lats))
+    assert sum(edge_peaks) <= 4, edge_peaks
+
+
+def test_scores_peak_on_drawn_lines():
+    chart, context = _chart()
+    filters = {"include_fixed_stars": False, "include_parans": False, "include_hermetic_lots": False,
+               "include_aspects": False}
+    features = calculate_astrocartography_lines_geojson(chart, filters, context=context)["features"]
+    # The drawn horizon feature holds both the AC and the DC half
+    for planet in ("Sun", "Moon", "Lunar Node"):
+        for drawn, line_types in (("MC", ("MC",)), ("IC", ("IC",)), ("HORIZON", ("AC", "DC"))):
+            grid = compute_relocation_heatmap(context, 0.25, body_weights=_only(context, planet),
+                                              line_weights={**NO_LINES, **{t: 1 for t in line_types}},
+                                              normalize=False)
+            feature = next(f for f in features if f["properties"].get("planet") == planet
+                           and f["properties"].get("line_type") == drawn)
+            geometry = feature["geometry"]
+            parts = geometry["coordinates"] if geometry["type"] == "MultiLineString" else [geometry["coordinates"]]
+            if drawn == "HORIZON":
+                points = [(lat, lon) for part in parts for lon, lat in part if abs(lat) < 59]
+            else:
+                points = [(lat, parts[0][0][0]) for lat in range(-58, 59, 4)]
+            on_line = [_cell(grid, lat, lon) for lat, lon in points]
+            assert len(on_line) > 10, (planet, drawn)
+            assert min(on_line) > 0.9, (planet, drawn, min(on_line))
+
+
+def test_aspect_lines_match_direct_evaluation():
+    chart, context = _chart()
+    orb = 1.5
+    grid = compute_relocation_heatmap(context, 2.0, orb_degrees=orb, body_weights=_only(context, "Venus"),
+                                      line_weights={**NO_LINES, "ASPECT": 1}, normalize=False)
+    i = context.index("Venus")
+    eps, gst = np.radians(context.obliquity_deg), np.radians(context.gst_deg)
+    lat, lon = np.meshgrid(np.radians(grid.lats), np.radians(grid.lons), indexing="ij")
+    spread = np.sin(np.radians(orb))
+    expected = np.zeros_like(lat)
+    for offset in (60, 90, 120, -60, -90, -120):
+        target = np.radians(context.lon[i] - offset)
+        # MC aspect: the meridian whose Midheaven is at `target`
+        line_lon = np.arctan2(np.sin(target) * np.cos(eps), np.cos(target)) - gst
+        delta = lon - line_lon
+        sin_d = np.where(np.cos(delta) >= 0, np.abs(np.sin(delta)) * np.cos(lat), np.cos(lat))
+        expected += np.exp(-sin_d ** 2 / (2 * spread ** 2))
+        # ASC aspect: where the ecliptic point `target` rises
+        ra = np.arctan2(np.sin(target) * np.cos(eps), np.cos(target))
+        dec = np.arcsin(np.sin(eps) * np.sin(target))
+        hour_angle = gst + lon - ra
+        sin_alt = np.sin(lat) * np.sin(dec) + np.cos(lat) * np.cos(dec) * np.cos(hour_angle)
+        expected += np.where(np.sin(hour_angle) < 0, np.exp(-sin_alt ** 2 / (2 * spread ** 2)), 0.0)
+    expected[np.abs(np.degrees(lat)) > 60] = 0.0
+    # The setting half of an ecliptic point's horizon is not an ASC line; near where the halves
+    # meet the two descriptions differ, so compare away from the polar band
+    mid = np.abs(grid.lats) <= 50
+    assert np.abs(grid.scores[mid] - expected[mid]).max() < 0.02
+
+
+def test_png_tile_and_raw_outputs():
+    chart, context = _chart()
+    grid = compute_relocation_heatmap(context, 1.0)
+    for png, size in ((render_png(grid), (360, 180)), (render_tile(grid, 1, 0, 0), (256, 256))):
+        assert png.startswith(b"\x89PNG\r\n\x1a\n")
+        width, height = struct.unpack(">II", png[16:24])
+        assert (width, height) == size
+        idat_len = struct.unpack(">I", png[33:37])[0]
+        assert len(zlib.decompress(png[41:41 + idat_len])) == height * (width * 4 + 1)
+    data, header = raw_grid(grid)
+    cells = np.frombuffer(data, dtype="<f4").reshape(header["nrows"], header["ncols"])
+    assert np.array_equal(cells, grid.scores)
+    assert header["geotransform"] == [-180.0, 1.0, 0.0, 90.0, 0.0, -1.0]
@@ -0,0 +1,75 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import threading
+import time
+
+from singleflight import SingleFlight, request_key
+
+
+def _run_concurrently(flight, fn, callers=4):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do("chart", fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for t in threads:
+        t.start()
+    return threads, results, errors
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    runs = []
+
+    def compute():
+        runs.append(1)
+        release.wait(5)
+        return {"features": []}
+
+    threads, results, errors = _run_concurrently(flight, compute)
+    _wait_for(lambda: flight.stats()["coalesced"] == 3)
+    release.set()
+    for t in threads:
+        t.join()
+    assert not errors and len(runs) == 1
+    assert len(results) == 4 and all(r is results[0] for r in results)
+    assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 3}
+    # Finished calls are forgotten: the next caller computes again
+    flight.do("chart", compute)
+    assert len(runs) == 2
+
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def compute():
+        release.wait(5)
+        raise ValueError("bad chart")
+
+    threads, results, errors = _run_concurrently(flight, compute, callers=3)
+    _wait_for(lambda: flight.stats()["coalesced"] == 2)
+    release.set()
+    for t in threads:
+        t.join()
+    assert not results and len(errors) == 3
+    assert all(isinstance(e, ValueError) for e in errors)
+
+
+def test_request_key_is_canonical():
+    assert request_key("calculate", {"a": 1, "b": [1, 2]}) == request_key("calculate", {"b": [1, 2], "a": 1})
+    assert request_key("calculate", {"a": 1}) != request_key("astrocartography", {"a": 1})
@@ -0,0 +1,52 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from stage_graph import Stage, run_stages
+from astrocartography import astrocartography_stages
+from ephemeris import calculate_chart
+
+
+def _add(a, b):
+    return a + b
+
+
+def _fail():
+    raise RuntimeError("stage failed")
+
+
+def test_dependencies_and_timings():
+    stages = [
+        Stage("total", _add, deps=("a", "b")),
+        Stage("a", _add, (1, 2)),
+        Stage("b", _add, (10, 20)),
+    ]
+    for executor in (None, ThreadPoolExecutor(2)):
+        results, timings = run_stages(stages, executor)
+        assert results == {"a": 3, "b": 30, "total": 33}
+        assert set(timings) == {"a", "b", "total"}
+
+    with pytest.raises(ValueError):
+        run_stages([Stage("x", _add, (1,), deps=("missing",))])
+    with pytest.raises(RuntimeError):
+        run_stages([Stage("ok", _add, (1, 2)), Stage("bad", _fail)], ThreadPoolExecutor(2))
+
+
+def test_threaded_features_match_serial():
+    chart, context = calculate_chart(
+        "1990-05-01", "12:00", timezone="America/New_York",
+        coordinates={"latitude": 40.7, "longitude": -74.0}, return_context=True,
+    )
+    filters = {"layer_type": "transit"}
+
+    def features(executor):
+        stages = astrocartography_stages(chart, filters, context)
+        results, _ = run_stages(stages, executor)
+        return [results[s.name][0] if s.name == "horizon_lines" else results[s.name] for s in stages]
+
+    assert [s.name for s in astrocartography_stages(chart, filters, context)][-1] == "parans"
+    assert features(ThreadPoolExecutor(4)) == features(None)
@@ -0,0 +1,28 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from timezone_resolver import TimezoneResolver, get_timezone_resolver
+from location_utils import detect_timezone_from_coordinates
+
+
+def test_lookups_and_cell_cache():
+    resolver = TimezoneResolver()
+    assert resolver.timezone_at(40.7128, -74.0060) == "America/New_York"
+    assert resolver.timezone_at(40.71281, -74.00601) == "America/New_York"  # Same 1e-3° cell
+    assert resolver.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+def test_batch_matches_single_lookups():
+    resolver = TimezoneResolver()
+    lats = [51.5074, 35.6762, 51.5074, -33.8688]
+    lons = [-0.1278, 139.6503, -0.1278, 151.2093]
+    zones = resolver.timezones_at(lats, lons)
+    assert zones == ["Europe/London", "Asia/Tokyo", "Europe/London", "Australia/Sydney"]
+    assert resolver.stats()["misses"] == 3
+    assert zones == [TimezoneResolver().timezone_at(lat, lon) for lat, lon in zip(lats, lons)]
+
+
+def test_detect_timezone_from_coordinates():
+    assert detect_timezone_from_coordinates(48.8566, 2.3522) == "Europe/Paris"
+    assert get_timezone_resolver() is get_timezone_resolver()
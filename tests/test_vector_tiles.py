@@ -0,0 +1,173 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import json
+import struct
+
+from ephemeris import calculate_chart
+from astrocartography import calculate_astrocartography_lines_geojson
+from vector_tiles import BUFFER, EXTENT, TileSet, encode_tile
+
+
+def _read_varint(data, pos):
+    value, shift = 0, 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            return value, pos
+
+
+def _fields(data):
+    """(field number, value) pairs of a protobuf message; length-delimited values as bytes."""
+    pos = 0
+    while pos < len(data):
+        key, pos = _read_varint(data, pos)
+        wire_type = key & 7
+        if wire_type == 0:
+            value, pos = _read_varint(data, pos)
+        elif wire_type == 1:
+            value, pos = data[pos:pos + 8], pos + 8
+        elif wire_type == 2:
+            length, pos = _read_varint(data, pos)
+            value, pos = data[pos:pos + length], pos + length
+        else:
+            raise AssertionError(f"unexpected wire type {wire_type}")
+        yield key >> 3, value
+
+
+def _packed(data):
+    pos, out = 0, []
+    while pos < len(data):
+        value, pos = _read_varint(data, pos)
+        out.append(value)
+    return out
+
+
+def _unzigzag(n):
+    return (n >> 1) ^ -(n & 1)
+
+
+def _decode_value(data):
+    for number, value in _fields(data):
+        if number == 1:
+            return value.decode("utf-8")
+        if number == 3:
+            return struct.unpack("<d", value)[0]
+        if number == 6:
+            return _unzigzag(value)
+        if number == 7:
+            return bool(value)
+
+
+def _decode_geometry(commands):
+    parts, x, y, i = [], 0, 0, 0
+    while i < len(commands):
+        command, count = commands[i] & 7, commands[i] >> 3
+        i += 1
+        for _ in range(count):
+            x += _unzigzag(commands[i])
+            y += _unzigzag(commands[i + 1])
+            i += 2
+            if command == 1:
+                parts.append([(x, y)])
+            else:
+                parts[-1].append((x, y))
+    return parts
+
+
+def decode_tile(data):
+    """{layer name: {"extent", "features": [{"id", "type", "properties", "parts"}]}}"""
+    layers = {}
+    for number, layer_bytes in _fields(data):
+        assert number == 3
+        name, keys, values, raw, extent = None, [], [], [], 4096
+        for field, value in _fields(layer_bytes):
+            if field == 1:
+                name = value.decode("utf-8")
+            elif field == 2:
+                raw.append(value)
+            elif field == 3:
+                keys.append(value.decode("utf-8"))
+            elif field == 4:
+                values.append(_decode_value(value))
+            elif field == 5:
+                extent = value
+            elif field == 15:
+                assert value == 2
+        features = []
+        for feature_bytes in raw:
+            feature = dict(_fields(feature_bytes))
+            tags = _packed(feature.get(2, b""))
+            features.append({
+                "id": feature[1],
+                "type": feature[3],
+                "properties": {keys[k]: values[v] for k, v in zip(tags[::2], tags[1::2])},
+                "parts": _decode_geometry(_packed(feature[4])),
+            })
+        layers[name] = {"extent": extent, "features": features}
+    return layers
+
+
+def _features():
+    chart, context = calculate_chart(
+        birth_date="1990-01-15", birth_time="14:30", timezone="America/New_York",
+        coordinates={"latitude": 40.7128, "longitude": -74.0060}, use_extended_planets=True, return_context=True,
+    )
+    filters = {"include_aspects": True, "include_fixed_stars": True, "include_parans": True,
+               "include_hermetic_lots": True, "layer_type": "natal"}
+    return calculate_astrocartography_lines_geojson(chart, filters, context=context)["features"]
+
+
+def test_encode_tile_round_trip():
+    import numpy as np
+    tile = encode_tile({
+        "lines": [(2, [np.array([[0, 0], [10, 5], [3, 40]]), np.array([[100, 100], [90, 120]])],
+                   {"planet": "Venus", "orb": 1.5, "house": 7, "retro": False, "hits": [1, 2], "empty": None}, 4)],
+        "points": [(1, [np.array([[2048, 17]])], {"star": "Algol"}, 0)],
+        "nothing": [],
+    })
+    layers = decode_tile(tile)
+    assert set(layers) == {"lines", "points"}
+    line = layers["lines"]["features"][0]
+    assert line["id"] == 4 and line["type"] == 2
+    assert line["parts"] == [[(0, 0), (10, 5), (3, 40)], [(100, 100), (90, 120)]]
+    assert line["properties"] == {"planet": "Venus", "orb": 1.5, "house": 7, "retro": False, "hits": "[1,2]"}
+    assert layers["points"]["features"][0]["parts"] == [[(2048, 17)]]
+    assert encode_tile({}) == b""
+
+
+def test_tiles_clip_and_thin_chart_features():
+    features = _features()
+    tiles = TileSet(features)
+    world = decode_tile(tiles.tile(0, 0, 0))
+    categories = {f["properties"].get("category") for f in features}
+    assert set(world) == categories
+    for name, layer in world.items():
+        assert layer["extent"] == EXTENT
+        for feature in layer["features"]:
+            source = features[feature["id"]]["properties"]
+            assert feature["properties"]["category"] == name
+            assert feature["properties"].get("planet") == source.get("planet")
+    # The whole world at z0 is far smaller than the GeoJSON it came from
+    assert len(tiles.tile(0, 0, 0)) * 10 < len(json.dumps(features))
+
+    # A zoomed-in tile only holds geometry inside it (plus the buffer) and fewer features
+    tile = decode_tile(tiles.tile(3, 2, 3, categories=["planet", "aspect"]))
+    assert set(tile) <= {"planet", "aspect"}
+    count = sum(len(layer["features"]) for layer in tile.values())
+    assert 0 < count < sum(len(world[c]["features"]) for c in ("planet", "aspect"))
+    for layer in tile.values():
+        for feature in layer["features"]:
+            for part in feature["parts"]:
+                assert len(part) >= 2
+                assert all(-BUFFER <= x <= EXTENT + BUFFER and -BUFFER <= y <= EXTENT + BUFFER for x, y in part)
+                assert all(a != b for a, b in zip(part, part[1:]))
+
+    # Every MC line is a meridian: inside a tile it is a vertical run
+    for feature in tile.get("planet", {"features": []})["features"]:
+        if feature["properties"].get("line_type") == "MC":
+            assert len({x for part in feature["parts"] for x, y in part}) == 1
@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import copy
+import json
+
+import pytest
+
+from ephemeris import calculate_chart
+from astrocartography import calculate_astrocartography_lines_geojson
+from viewport import clip_features, parse_bbox, zoom_tolerance
+
+
+def _features():
+    chart, context = calculate_chart(
+        birth_date="1990-01-15", birth_time="14:30", timezone="America/New_York",
+        coordinates={"latitude": 40.7128, "longitude": -74.0060}, use_extended_planets=True, return_context=True,
+    )
+    filters = {"include_aspects": True, "include_fixed_stars": True, "include_parans": True,
+               "include_hermetic_lots": True, "layer_type": "natal"}
+    return calculate_astrocartography_lines_geojson(chart, filters, context=context)["features"]
+
+
+def _points(feature):
+    geometry = feature["geometry"]
+    parts = geometry["coordinates"] if geometry["type"] == "MultiLineString" else [geometry["coordinates"]]
+    return [p for part in parts for p in part] if geometry["type"] != "Point" else [geometry["coordinates"]]
+
+
+def test_parse_bbox_wraps_the_antimeridian():
+    assert parse_bbox([-10, -20, 30, 40]) == [(-10.0, -20.0, 30.0, 40.0)]
+    assert parse_bbox("170,-50,-170,10") == [(170.0, -50.0, 180.0, 10.0), (-180.0, -50.0, -170.0, 10.0)]
+    assert parse_bbox([-200, 0, -150, 5]) == [(160.0, 0.0, 180.0, 5.0), (-180.0, 0.0, -150.0, 5.0)]
+    assert parse_bbox([-300, 0, 300, 5]) == [(-180.0, 0.0, 180.0, 5.0)]
+    for bad in ([0, 10, 5, 5], [0, 0, 1], "a,b,c,d", [0, -95, 1, 0]):
+        with pytest.raises(ValueError):
+            parse_bbox(bad)
+    assert zoom_tolerance(0) == 2 * zoom_tolerance(1)
+
+
+def test_clip_and_simplify_chart_lines():
+    features = _features()
+    before = copy.deepcopy(features)
+
+    # Pacific viewport across the antimeridian
+    clipped = clip_features(features, [150, -40, -150, 40], tolerance=zoom_tolerance(5))
+    assert features == before
+    assert 0 < len(clipped) < len(features)
+    for feature in clipped:
+        for lon, lat in (p[:2] for p in _points(feature)):
+            assert (lon >= 150 - 1e-9 or lon <= -150 + 1e-9) and -40 - 1e-9 <= lat <= 40 + 1e-9, feature["properties"]
+        if feature["geometry"]["type"] != "Point":
+            parts = feature["geometry"]["coordinates"]
+            parts = parts if feature["geometry"]["type"] == "MultiLineString" else [parts]
+            # No segment crosses the map: the two sides of the antimeridian stay separate parts
+            assert all(abs(a[0] - b[0]) <= 180 for part in parts for a, b in zip(part, part[1:]))
+
+    # Without a bbox, simplification keeps every feature with the same properties, in fewer vertices
+    simplified = clip_features(features, tolerance=zoom_tolerance(2))
+    assert [f["properties"] for f in simplified] == [f["properties"] for f in features]
+    assert sum(len(_points(f)) for f in simplified) * 3 < sum(len(_points(f)) for f in features)
+    assert len(json.dumps(simplified)) * 3 < len(json.dumps(features))
+    # Simplified vertices are original vertices, rounded to the tolerance's decimals (2 at zoom 2)
+    horizon = [(a, b) for a, b in zip(features, simplified) if a["properties"].get("line_type") == "HORIZON"]
+    for original, thin in horizon:
+        for point in _points(thin):
+            assert any(abs(point[0] - p[0]) <= 0.0051 and abs(point[1] - p[1]) <= 0.0051 for p in _points(original))